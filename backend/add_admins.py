@@ -8,6 +8,8 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 import os
 
+from app.utils.auth import hash_password
+
 # Load environment variables
 load_dotenv()
 
@@ -29,28 +31,28 @@ async def add_admins():
         {
             "name": "Admin User",
             "email": "admin@example.com",
-            "password": "admin123",
+            "password": hash_password("admin123"),
             "role": "admin",
             "createdAt": datetime.now()
         },
         {
             "name": "Anjan Kumar",
             "email": "anjan@example.com",
-            "password": "admin123",
+            "password": hash_password("admin123"),
             "role": "admin",
             "createdAt": datetime.now()
         },
         {
             "name": "Sanjay Admin",
             "email": "sanjay.admin@example.com",
-            "password": "admin123",
+            "password": hash_password("admin123"),
             "role": "admin",
             "createdAt": datetime.now()
         },
         {
             "name": "Deepa Admin",
             "email": "deepa.admin@example.com",
-            "password": "admin123",
+            "password": hash_password("admin123"),
             "role": "admin",
             "createdAt": datetime.now()
         }
@@ -14,9 +14,73 @@ class Settings(BaseSettings):
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
     
+    # Verified-token cache (entries also expire with the token's exp)
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_SECONDS: int = 300
+    
+    # Password hashing (PBKDF2-SHA256): cost, and threads the KDF runs on
+    # (stored hashes with another cost are upgraded on login)
+    PASSWORD_HASH_ITERATIONS: int = 600000
+    PASSWORD_HASH_WORKERS: int = 2
+    
     # CORS
     CORS_ORIGINS: str = "http://localhost:3000,http://localhost:5173"
     
+    # List queries: how page and total are fetched ("gather", "facet" or "sequential");
+    # not yet measured against a server, see benchmark_list_queries.py
+    LIST_QUERY_STRATEGY: str = "gather"
+    
+    # Bulk import: tools written per bulk_write batch
+    IMPORT_BATCH_SIZE: int = 500
+    
+    # Export: documents fetched per cursor batch when streaming exports
+    EXPORT_BATCH_SIZE: int = 2000
+    
+    # Search: "bm25" (in-memory index) or "mongo" ($text index)
+    SEARCH_ENGINE: str = "bm25"
+    CATALOG_REFRESH_SECONDS: int = 300
+    
+    # Tool list pages without a search are served from an in-memory catalog
+    # snapshot, polled for modified tools every CATALOG_POLL_SECONDS (and
+    # fully reloaded with the catalog)
+    CATALOG_SNAPSHOT: bool = True
+    CATALOG_POLL_SECONDS: int = 5
+    
+    # Facet counts: seconds a cached result may be served (writes in this worker clear it)
+    FACET_CACHE_SECONDS: int = 60
+    
+    # Migrations: apply pending ones from a background task at startup
+    # (one worker wins the lock); disable to run only via migrate.py
+    MIGRATE_ON_STARTUP: bool = True
+    
+    # GET /tools response cache: "memory" (per worker), "redis" (shared by all
+    # workers through a Redis-compatible server; needs the redis package) or "off"
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_URL: str = "redis://localhost:6379/0"
+    RESPONSE_CACHE_SIZE: int = 1000
+    RESPONSE_CACHE_SECONDS: int = 30
+    
+    # GET /tools/{id} and /tools/{id}/reviews: per-worker cache of serialized
+    # responses (writes in this worker drop a tool's entries, others are seen
+    # after the TTL), the extra seconds a stale entry is served while it is
+    # refreshed, and the Cache-Control sent with their ETag/Last-Modified
+    TOOL_CACHE_SIZE: int = 2000
+    TOOL_CACHE_SECONDS: int = 30
+    TOOL_CACHE_STALE_SECONDS: int = 30
+    TOOL_CACHE_CONTROL: str = "public, max-age=0, must-revalidate"
+    TOOL_REVIEWS_CACHE_CONTROL: str = "public, max-age=0, must-revalidate"
+    
+    # Ranking: rankScore is a Bayesian average pulling tools towards
+    # RANK_PRIOR_MEAN with the weight of RANK_PRIOR_WEIGHT reviews; ratingSeed
+    # counts as RANK_SEED_WEIGHT * log10(1 + votes) reviews
+    RANK_PRIOR_MEAN: float = 3.5
+    RANK_PRIOR_WEIGHT: float = 5.0
+    RANK_SEED_WEIGHT: float = 2.0
+    
+    # GET /tools/top: tools kept per list and seconds between background rebuilds
+    TOP_TOOLS_SIZE: int = 20
+    TOP_TOOLS_REFRESH_SECONDS: int = 60
+    
     # Application
     APP_NAME: str = "AI Tool Discovery API"
     DEBUG: bool = True
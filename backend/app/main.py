@@ -1,10 +1,16 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 
 from app.config import settings
-from app.database import connect_to_mongo, close_mongo_connection
-from app.routers import auth, tools, reviews, admin_tools, admin_reviews
+from app.database import connect_to_mongo, close_mongo_connection, get_database
+from app.services.catalog_snapshot import catalog_snapshot
+from app.services.catalog_sync import refresh_catalog_periodically
+from app.services.migration_service import migrate_in_background
+from app.services.top_tools_service import refresh_top_tools_periodically
+from app.services.response_cache import response_cache
+from app.routers import auth, tools, reviews, admin_tools, admin_reviews, admin_metrics
 
 
 @asynccontextmanager
@@ -12,8 +18,29 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     await connect_to_mongo()
+    # Pending index builds and backfills run in the background so the
+    # worker starts serving immediately
+    migration_task = None
+    if settings.MIGRATE_ON_STARTUP:
+        migration_task = asyncio.create_task(migrate_in_background(get_database()))
+    # In-memory catalog loads in the background; search falls back to
+    # MongoDB until it is ready
+    catalog_task = asyncio.create_task(refresh_catalog_periodically(get_database()))
+    # Tool list pages come from the catalog snapshot once it is loaded
+    snapshot_task = None
+    if settings.CATALOG_SNAPSHOT:
+        snapshot_task = asyncio.create_task(catalog_snapshot.poll(get_database(), settings.CATALOG_POLL_SECONDS))
+    # Top tools lists are rebuilt in the background (by one worker at a time)
+    top_tools_task = asyncio.create_task(refresh_top_tools_periodically(get_database()))
     yield
     # Shutdown
+    catalog_task.cancel()
+    top_tools_task.cancel()
+    if snapshot_task:
+        snapshot_task.cancel()
+    if migration_task:
+        migration_task.cancel()
+    await response_cache.close()
     await close_mongo_connection()
 
 
@@ -40,6 +67,7 @@ app.include_router(tools.router)
 app.include_router(reviews.router)
 app.include_router(admin_tools.router)
 app.include_router(admin_reviews.router)
+app.include_router(admin_metrics.router)
 
 
 @app.get("/")
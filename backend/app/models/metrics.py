@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import Optional
+
+
+class CacheStats(BaseModel):
+    """Hit/miss counters of one cache (size is None when entries live outside the process)."""
+    hits: int
+    staleHits: int = 0
+    misses: int
+    size: Optional[int]
+
+
+class SingleFlightStats(BaseModel):
+    """Reads executed vs joined to an identical read already in flight."""
+    executed: int
+    coalesced: int
+    inFlight: int
+
+
+class MetricsResponse(BaseModel):
+    """In-process metrics of the worker that served the request."""
+    caches: dict[str, CacheStats]
+    singleFlight: dict[str, SingleFlightStats]
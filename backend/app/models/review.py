@@ -1,8 +1,11 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, SerializeAsAny, field_validator
 from typing import Optional
 from datetime import datetime
 from enum import Enum
 
+from app.utils.projection import model_projection
+from app.utils.responses import document_list_adapter
+
 
 class ReviewStatus(str, Enum):
     """Review status options."""
@@ -37,6 +40,25 @@ class ReviewUpdate(BaseModel):
     moderationNote: Optional[str] = None
 
 
+class ReviewBulkUpdate(BaseModel):
+    """Model for moderating many reviews at once (admin only)."""
+    ids: list[str] = Field(..., min_length=1, max_length=1000)
+    status: ReviewStatus
+    moderationNote: Optional[str] = None
+
+
+class ReviewBulkResult(BaseModel):
+    """Outcome of bulk moderation for a single review ID."""
+    id: str
+    result: str  # updated, unchanged, not_found or invalid_id
+
+
+class ReviewBulkUpdateResponse(BaseModel):
+    """Per-ID results of a bulk moderation request."""
+    results: list[ReviewBulkResult]
+    updated: int
+
+
 class ReviewInDB(ReviewBase):
     """Review model as stored in database."""
     id: str = Field(alias="_id")
@@ -80,9 +102,27 @@ class ReviewWithToolName(Review):
     toolName: str
 
 
+class ReviewForModeration(ReviewWithUserName):
+    """Review with both user and tool names included."""
+    toolName: str
+
+
 class ReviewListResponse(BaseModel):
     """Paginated list of reviews."""
-    items: list[Review]
-    total: int
+    items: list[SerializeAsAny[Review]]  # keeps userName/toolName of subclasses
+    total: Optional[int] = None
     page: int
     pageSize: int
+    hasMore: bool = False
+
+
+# Only the fields responses expose are read from MongoDB
+REVIEW_PROJECTION = model_projection(Review)
+REVIEW_WITH_USER_NAME_PROJECTION = model_projection(ReviewWithUserName)
+REVIEW_WITH_TOOL_NAME_PROJECTION = model_projection(ReviewWithToolName)
+MODERATION_PROJECTION = model_projection(ReviewForModeration)
+
+# List pages are validated in one pass and serialized straight to JSON
+REVIEW_WITH_USER_NAME_LIST_ADAPTER = document_list_adapter(ReviewWithUserName)
+REVIEW_WITH_TOOL_NAME_LIST_ADAPTER = document_list_adapter(ReviewWithToolName)
+MODERATION_LIST_ADAPTER = document_list_adapter(ReviewForModeration)
@@ -3,6 +3,9 @@ from typing import Optional
 from datetime import datetime
 from enum import Enum
 
+from app.utils.projection import model_projection
+from app.utils.responses import document_list_adapter
+
 
 class PricingModel(str, Enum):
     """Pricing model options for tools."""
@@ -13,6 +16,45 @@ class PricingModel(str, Enum):
     NO_PRICING = "no_pricing"
 
 
+class SortOrder(str, Enum):
+    """Sort direction for list endpoints."""
+    ASC = "asc"
+    DESC = "desc"
+
+
+class ToolSortField(str, Enum):
+    """Fields the tool list can be sorted by (each backed by compound indexes)."""
+    AVG_RATING = "avgRating"
+    VOTES = "votes"
+    REVIEW_COUNT = "reviewCount"
+    CREATED_AT = "createdAt"
+    NAME = "name"
+    RANK = "rank"
+    
+    @property
+    def field(self) -> str:
+        """Document field the sort reads (rank sorts on the stored rankScore)."""
+        return "rankScore" if self is ToolSortField.RANK else self.value
+    
+    @property
+    def value_types(self) -> tuple:
+        """Python types the sorted field holds (besides null), for validating cursors."""
+        if self is ToolSortField.CREATED_AT:
+            return (datetime,)
+        if self is ToolSortField.NAME:
+            return (str,)
+        return (int, float)
+    
+    @property
+    def default_order(self) -> SortOrder:
+        """Direction used when the request gives none (A-Z for names, highest first otherwise)."""
+        return SortOrder.ASC if self is ToolSortField.NAME else SortOrder.DESC
+
+
+# Cursor values must have the types of the field they page on
+SORT_VALUE_TYPES = {field.field: field.value_types for field in ToolSortField}
+
+
 class ToolBase(BaseModel):
     """Base tool model with common fields."""
     name: str
@@ -53,6 +95,7 @@ class ToolInDB(ToolBase):
     id: str = Field(alias="_id")
     avgRating: float = 0.0
     reviewCount: int = 0
+    rankScore: Optional[float] = None
     createdAt: datetime
     updatedAt: datetime
     
@@ -73,6 +116,7 @@ class ToolInDB(ToolBase):
                 "ratingSeed": 4.5,
                 "avgRating": 4.7,
                 "reviewCount": 23,
+                "rankScore": 4.5312,
                 "logoUrl": "https://example.com/logo.png",
                 "createdAt": "2025-11-09T08:15:30Z",
                 "updatedAt": "2026-01-09T08:15:30Z"
@@ -88,7 +132,71 @@ class Tool(ToolInDB):
 class ToolListResponse(BaseModel):
     """Paginated list of tools."""
     items: list[Tool]
-    total: int
+    total: Optional[int] = None
     page: int
     pageSize: int
-    totalPages: int
+    totalPages: Optional[int] = None
+    hasMore: bool = False
+    nextCursor: Optional[str] = None
+
+
+class FacetCount(BaseModel):
+    """Number of tools with one facet value."""
+    value: str
+    count: int
+
+
+class RatingFacetCount(BaseModel):
+    """Number of tools rated at least minRating."""
+    minRating: int
+    count: int
+
+
+class ToolFacetsResponse(BaseModel):
+    """Facet counts for the catalog filter sidebar."""
+    total: int
+    categories: list[FacetCount]
+    pricingModels: list[FacetCount]
+    ratings: list[RatingFacetCount]
+
+
+class ToolImportError(BaseModel):
+    """Validation or parse error for one imported line."""
+    line: int
+    error: str
+
+
+class ToolImportResponse(BaseModel):
+    """Summary of a bulk tool import."""
+    received: int
+    inserted: int
+    updated: int
+    failed: int
+    errors: list[ToolImportError]
+
+
+class ToolSuggestion(BaseModel):
+    """Typeahead suggestion: a tool or a category."""
+    type: str  # tool or category
+    label: str
+    id: Optional[str] = None
+    category: Optional[str] = None
+
+
+class ToolSuggestResponse(BaseModel):
+    """Typeahead suggestions for a search prefix."""
+    items: list[ToolSuggestion]
+
+
+class ToolTopResponse(BaseModel):
+    """Precomputed highest-ranked tools, overall or for one category."""
+    category: Optional[str] = None
+    items: list[Tool]
+    refreshedAt: Optional[datetime] = None
+
+
+# Only the fields responses expose are read from MongoDB
+TOOL_PROJECTION = model_projection(Tool)
+
+# List pages are validated in one pass and serialized straight to JSON
+TOOL_LIST_ADAPTER = document_list_adapter(Tool)
@@ -21,6 +21,11 @@ class UserCreate(UserBase):
     password: str
 
 
+class UserUpdate(BaseModel):
+    """Model for updating the current user's profile."""
+    name: str
+
+
 class UserLogin(BaseModel):
     """Model for user login."""
     email: EmailStr
@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends
+
+from app.models.metrics import MetricsResponse
+from app.utils.dependencies import require_admin
+from app.services.detail_cache import tool_detail_cache
+from app.services.facet_service import facet_cache
+from app.services.read_flights import detail_flight, list_flight, reviews_flight
+from app.services.response_cache import response_cache
+from app.utils import auth
+
+
+router = APIRouter(prefix="/admin/metrics", tags=["Admin - Metrics"])
+
+
+@router.get("", response_model=MetricsResponse)
+async def get_metrics(
+    current_user: dict = Depends(require_admin)
+):
+    """
+    Get cache and single-flight metrics (admin only).
+    
+    Counters are per worker process and reset on restart.
+    """
+    return MetricsResponse(
+        caches={
+            "tokens": auth.token_cache.stats(),
+            "facets": facet_cache.stats(),
+            "toolList": response_cache.stats(),
+            "toolDetails": tool_detail_cache.stats()
+        },
+        singleFlight={
+            "toolList": list_flight.stats(),
+            "toolDetails": detail_flight.stats(),
+            "toolReviews": reviews_flight.stats()
+        }
+    )
@@ -1,13 +1,36 @@
 from fastapi import APIRouter, HTTPException, status, Depends, Query
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import UpdateOne
 from datetime import datetime
 from typing import Optional
 
 from app.database import get_database
-from app.models.review import Review, ReviewUpdate, ReviewListResponse, ReviewWithUserName
+from app.models.review import (
+    MODERATION_LIST_ADAPTER,
+    MODERATION_PROJECTION,
+    REVIEW_PROJECTION,
+    Review,
+    ReviewUpdate,
+    ReviewListResponse,
+    ReviewForModeration,
+    ReviewBulkUpdate,
+    ReviewBulkResult,
+    ReviewBulkUpdateResponse
+)
+from app.config import settings
 from app.utils.dependencies import require_admin
-from app.services.rating_service import recalculate_tool_rating
+from app.utils.export import export_response
+from app.services.rating_service import (
+    apply_rating_delta,
+    apply_review_transition,
+    mark_reviews_changed,
+    review_transition_delta
+)
+from app.services.counter_service import apply_counter_deltas, move_counters, review_counter_keys
+from app.services.list_service import fetch_page
+from app.utils.responses import json_response, select_list_fields, validate_documents
 
 
 router = APIRouter(prefix="/admin/reviews", tags=["Admin - Reviews"])
@@ -18,78 +41,181 @@ async def get_reviews_for_moderation(
     status_filter: Optional[str] = Query(None, alias="status"),
     page: int = Query(1, ge=1),
     pageSize: int = Query(20, ge=1, le=100),
+    includeTotal: bool = True,
+    fields: Optional[str] = None,
     current_user: dict = Depends(require_admin),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
-    Get reviews for moderation (admin only).
+    Get reviews for moderation (admin only), oldest first.
     
     - **status**: Filter by status (pending, approved, rejected)
     - **page**: Page number (default: 1)
     - **pageSize**: Items per page (default: 20, max: 100)
+    - **includeTotal**: Set to false to skip counting and rely on hasMore
+    - **fields**: Comma-separated fields to return per item (e.g. rating,comment,status); _id is always included
     """
+    response_model, adapter, projection = select_list_fields(
+        ReviewListResponse, ReviewForModeration, fields, MODERATION_PROJECTION, MODERATION_LIST_ADAPTER
+    )
+    
     # Build filter query
     filter_query = {}
     if status_filter:
         filter_query["status"] = status_filter
     
-    total = await db.reviews.count_documents(filter_query)
     skip = (page - 1) * pageSize
     
-    # Aggregate to join with users and tools
-    pipeline = [
-        {"$match": filter_query},
-        {"$skip": skip},
-        {"$limit": pageSize},
-        {
-            "$lookup": {
-                "from": "users",
-                "let": {"userId": {"$toObjectId": "$userId"}},
-                "pipeline": [
-                    {"$match": {"$expr": {"$eq": ["$_id", "$$userId"]}}}
-                ],
-                "as": "user"
-            }
-        },
-        {"$unwind": "$user"},
-        {
-            "$lookup": {
-                "from": "tools",
-                "let": {"toolId": {"$toObjectId": "$toolId"}},
-                "pipeline": [
-                    {"$match": {"$expr": {"$eq": ["$_id", "$$toolId"]}}}
-                ],
-                "as": "tool"
-            }
-        },
-        {"$unwind": "$tool"},
-        {
-            "$addFields": {
-                "userName": "$user.name",
-                "toolName": "$tool.name"
-            }
-        },
-        {
-            "$project": {
-                "user": 0,
-                "tool": 0
-            }
-        }
-    ]
-    
-    reviews = await db.reviews.aggregate(pipeline).to_list(length=pageSize)
+    # Reviews carry denormalized user and tool names, so this is a plain indexed find,
+    # fetched together with the total in one round trip
+    reviews, total = await fetch_page(
+        db, "reviews", filter_query, [("createdAt", 1), ("_id", 1)], skip, pageSize + 1,
+        include_total=includeTotal, projection=projection
+    )
+    has_more = len(reviews) > pageSize
     
     # Convert to models
-    items = []
+    reviews = reviews[:pageSize]
     for review in reviews:
-        review["id"] = str(review.pop("_id"))
-        items.append(ReviewWithUserName(**review))
+        review.setdefault("userName", "Unknown user")
+        review.setdefault("toolName", "Unknown tool")
     
-    return ReviewListResponse(
-        items=items,
+    return json_response(response_model(
+        items=validate_documents(adapter, reviews),
         total=total,
         page=page,
-        pageSize=pageSize
+        pageSize=pageSize,
+        hasMore=has_more
+    ))
+
+
+# Columns of a review export, in order
+EXPORT_FIELDS = [
+    "_id", "toolId", "toolName", "userId", "userName", "rating", "comment",
+    "status", "createdAt", "updatedAt", "moderatedBy", "moderationNote"
+]
+
+
+@router.get("/export")
+async def export_reviews(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    current_user: dict = Depends(require_admin),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Export reviews as a streamed download (admin only).
+    
+    - **format**: ndjson (default) or csv
+    - **status**: Filter by status (pending, approved, rejected)
+    """
+    filter_query = {}
+    if status_filter:
+        filter_query["status"] = status_filter
+    
+    projection = {field: 1 for field in EXPORT_FIELDS}
+    cursor = db.reviews.find(filter_query, projection).sort("_id", 1).batch_size(settings.EXPORT_BATCH_SIZE)
+    return export_response(cursor, EXPORT_FIELDS, format, "reviews")
+
+
+@router.patch("/bulk", response_model=ReviewBulkUpdateResponse)
+async def moderate_reviews_bulk(
+    bulk_update: ReviewBulkUpdate,
+    current_user: dict = Depends(require_admin),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Approve or reject many reviews in one request (admin only).
+    
+    Reviews are updated with a single bulk write, counters with another,
+    and each distinct affected tool gets exactly one rating update.
+    
+    - **ids**: Review IDs to moderate (max 1000)
+    - **status**: New status for all reviews
+    - **moderationNote**: Optional note about the moderation decision
+    """
+    results = {}
+    object_ids = []
+    for review_id in bulk_update.ids:
+        try:
+            object_ids.append(ObjectId(review_id))
+        except (InvalidId, TypeError):
+            results[review_id] = "invalid_id"
+    
+    reviews = await db.reviews.find(
+        {"_id": {"$in": object_ids}},
+        {"toolId": 1, "userId": 1, "status": 1, "rating": 1}
+    ).to_list(length=len(object_ids))
+    reviews_by_id = {str(review["_id"]): review for review in reviews}
+    
+    for object_id in object_ids:
+        if str(object_id) not in reviews_by_id:
+            results[str(object_id)] = "not_found"
+    
+    # Update each review only if its status has not changed since it was read
+    moderated_at = datetime.utcnow()
+    update_data = {
+        "status": bulk_update.status,
+        "moderatedBy": current_user["sub"],
+        "updatedAt": moderated_at
+    }
+    if bulk_update.moderationNote:
+        update_data["moderationNote"] = bulk_update.moderationNote
+    
+    operations = [
+        UpdateOne({"_id": review["_id"], "status": review["status"]}, {"$set": update_data})
+        for review in reviews
+    ]
+    applied = reviews
+    if operations:
+        result = await db.reviews.bulk_write(operations, ordered=False)
+        if result.modified_count < len(operations):
+            # Some reviews were moderated concurrently; keep only the ones we changed
+            changed = await db.reviews.find(
+                {
+                    "_id": {"$in": [review["_id"] for review in reviews]},
+                    "moderatedBy": current_user["sub"],
+                    "updatedAt": moderated_at
+                },
+                {"_id": 1}
+            ).to_list(length=len(reviews))
+            changed_ids = {doc["_id"] for doc in changed}
+            applied = [review for review in reviews if review["_id"] in changed_ids]
+    
+    # Aggregate counter and rating changes across all applied transitions
+    counter_deltas = {}
+    rating_deltas = {}
+    for review in applied:
+        new_review = {**review, "status": bulk_update.status}
+        for key in review_counter_keys(review):
+            counter_deltas[key] = counter_deltas.get(key, 0) - 1
+        for key in review_counter_keys(new_review):
+            counter_deltas[key] = counter_deltas.get(key, 0) + 1
+        
+        rating_delta, count_delta = review_transition_delta(
+            review["rating"], review["status"], bulk_update.status
+        )
+        tool_sum, tool_count = rating_deltas.get(review["toolId"], (0, 0))
+        rating_deltas[review["toolId"]] = (tool_sum + rating_delta, tool_count + count_delta)
+    
+    await apply_counter_deltas(db, counter_deltas)
+    for tool_id, (rating_delta, count_delta) in rating_deltas.items():
+        await apply_rating_delta(db, tool_id, rating_delta, count_delta)
+    
+    # Re-moderated approved reviews change public review pages (note,
+    # moderator, updatedAt) without a rating delta
+    if bulk_update.status == "approved":
+        await mark_reviews_changed(db, (
+            review["toolId"] for review in applied if review["status"] == "approved"
+        ))
+    
+    applied_ids = {str(review["_id"]) for review in applied}
+    for review_id in reviews_by_id:
+        results[review_id] = "updated" if review_id in applied_ids else "unchanged"
+    
+    return ReviewBulkUpdateResponse(
+        results=[ReviewBulkResult(id=review_id, result=results[review_id]) for review_id in bulk_update.ids],
+        updated=len(applied)
     )
 
 
@@ -103,14 +229,18 @@ async def moderate_review(
     """
     Approve or reject a review (admin only).
     
-    Automatically recalculates tool rating when review is approved.
+    Automatically updates the tool rating when the review enters or leaves
+    the approved state.
     
     - **status**: New status (approved or rejected)
     - **moderationNote**: Optional note about the moderation decision
     """
     # Verify review exists
     try:
-        review = await db.reviews.find_one({"_id": ObjectId(id)})
+        review = await db.reviews.find_one(
+            {"_id": ObjectId(id)},
+            {"toolId": 1, "userId": 1, "status": 1, "rating": 1}
+        )
     except:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -133,17 +263,36 @@ async def moderate_review(
     if review_update.moderationNote:
         update_data["moderationNote"] = review_update.moderationNote
     
-    await db.reviews.update_one(
-        {"_id": ObjectId(id)},
+    # Only the request that actually moves the review out of its previous
+    # status applies the side effects, so concurrent moderations stay exact
+    result = await db.reviews.update_one(
+        {"_id": ObjectId(id), "status": review["status"]},
         {"$set": update_data}
     )
     
-    # If approved, recalculate tool rating
-    if review_update.status == "approved":
-        await recalculate_tool_rating(db, review["toolId"])
+    if result.modified_count:
+        await move_counters(
+            db,
+            review_counter_keys(review),
+            review_counter_keys({**review, "status": review_update.status})
+        )
+        
+        # Adjust tool rating on approved <-> not approved transitions
+        await apply_review_transition(
+            db,
+            review["toolId"],
+            review["rating"],
+            review["status"],
+            review_update.status
+        )
+        
+        # An approved review stays public with a new note, moderator and
+        # updatedAt, which the rating update above does not record
+        if review["status"] == review_update.status == "approved":
+            await mark_reviews_changed(db, [review["toolId"]])
     
     # Return updated review
-    updated_review = await db.reviews.find_one({"_id": ObjectId(id)})
+    updated_review = await db.reviews.find_one({"_id": ObjectId(id)}, REVIEW_PROJECTION)
     updated_review["id"] = str(updated_review.pop("_id"))
     
     return Review(**updated_review)
@@ -1,12 +1,29 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 from datetime import datetime
 from typing import Optional
+from pymongo.errors import DuplicateKeyError
 
 from app.database import get_database
-from app.models.tool import ToolCreate, ToolUpdate, Tool, ToolListResponse
+from app.config import settings
+from app.models.tool import SORT_VALUE_TYPES, TOOL_LIST_ADAPTER, TOOL_PROJECTION, ToolCreate, ToolUpdate, Tool, ToolListResponse, ToolImportResponse, ToolSortField, SortOrder
 from app.utils.dependencies import require_admin
+from app.services import catalog_sync
+from app.services.catalog_snapshot import record_tool_deletion
+from app.services.list_service import build_tool_filter, fetch_page
+from app.services.rating_service import tool_rank_score
+from app.services.counter_service import (
+    increment_counters,
+    move_counters,
+    remove_tool_reviews_from_counters,
+    tool_counter_keys
+)
+from app.services.denormalization_service import propagate_tool_name
+from app.services.import_service import import_tools as import_tool_stream
+from app.utils.export import export_response
+from app.utils.responses import json_response, validate_documents
+from app.utils.pagination import DEFAULT_SORT, build_sort, decode_cursor, encode_cursor, keyset_filter
 import math
 
 
@@ -19,6 +36,10 @@ def tool_doc_to_model(doc: dict) -> Tool:
     return Tool(**doc)
 
 
+# Columns of a catalog export, in order
+EXPORT_FIELDS = ["_id"] + list(ToolCreate.model_fields) + ["avgRating", "reviewCount", "createdAt", "updatedAt"]
+
+
 @router.get("", response_model=ToolListResponse)
 async def get_all_tools(
     page: int = Query(1, ge=1),
@@ -27,50 +48,77 @@ async def get_all_tools(
     pricingModel: Optional[str] = None,
     minRating: Optional[float] = Query(None, ge=0, le=5),
     search: Optional[str] = None,
+    sort: Optional[ToolSortField] = None,
+    order: Optional[SortOrder] = None,
+    cursor: Optional[str] = None,
+    includeTotal: bool = True,
     current_user: dict = Depends(require_admin),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
     Get all tools (admin view with all fields).
     
-    Same filters as public endpoint but requires admin authentication.
+    Same filters, sorting and cursor pagination as public endpoint but requires admin authentication.
     """
-    # Build filter query
-    filter_query = {}
-    
-    if category:
-        filter_query["category"] = category
-    
-    if pricingModel:
-        filter_query["pricingModel"] = pricingModel
-    
-    if minRating is not None:
-        filter_query["avgRating"] = {"$gte": minRating}
-    
-    if search:
-        filter_query["$text"] = {"$search": search}
+    filter_query = build_tool_filter(category, pricingModel, minRating, search)
     
-    # Get total count
-    total = await db.tools.count_documents(filter_query)
+    # Calculate pagination (keyset mode when a cursor is given)
+    sort_spec = build_sort(sort.field, (order or sort.default_order) == SortOrder.DESC) if sort else DEFAULT_SORT
+    page_filter = None
+    if cursor:
+        page_filter = keyset_filter(sort_spec, decode_cursor(cursor, sort_spec, SORT_VALUE_TYPES))
+        skip = 0
+    else:
+        skip = (page - 1) * pageSize
     
-    # Calculate pagination
-    skip = (page - 1) * pageSize
-    total_pages = math.ceil(total / pageSize)
-    
-    # Get paginated results
-    cursor = db.tools.find(filter_query).skip(skip).limit(pageSize)
-    tools = await cursor.to_list(length=pageSize)
+    # Get paginated results and total in one round trip
+    # (one extra document tells whether there is a next page)
+    tools, total = await fetch_page(
+        db, "tools", filter_query, sort_spec, skip, pageSize + 1,
+        include_total=includeTotal, page_filter=page_filter, projection=TOOL_PROJECTION
+    )
+    total_pages = math.ceil(total / pageSize) if total is not None else None
+    has_more = len(tools) > pageSize
+    tools = tools[:pageSize]
+    next_cursor = encode_cursor(tools[-1], sort_spec) if has_more else None
     
     # Convert to models
-    items = [tool_doc_to_model(tool) for tool in tools]
+    items = validate_documents(TOOL_LIST_ADAPTER, tools)
     
-    return ToolListResponse(
+    return json_response(ToolListResponse(
         items=items,
         total=total,
         page=page,
         pageSize=pageSize,
-        totalPages=total_pages
-    )
+        totalPages=total_pages,
+        hasMore=has_more,
+        nextCursor=next_cursor
+    ))
+
+
+@router.get("/export")
+async def export_tools(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    category: Optional[str] = None,
+    pricingModel: Optional[str] = None,
+    minRating: Optional[float] = Query(None, ge=0, le=5),
+    search: Optional[str] = None,
+    current_user: dict = Depends(require_admin),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Export the catalog as a streamed download (admin only).
+    
+    Accepts the same filters as the admin listing. Tools are streamed
+    from a single cursor, so large exports use constant memory.
+    
+    - **format**: ndjson (default) or csv
+    """
+    filter_query = build_tool_filter(category, pricingModel, minRating, search)
+    projection = {field: 1 for field in EXPORT_FIELDS}
+    
+    cursor = db.tools.find(filter_query, projection).sort("_id", 1).batch_size(settings.EXPORT_BATCH_SIZE)
+    return export_response(cursor, EXPORT_FIELDS, format, "tools")
 
 
 @router.post("", response_model=Tool, status_code=status.HTTP_201_CREATED)
@@ -89,17 +137,46 @@ async def create_tool(
     tool_doc.update({
         "avgRating": 0.0,
         "reviewCount": 0,
+        "ratingSum": 0,
+        "ratingCount": 0,
         "createdAt": datetime.utcnow(),
         "updatedAt": datetime.utcnow()
     })
+    tool_doc["rankScore"] = tool_rank_score(tool_doc)
     
-    result = await db.tools.insert_one(tool_doc)
+    try:
+        result = await db.tools.insert_one(tool_doc)
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A tool with this sourceUrl already exists"
+        )
+    await increment_counters(db, tool_counter_keys(tool_doc))
     
     # Return created tool
     tool_doc["_id"] = result.inserted_id
+    catalog_sync.tool_saved(tool_doc)
     return tool_doc_to_model(tool_doc)
 
 
+@router.post("/import", response_model=ToolImportResponse)
+async def import_tools(
+    request: Request,
+    current_user: dict = Depends(require_admin),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Bulk import tools from a streamed request body (admin only).
+    
+    The body is either newline-delimited JSON (one ToolCreate object per
+    line) or a JSON array of ToolCreate objects. Tools are upserted by
+    sourceUrl in bounded batches while the body is still streaming in.
+    
+    Returns counts plus the line number and reason of each rejected line.
+    """
+    return await import_tool_stream(db, request.stream(), settings.IMPORT_BATCH_SIZE)
+
+
 @router.put("/{id}", response_model=Tool)
 async def update_tool(
     id: str,
@@ -112,9 +189,9 @@ async def update_tool(
     
     Only provided fields will be updated.
     """
-    # Verify tool exists
+    # Verify tool exists (and read what counters and renames depend on)
     try:
-        tool = await db.tools.find_one({"_id": ObjectId(id)})
+        tool = await db.tools.find_one({"_id": ObjectId(id)}, {"name": 1, "category": 1, "pricingModel": 1})
     except:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -139,13 +216,28 @@ async def update_tool(
     update_data["updatedAt"] = datetime.utcnow()
     
     # Update tool
-    await db.tools.update_one(
-        {"_id": ObjectId(id)},
-        {"$set": update_data}
-    )
+    try:
+        await db.tools.update_one(
+            {"_id": ObjectId(id)},
+            {"$set": update_data}
+        )
+    except DuplicateKeyError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="A tool with this sourceUrl already exists"
+        )
+    await move_counters(db, tool_counter_keys(tool), tool_counter_keys({**tool, **update_data}))
+    
+    # Keep the denormalized name on reviews in sync
+    if "name" in update_data and update_data["name"] != tool["name"]:
+        await propagate_tool_name(db, id, update_data["name"])
     
-    # Return updated tool
-    updated_tool = await db.tools.find_one({"_id": ObjectId(id)})
+    # Return updated tool (re-ranked when its seed rating or votes changed)
+    updated_tool = await db.tools.find_one({"_id": ObjectId(id)}, TOOL_PROJECTION)
+    if "ratingSeed" in update_data or "votes" in update_data:
+        updated_tool["rankScore"] = tool_rank_score(updated_tool)
+        await db.tools.update_one({"_id": ObjectId(id)}, {"$set": {"rankScore": updated_tool["rankScore"]}})
+    catalog_sync.tool_saved(updated_tool)
     return tool_doc_to_model(updated_tool)
 
 
@@ -160,9 +252,9 @@ async def delete_tool(
     
     This will permanently delete the tool and all associated reviews.
     """
-    # Verify tool exists
+    # Verify tool exists (and read what counters depend on)
     try:
-        tool = await db.tools.find_one({"_id": ObjectId(id)})
+        tool = await db.tools.find_one({"_id": ObjectId(id)}, {"category": 1, "pricingModel": 1})
     except:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -177,8 +269,12 @@ async def delete_tool(
     
     # Delete tool
     await db.tools.delete_one({"_id": ObjectId(id)})
+    await record_tool_deletion(db, id)
+    await increment_counters(db, tool_counter_keys(tool), -1)
+    catalog_sync.tool_deleted(id)
     
     # Delete associated reviews
+    await remove_tool_reviews_from_counters(db, id)
     await db.reviews.delete_many({"toolId": id})
     
     return None
@@ -1,15 +1,28 @@
 from fastapi import APIRouter, HTTPException, status, Depends
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
+from pymongo import ReturnDocument
 from datetime import datetime
 
+from app.config import settings
 from app.database import get_database
-from app.models.user import UserCreate, UserLogin, User, TokenResponse, UserRole
-from app.utils.auth import create_access_token, verify_password
+from app.models.user import UserCreate, UserLogin, UserUpdate, User, TokenResponse, UserRole
+from app.utils.auth import (
+    PASSWORD_HASH_SCHEME,
+    create_access_token,
+    hash_password_async,
+    needs_rehash,
+    verify_password_async
+)
+from app.utils.dependencies import require_user
+from app.services.denormalization_service import propagate_user_name
 
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
+# Compared against when the email is unknown (never matches, same cost)
+DUMMY_PASSWORD_HASH = f"{PASSWORD_HASH_SCHEME}${settings.PASSWORD_HASH_ITERATIONS}${'A' * 22}${'A' * 43}"
+
 
 @router.post("/signup", response_model=User, status_code=status.HTTP_201_CREATED)
 async def signup(
@@ -21,10 +34,10 @@ async def signup(
     
     - **name**: User's full name
     - **email**: User's email (must be unique)
-    - **password**: User's password (stored as plain text)
+    - **password**: User's password (stored hashed)
     """
     # Check if user already exists
-    existing_user = await db.users.find_one({"email": user_data.email})
+    existing_user = await db.users.find_one({"email": user_data.email}, {"_id": 1})
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -35,7 +48,7 @@ async def signup(
     user_doc = {
         "name": user_data.name,
         "email": user_data.email,
-        "password": user_data.password,  # Plain text password
+        "password": await hash_password_async(user_data.password),
         "role": UserRole.USER,
         "createdAt": datetime.utcnow()
     }
@@ -64,21 +77,34 @@ async def login(
     - **password**: User's password
     """
     # Find user by email
-    user = await db.users.find_one({"email": credentials.email})
+    user = await db.users.find_one(
+        {"email": credentials.email},
+        {"name": 1, "email": 1, "password": 1, "role": 1, "createdAt": 1}
+    )
     
     if not user:
+        # Spend the same KDF time as a real check so unknown emails
+        # can't be told apart by response time
+        await verify_password_async(credentials.password, DUMMY_PASSWORD_HASH)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
     
-    # Verify password (plain text comparison)
-    if not verify_password(credentials.password, user["password"]):
+    # Verify password (KDF runs off the event loop)
+    if not await verify_password_async(credentials.password, user["password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
     
+    # Upgrade plain text or older-cost hashes now that we know the password
+    if needs_rehash(user["password"]):
+        await db.users.update_one(
+            {"_id": user["_id"], "password": user["password"]},
+            {"$set": {"password": await hash_password_async(credentials.password)}}
+        )
+    
     # Create access token
     token_data = {
         "sub": str(user["_id"]),
@@ -100,3 +126,43 @@ async def login(
         access_token=access_token,
         user=user_response
     )
+
+
+@router.patch("/me", response_model=User)
+async def update_me(
+    user_update: UserUpdate,
+    current_user: dict = Depends(require_user),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Update the current user's profile.
+    
+    The new name is propagated to the user's reviews, which store it
+    denormalized for fast listing.
+    
+    - **name**: User's full name
+    """
+    user_id = current_user["sub"]
+    
+    user = await db.users.find_one_and_update(
+        {"_id": ObjectId(user_id)},
+        {"$set": {"name": user_update.name}},
+        projection={"name": 1, "email": 1, "role": 1, "createdAt": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
+    await propagate_user_name(db, user_id, user_update.name)
+    
+    return User(
+        id=str(user["_id"]),
+        name=user["name"],
+        email=user["email"],
+        role=user["role"],
+        createdAt=user.get("createdAt")
+    )
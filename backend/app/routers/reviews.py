@@ -2,10 +2,23 @@ from fastapi import APIRouter, HTTPException, status, Depends, Query
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 from datetime import datetime
+from typing import Optional
+from pymongo.errors import DuplicateKeyError
 
 from app.database import get_database
-from app.models.review import ReviewCreate, Review, ReviewWithToolName, ReviewListResponse, ReviewStatus
+from app.models.review import (
+    REVIEW_WITH_TOOL_NAME_LIST_ADAPTER,
+    REVIEW_WITH_TOOL_NAME_PROJECTION,
+    ReviewCreate,
+    Review,
+    ReviewWithToolName,
+    ReviewListResponse,
+    ReviewStatus
+)
 from app.utils.dependencies import require_user
+from app.services.counter_service import increment_counters, review_counter_keys
+from app.services.list_service import fetch_page
+from app.utils.responses import json_response, select_list_fields, validate_documents
 
 
 router = APIRouter(prefix="/reviews", tags=["Reviews"])
@@ -26,7 +39,7 @@ async def create_review(
     """
     # Verify tool exists
     try:
-        tool = await db.tools.find_one({"_id": ObjectId(review_data.toolId)})
+        tool = await db.tools.find_one({"_id": ObjectId(review_data.toolId)}, {"name": 1})
     except:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -43,7 +56,7 @@ async def create_review(
     existing_review = await db.reviews.find_one({
         "toolId": review_data.toolId,
         "userId": current_user["sub"]
-    })
+    }, {"_id": 1})
     
     if existing_review:
         raise HTTPException(
@@ -51,10 +64,20 @@ async def create_review(
             detail="You have already reviewed this tool"
         )
     
+    # Look up the author's name so listings don't need to join with users
+    user = await db.users.find_one({"_id": ObjectId(current_user["sub"])}, {"name": 1})
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    
     # Create review document
     review_doc = {
         "toolId": review_data.toolId,
         "userId": current_user["sub"],
+        "userName": user["name"],
+        "toolName": tool["name"],
         "rating": review_data.rating,
         "comment": review_data.comment,
         "status": ReviewStatus.PENDING,
@@ -64,7 +87,15 @@ async def create_review(
         "moderationNote": None
     }
     
-    result = await db.reviews.insert_one(review_doc)
+    try:
+        result = await db.reviews.insert_one(review_doc)
+    except DuplicateKeyError:
+        # Lost a race with a concurrent submission (unique toolId + userId index)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="You have already reviewed this tool"
+        )
+    await increment_counters(db, review_counter_keys(review_doc))
     
     # Return created review
     review_doc["id"] = str(result.inserted_id)
@@ -77,59 +108,44 @@ async def create_review(
 async def get_my_reviews(
     page: int = Query(1, ge=1),
     pageSize: int = Query(20, ge=1, le=100),
+    includeTotal: bool = True,
+    fields: Optional[str] = None,
     current_user: dict = Depends(require_user),
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
-    Get current user's own reviews.
+    Get current user's own reviews, newest first.
     
     - **page**: Page number (default: 1)
     - **pageSize**: Items per page (default: 20, max: 100)
+    - **includeTotal**: Set to false to skip counting and rely on hasMore
+    - **fields**: Comma-separated fields to return per item (e.g. rating,comment,toolName); _id is always included
     """
+    response_model, adapter, projection = select_list_fields(
+        ReviewListResponse, ReviewWithToolName, fields, REVIEW_WITH_TOOL_NAME_PROJECTION, REVIEW_WITH_TOOL_NAME_LIST_ADAPTER
+    )
+    
     filter_query = {"userId": current_user["sub"]}
     
-    total = await db.reviews.count_documents(filter_query)
     skip = (page - 1) * pageSize
     
-    # Aggregate to join with tools
-    pipeline = [
-        {"$match": filter_query},
-        {"$skip": skip},
-        {"$limit": pageSize},
-        {
-            "$lookup": {
-                "from": "tools",
-                "let": {"toolId": {"$toObjectId": "$toolId"}},
-                "pipeline": [
-                    {"$match": {"$expr": {"$eq": ["$_id", "$$toolId"]}}}
-                ],
-                "as": "tool"
-            }
-        },
-        {"$unwind": "$tool"},
-        {
-            "$addFields": {
-                "toolName": "$tool.name"
-            }
-        },
-        {
-            "$project": {
-                "tool": 0
-            }
-        }
-    ]
-    
-    reviews = await db.reviews.aggregate(pipeline).to_list(length=pageSize)
+    # Reviews carry a denormalized toolName, so this is a plain indexed find,
+    # fetched together with the total in one round trip
+    reviews, total = await fetch_page(
+        db, "reviews", filter_query, [("createdAt", -1), ("_id", -1)], skip, pageSize + 1,
+        include_total=includeTotal, projection=projection
+    )
+    has_more = len(reviews) > pageSize
     
     # Convert to models
-    items = []
+    reviews = reviews[:pageSize]
     for review in reviews:
-        review["id"] = str(review.pop("_id"))
-        items.append(ReviewWithToolName(**review))
+        review.setdefault("toolName", "Unknown tool")
     
-    return ReviewListResponse(
-        items=items,
+    return json_response(response_model(
+        items=validate_documents(adapter, reviews),
         total=total,
         page=page,
-        pageSize=pageSize
-    )
+        pageSize=pageSize,
+        hasMore=has_more
+    ))
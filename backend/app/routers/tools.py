@@ -1,21 +1,112 @@
-from fastapi import APIRouter, HTTPException, status, Depends, Query
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Response
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
 from typing import Optional
+import asyncio
 import math
+import re
 
+from app.config import settings
 from app.database import get_database
-from app.models.tool import Tool, ToolListResponse
-from app.models.review import ReviewWithUserName, ReviewListResponse
+from app.models.tool import (
+    TOOL_LIST_ADAPTER,
+    SORT_VALUE_TYPES,
+    TOOL_PROJECTION,
+    SortOrder,
+    Tool,
+    ToolFacetsResponse,
+    ToolListResponse,
+    ToolSortField,
+    ToolSuggestResponse,
+    ToolTopResponse
+)
+from app.models.review import (
+    REVIEW_WITH_USER_NAME_LIST_ADAPTER,
+    REVIEW_WITH_USER_NAME_PROJECTION,
+    ReviewWithUserName,
+    ReviewListResponse
+)
+from app.services.catalog_snapshot import catalog_snapshot
+from app.services.detail_cache import tool_detail_cache
+from app.services.facet_service import get_tool_facets
+from app.services.list_service import build_tool_filter, fetch_page
+from app.services.read_flights import detail_flight, list_flight, reviews_flight
+from app.services.response_cache import response_cache
+from app.services.search_index import search_index
+from app.services.suggest_index import suggest_index
+from app.services.top_tools_service import get_top_tools
+from app.utils.projection import fieldset_projection, parse_fieldset, partial_model
+from app.utils.responses import json_response, select_list_fields, validate_documents
+from app.utils.http_cache import (
+    CachedResponse,
+    conditional_response,
+    document_version,
+    is_not_modified,
+    make_etag,
+    not_modified_response
+)
+from app.utils.pagination import (
+    DEFAULT_SORT,
+    build_sort,
+    decode_cursor,
+    decode_offset_cursor,
+    encode_cursor,
+    encode_offset_cursor,
+    keyset_filter
+)
 
 
 router = APIRouter(prefix="/tools", tags=["Tools"])
 
+# A tool's representations change with the tool itself or its approved reviews
+VERSION_FIELDS = ("updatedAt", "reviewsModifiedAt")
+VERSION_PROJECTION = {field: 1 for field in VERSION_FIELDS}
 
-def tool_doc_to_model(doc: dict) -> Tool:
-    """Convert MongoDB document to Tool model."""
-    doc["id"] = str(doc.pop("_id"))
-    return Tool(**doc)
+
+async def search_tools(
+    db: AsyncIOMotorDatabase,
+    search: str,
+    category: Optional[str],
+    pricingModel: Optional[str],
+    minRating: Optional[float],
+    page: int,
+    pageSize: int,
+    cursor: Optional[str],
+    fields: Optional[str]
+) -> ToolListResponse:
+    """
+    Serve a search from the in-memory BM25 index, ordered by relevance.
+    
+    Filters are applied inside the index; only the tools on the requested
+    page are fetched from MongoDB.
+    """
+    response_model, adapter, projection = select_list_fields(
+        ToolListResponse, Tool, fields, TOOL_PROJECTION, TOOL_LIST_ADAPTER
+    )
+    offset = decode_offset_cursor(cursor) if cursor else (page - 1) * pageSize
+    # BM25 scoring is pure Python; run it on a thread so other requests keep being served
+    ranked, total = await asyncio.to_thread(
+        search_index.search, search, category, pricingModel, minRating, offset + pageSize
+    )
+    page_ids = ranked[offset:offset + pageSize]
+    has_more = offset + pageSize < total
+    
+    docs = await db.tools.find(
+        {"_id": {"$in": [ObjectId(tool_id) for tool_id in page_ids]}},
+        projection
+    ).to_list(length=pageSize)
+    docs_by_id = {str(doc["_id"]): doc for doc in docs}
+    ordered = [docs_by_id[tool_id] for tool_id in page_ids if tool_id in docs_by_id]
+    
+    return json_response(response_model(
+        items=validate_documents(adapter, ordered),
+        total=total,
+        page=page,
+        pageSize=pageSize,
+        totalPages=math.ceil(total / pageSize),
+        hasMore=has_more,
+        nextCursor=encode_offset_cursor(offset + pageSize) if has_more else None
+    ))
 
 
 @router.get("", response_model=ToolListResponse)
@@ -26,6 +117,11 @@ async def get_tools(
     pricingModel: Optional[str] = None,
     minRating: Optional[float] = Query(None, ge=0, le=5),
     search: Optional[str] = None,
+    sort: Optional[ToolSortField] = None,
+    order: Optional[SortOrder] = None,
+    cursor: Optional[str] = None,
+    includeTotal: bool = True,
+    fields: Optional[str] = None,
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
@@ -36,147 +132,327 @@ async def get_tools(
     - **category**: Filter by category
     - **pricingModel**: Filter by pricing model
     - **minRating**: Minimum average rating
-    - **search**: Search in name and description
+    - **search**: Search in name and description (ranked by relevance unless sort is given)
+    - **sort**: Sort by avgRating, votes, reviewCount, createdAt, name or rank (rankScore, a rating that weighs in the number of reviews)
+    - **order**: asc or desc (default: asc for name, desc otherwise)
+    - **cursor**: Opaque cursor from a previous response's nextCursor (overrides page)
+    - **includeTotal**: Set to false to skip counting and rely on hasMore
+    - **fields**: Comma-separated fields to return per item (e.g. name,category,avgRating); _id is always included
     """
-    # Build filter query
-    filter_query = {}
+    # Relevance-ranked search from the in-memory index when it is loaded
+    if search and settings.SEARCH_ENGINE == "bm25" and search_index.ready and not sort:
+        return await search_tools(db, search, category, pricingModel, minRating, page, pageSize, cursor, fields)
     
-    if category:
-        filter_query["category"] = category
+    filter_query = build_tool_filter(category, pricingModel, minRating, search)
     
-    if pricingModel:
-        filter_query["pricingModel"] = pricingModel
+    # Only read the requested fields (plus the sort key the cursor needs)
+    response_model, adapter, projection = select_list_fields(
+        ToolListResponse, Tool, fields, TOOL_PROJECTION, TOOL_LIST_ADAPTER
+    )
     
-    if minRating is not None:
-        filter_query["avgRating"] = {"$gte": minRating}
+    # Calculate pagination (keyset mode when a cursor is given)
+    sort_spec = build_sort(sort.field, (order or sort.default_order) == SortOrder.DESC) if sort else DEFAULT_SORT
     
-    if search:
-        filter_query["$text"] = {"$search": search}
+    # Browse pages repeat a lot and are served from the response cache;
+    # searches are too varied to be worth caching
+    cache_key = None
+    generation = None
+    if response_cache.enabled and not search:
+        generation = await response_cache.generation()
+        cache_key = response_cache.key({
+            "category": category,
+            "pricingModel": pricingModel,
+            "minRating": minRating,
+            "sort": sort_spec,
+            "page": None if cursor else page,
+            "cursor": cursor,
+            "pageSize": pageSize,
+            "includeTotal": includeTotal,
+            "fields": sorted({field.strip() for field in fields.split(",")}) if fields else None
+        }, generation)
+        cached = await response_cache.get(cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
     
-    # Get total count
-    total = await db.tools.count_documents(filter_query)
+    after = decode_cursor(cursor, sort_spec, SORT_VALUE_TYPES) if cursor else None
+    skip = 0 if cursor else (page - 1) * pageSize
     
-    # Calculate pagination
-    skip = (page - 1) * pageSize
-    total_pages = math.ceil(total / pageSize)
+    async def load() -> bytes:
+        # One extra document tells whether there is a next page
+        # (the snapshot must have polled since the cache generation, or it
+        # could fill the shared cache with a page from before another
+        # worker's write)
+        if not search and catalog_snapshot.serves(generation):
+            tools, total = catalog_snapshot.page(
+                category, pricingModel, minRating, sort_spec, skip, pageSize + 1,
+                after=after, include_total=includeTotal
+            )
+        else:
+            # Get paginated results and total in one round trip
+            tools, total = await fetch_page(
+                db, "tools", filter_query, sort_spec, skip, pageSize + 1,
+                include_total=includeTotal,
+                page_filter=keyset_filter(sort_spec, after) if cursor else None,
+                projection={**projection, **{field: 1 for field, _ in sort_spec}}
+            )
+        total_pages = math.ceil(total / pageSize) if total is not None else None
+        has_more = len(tools) > pageSize
+        tools = tools[:pageSize]
+        next_cursor = encode_cursor(tools[-1], sort_spec) if has_more else None
+        
+        # Convert to models
+        items = validate_documents(adapter, tools)
+        
+        body = json_response(response_model(
+            items=items,
+            total=total,
+            page=page,
+            pageSize=pageSize,
+            totalPages=total_pages,
+            hasMore=has_more,
+            nextCursor=next_cursor
+        )).body
+        if cache_key:
+            await response_cache.set(cache_key, body)
+        return body
     
-    # Get paginated results
-    cursor = db.tools.find(filter_query).skip(skip).limit(pageSize)
-    tools = await cursor.to_list(length=pageSize)
+    # Concurrent misses for the same cached page share one query
+    body = await list_flight.do(cache_key, load) if cache_key else await load()
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/facets", response_model=ToolFacetsResponse)
+async def get_tools_facets(
+    category: Optional[str] = None,
+    pricingModel: Optional[str] = None,
+    minRating: Optional[float] = Query(None, ge=0, le=5),
+    search: Optional[str] = None,
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Get facet counts for the filter sidebar.
     
-    # Convert to models
-    items = [tool_doc_to_model(tool) for tool in tools]
+    Takes the same filters as the tool list. Each facet is counted with
+    all filters except its own, so it shows what selecting another value
+    would return; total applies every filter.
     
-    return ToolListResponse(
-        items=items,
-        total=total,
-        page=page,
-        pageSize=pageSize,
-        totalPages=total_pages
-    )
+    - **category**: Filter by category
+    - **pricingModel**: Filter by pricing model
+    - **minRating**: Minimum average rating
+    - **search**: Search in name and description
+    """
+    return await get_tool_facets(db, category, pricingModel, minRating, search)
+
+
+@router.get("/suggest", response_model=ToolSuggestResponse)
+async def suggest_tools(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(10, ge=1, le=20),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Typeahead suggestions for the search box.
+    
+    Matches tool names (whole name or any word) and categories by prefix,
+    ranked by votes and average rating. Served from memory once the
+    catalog is loaded.
+    
+    - **q**: Typed prefix
+    - **limit**: Maximum number of suggestions (default: 10, max: 20)
+    """
+    if suggest_index.ready:
+        return ToolSuggestResponse(items=suggest_index.suggest(q, limit))
+    
+    # Catalog still loading: anchored name prefix match in MongoDB
+    tools = await db.tools.find(
+        {"name": {"$regex": f"^{re.escape(q.strip())}", "$options": "i"}},
+        {"name": 1, "category": 1}
+    ).sort([("votes", -1), ("avgRating", -1)]).limit(limit).to_list(length=limit)
+    
+    return ToolSuggestResponse(items=[
+        {"type": "tool", "id": str(tool["_id"]), "label": tool["name"], "category": tool.get("category")}
+        for tool in tools
+    ])
+
+
+@router.get("/top", response_model=ToolTopResponse)
+async def get_tools_top(
+    category: Optional[str] = None,
+    limit: int = Query(settings.TOP_TOOLS_SIZE, ge=1, le=settings.TOP_TOOLS_SIZE),
+    db: AsyncIOMotorDatabase = Depends(get_database)
+):
+    """
+    Get the highest-ranked tools, by rankScore.
+    
+    Served from lists rebuilt in the background every
+    TOP_TOOLS_REFRESH_SECONDS; refreshedAt tells how fresh they are.
+    
+    - **category**: Only rank tools in this category
+    - **limit**: Number of tools (default and max: TOP_TOOLS_SIZE)
+    """
+    top = await get_top_tools(db, category, limit)
+    
+    return json_response(ToolTopResponse(
+        category=top["category"],
+        items=validate_documents(TOOL_LIST_ADAPTER, top["tools"]),
+        refreshedAt=top["refreshedAt"]
+    ))
 
 
 @router.get("/{id}", response_model=Tool)
 async def get_tool(
     id: str,
+    request: Request,
+    fields: Optional[str] = None,
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
     Get detailed information about a specific tool.
     
+    Responses carry ETag and Last-Modified; conditional requests get
+    304 Not Modified, without a database read while the tool is cached.
+    A stale cached copy is served while one background read refreshes it.
+    
     - **id**: Tool ID
+    - **fields**: Comma-separated fields to return; _id is always included
     """
-    try:
-        tool = await db.tools.find_one({"_id": ObjectId(id)})
-    except:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid tool ID"
-        )
+    fieldset = parse_fieldset(Tool, fields)
+    variant = ("tool", tuple(sorted(fieldset)) if fieldset else None)
+    generation = tool_detail_cache.generation
     
-    if not tool:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tool not found"
+    async def load() -> CachedResponse:
+        projection = fieldset_projection(Tool, fieldset) if fieldset else TOOL_PROJECTION
+        
+        try:
+            tool = await db.tools.find_one({"_id": ObjectId(id)}, {**projection, **VERSION_PROJECTION})
+        except:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid tool ID"
+            )
+        
+        if not tool:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tool not found"
+            )
+        
+        version = document_version(tool, *VERSION_FIELDS)
+        tool["_id"] = str(tool["_id"])
+        model = partial_model(Tool, fieldset) if fieldset else Tool
+        
+        cached = CachedResponse(
+            body=json_response(model.model_validate(tool)).body,
+            etag=make_etag(version, variant),
+            last_modified=version
         )
+        tool_detail_cache.set(id, variant, cached, generation)
+        return cached
     
-    return tool_doc_to_model(tool)
+    # Concurrent identical misses share one read
+    cached, stale = tool_detail_cache.get(id, variant)
+    if cached is None:
+        cached = await detail_flight.do((id, variant, generation), load)
+    elif stale:
+        detail_flight.start((id, variant, generation), load)
+    
+    return conditional_response(request, cached, settings.TOOL_CACHE_CONTROL)
 
 
 @router.get("/{id}/reviews", response_model=ReviewListResponse)
 async def get_tool_reviews(
     id: str,
+    request: Request,
     page: int = Query(1, ge=1),
     pageSize: int = Query(20, ge=1, le=100),
+    includeTotal: bool = True,
+    fields: Optional[str] = None,
     db: AsyncIOMotorDatabase = Depends(get_database)
 ):
     """
     Get approved reviews for a specific tool.
     
+    Pages carry ETag and Last-Modified from the tool's last review change;
+    conditional requests get 304 Not Modified without reading reviews.
+    A stale cached page is served while one background read refreshes it.
+    
     - **id**: Tool ID
     - **page**: Page number (default: 1)
     - **pageSize**: Items per page (default: 20, max: 100)
+    - **includeTotal**: Set to false to skip counting and rely on hasMore
+    - **fields**: Comma-separated fields to return per item (e.g. rating,comment,userName); _id is always included
     """
-    # Verify tool exists
-    try:
-        tool = await db.tools.find_one({"_id": ObjectId(id)})
-    except:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid tool ID"
-        )
+    response_model, adapter, projection = select_list_fields(
+        ReviewListResponse, ReviewWithUserName, fields, REVIEW_WITH_USER_NAME_PROJECTION, REVIEW_WITH_USER_NAME_LIST_ADAPTER
+    )
+    variant = ("reviews", page, pageSize, includeTotal, tuple(sorted(projection)))
+    generation = tool_detail_cache.generation
     
-    if not tool:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tool not found"
+    async def load_version():
+        # Verify tool exists (and read its version)
+        try:
+            tool = await db.tools.find_one({"_id": ObjectId(id)}, VERSION_PROJECTION)
+        except:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid tool ID"
+            )
+        
+        if not tool:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tool not found"
+            )
+        
+        return document_version(tool, *VERSION_FIELDS)
+    
+    async def load_page(version) -> CachedResponse:
+        # Get approved reviews (with denormalized user names)
+        filter_query = {"toolId": id, "status": "approved"}
+        
+        skip = (page - 1) * pageSize
+        
+        # Reviews carry a denormalized userName, so this is a plain indexed find,
+        # fetched together with the total in one round trip
+        reviews, total = await fetch_page(
+            db, "reviews", filter_query, None, skip, pageSize + 1,
+            include_total=includeTotal, projection=projection
+        )
+        has_more = len(reviews) > pageSize
+        
+        # Convert to models
+        reviews = reviews[:pageSize]
+        for review in reviews:
+            review.setdefault("userName", "Unknown user")
+        
+        cached = CachedResponse(
+            body=json_response(response_model(
+                items=validate_documents(adapter, reviews),
+                total=total,
+                page=page,
+                pageSize=pageSize,
+                hasMore=has_more
+            )).body,
+            etag=make_etag(version, variant),
+            last_modified=version
         )
+        tool_detail_cache.set(id, variant, cached, generation)
+        return cached
     
-    # Get approved reviews with user names
-    filter_query = {"toolId": id, "status": "approved"}
-    
-    total = await db.reviews.count_documents(filter_query)
-    skip = (page - 1) * pageSize
-    
-    # Aggregate to join with users
-    pipeline = [
-        {"$match": filter_query},
-        {"$skip": skip},
-        {"$limit": pageSize},
-        {
-            "$lookup": {
-                "from": "users",
-                "let": {"userId": {"$toObjectId": "$userId"}},
-                "pipeline": [
-                    {"$match": {"$expr": {"$eq": ["$_id", "$$userId"]}}}
-                ],
-                "as": "user"
-            }
-        },
-        {"$unwind": "$user"},
-        {
-            "$addFields": {
-                "userName": "$user.name"
-            }
-        },
-        {
-            "$project": {
-                "user": 0
-            }
-        }
-    ]
-    
-    reviews = await db.reviews.aggregate(pipeline).to_list(length=pageSize)
-    
-    # Convert to models
-    items = []
-    for review in reviews:
-        review["id"] = str(review.pop("_id"))
-        items.append(ReviewWithUserName(**review))
-    
-    return ReviewListResponse(
-        items=items,
-        total=total,
-        page=page,
-        pageSize=pageSize
-    )
+    async def refresh() -> CachedResponse:
+        return await load_page(await load_version())
+    
+    cached, stale = tool_detail_cache.get(id, variant)
+    if cached is not None:
+        if stale:
+            reviews_flight.start(("refresh", id, variant, generation), refresh)
+        return conditional_response(request, cached, settings.TOOL_REVIEWS_CACHE_CONTROL)
+    
+    # Concurrent identical misses share one version read and one page read
+    version = await reviews_flight.do(("version", id, generation), load_version)
+    etag = make_etag(version, variant)
+    if is_not_modified(request, etag, version):
+        return not_modified_response(etag, version, settings.TOOL_REVIEWS_CACHE_CONTROL)
+    
+    cached = await reviews_flight.do(("page", id, variant, version, generation), lambda: load_page(version))
+    return conditional_response(request, cached, settings.TOOL_REVIEWS_CACHE_CONTROL)
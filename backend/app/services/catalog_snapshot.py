@@ -0,0 +1,447 @@
+import asyncio
+import calendar
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import defaultdict
+from datetime import datetime, timedelta
+from itertools import islice
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.models.tool import TOOL_PROJECTION, ToolSortField
+from app.services.response_cache import response_cache
+from app.utils.pagination import SortSpec
+
+
+# Every field a tool page can be sorted on (_id is the default order)
+SORT_FIELDS = [field.field for field in ToolSortField] + ["_id"]
+
+# Fields whose change marks a tool as modified for polling
+VERSION_FIELDS = ("updatedAt", "reviewsModifiedAt")
+
+# Polls re-read this far behind the newest version seen, so writes stamped
+# by a worker whose clock lags slightly are not missed
+POLL_OVERLAP = timedelta(seconds=5)
+
+# Deleted tools leave a tombstone here, so every worker's poll drops them
+TOMBSTONES_COLLECTION = "tool_tombstones"
+
+# Tombstones expire (TTL index) long after every worker has fully reloaded
+TOMBSTONE_SECONDS = 86400
+
+# A poll changing more than this share of the catalog rebuilds the columns
+# off the event loop instead of patching rows one by one
+REBUILD_FRACTION = 0.05
+
+# Group code matching any category or pricing model
+ANY = -1
+
+
+def _sort_value(value: Any) -> tuple:
+    """Comparable form of a field value, in MongoDB's order (null first)."""
+    if value is None:
+        return (0, 0)
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.replace(tzinfo=None) - value.utcoffset()
+        return (1, calendar.timegm(value.timetuple()) * 1000 + value.microsecond // 1000)
+    return (1, value)
+
+
+def _row_key(field: str, value: Any, tool_id) -> tuple:
+    """Sort key of a row for (field, _id) ordering."""
+    if field == "_id":
+        return (tool_id.binary,)
+    return (_sort_value(value), tool_id.binary)
+
+
+class _KeyedOrder:
+    """Sequence view of a permutation as its rows' sort keys, for bisect."""
+
+    def __init__(self, order: array, keys: List[tuple], part: slice = slice(None)):
+        self.order = order
+        self.keys = keys
+        self.part = part
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def __getitem__(self, position: int):
+        return self.keys[self.order[position]][self.part]
+
+
+class _Columns:
+    """
+    Column store of the snapshot's rows with a sort permutation per field and group.
+
+    Built in one pass on full loads (off the event loop), then patched in
+    place: a changed row is bisected out of and back into the 4 groups it
+    belongs to for each sort field, so a write costs a few array memmoves
+    instead of re-sorting the catalog. Row numbers are stable; removed
+    rows are reused.
+    """
+
+    def __init__(self, docs: Iterable[dict]):
+        self.docs: List[Optional[dict]] = []
+        self.row_ids: Dict[str, int] = {}
+        self.free: List[int] = []
+        self.category_codes: Dict[str, int] = {}
+        self.pricing_codes: Dict[str, int] = {}
+        self.categories = array("H")
+        self.pricing = array("B")
+        self.ratings = array("d")
+        self.keys: Dict[str, List[tuple]] = {field: [] for field in SORT_FIELDS}
+        # (field, category code, pricing code) -> row numbers in ascending order
+        self.orders: Dict[Tuple[str, int, int], array] = {}
+        # (category code, pricing code) -> ascending avgRating values, for totals
+        self.sorted_ratings: Dict[Tuple[int, int], array] = {}
+
+        for doc in docs:
+            self._store(self._new_row(), doc)
+
+        for field, keys in self.keys.items():
+            full = sorted(range(len(self.docs)), key=keys.__getitem__)
+
+            # Distributing the sorted rows keeps every group in order
+            groups = defaultdict(list)
+            for row in full:
+                for group in self._groups(row):
+                    groups[group].append(row)
+            for (category, pricing_model), rows in groups.items():
+                self.orders[(field, category, pricing_model)] = array("I", rows)
+
+        self.sorted_ratings = {
+            (category, pricing_model): array("d", (self.ratings[row] for row in order))
+            for (field, category, pricing_model), order in self.orders.items()
+            if field == "avgRating"
+        }
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+    def get(self, tool_id: str) -> Optional[dict]:
+        row = self.row_ids.get(tool_id)
+        return None if row is None else self.docs[row]
+
+    def upsert(self, doc: dict):
+        """Add a row, or move an existing one to its new positions."""
+        row = self.row_ids.get(str(doc["_id"]))
+        if row is not None:
+            self._unlink(row)
+        else:
+            row = self.free.pop() if self.free else self._new_row()
+        self._store(row, doc)
+        self._link(row)
+
+    def remove(self, tool_id: str):
+        """Drop a row if present."""
+        row = self.row_ids.pop(tool_id, None)
+        if row is None:
+            return
+        self._unlink(row)
+        self.docs[row] = None
+        self.free.append(row)
+
+    def _new_row(self) -> int:
+        self.docs.append(None)
+        self.categories.append(0)
+        self.pricing.append(0)
+        self.ratings.append(0.0)
+        for keys in self.keys.values():
+            keys.append(None)
+        return len(self.docs) - 1
+
+    def _store(self, row: int, doc: dict):
+        """Write a document into a row's columns (before linking it)."""
+        self.docs[row] = doc
+        self.row_ids[str(doc["_id"])] = row
+        self.categories[row] = self.category_codes.setdefault(doc.get("category"), len(self.category_codes))
+        self.pricing[row] = self.pricing_codes.setdefault(doc.get("pricingModel"), len(self.pricing_codes))
+        self.ratings[row] = float("-inf") if doc.get("avgRating") is None else doc["avgRating"]
+        for field, keys in self.keys.items():
+            keys[row] = _row_key(field, doc.get(field), doc["_id"])
+
+    def _groups(self, row: int) -> Tuple[Tuple[int, int], ...]:
+        """Filter groups a row belongs to, including the "any" groups."""
+        category, pricing_model = self.categories[row], self.pricing[row]
+        return ((ANY, ANY), (category, ANY), (ANY, pricing_model), (category, pricing_model))
+
+    def _unlink(self, row: int):
+        """Take a row out of every permutation and rating column."""
+        groups = self._groups(row)
+        for field, keys in self.keys.items():
+            for category, pricing_model in groups:
+                order = self.orders[(field, category, pricing_model)]
+                del order[bisect_left(_KeyedOrder(order, keys), keys[row])]
+        for group in groups:
+            rated = self.sorted_ratings[group]
+            del rated[bisect_left(rated, self.ratings[row])]
+
+    def _link(self, row: int):
+        """Insert a row into every permutation and rating column of its groups."""
+        groups = self._groups(row)
+        for field, keys in self.keys.items():
+            for category, pricing_model in groups:
+                order = self.orders.setdefault((field, category, pricing_model), array("I"))
+                order.insert(bisect_left(_KeyedOrder(order, keys), keys[row]), row)
+        for group in groups:
+            insort(self.sorted_ratings.setdefault(group, array("d")), self.ratings[row])
+
+
+async def record_tool_deletion(db: AsyncIOMotorDatabase, tool_id: str):
+    """Leave a tombstone for a deleted tool for the snapshot polls of all workers."""
+    await db[TOMBSTONES_COLLECTION].update_one(
+        {"_id": tool_id},
+        {"$set": {"deletedAt": datetime.utcnow()}},
+        upsert=True
+    )
+
+
+class CatalogSnapshot:
+    """
+    Read-only, in-memory copy of the tool catalog that answers list pages.
+
+    Tools are held as compact columns (array-backed ratings, interned
+    category and pricing model codes) with a precomputed permutation per
+    sort field and filter group. A page is then a bisect plus a slice of
+    one permutation, and a filtered total is a bisect into a sorted rating
+    column, instead of a MongoDB find and count.
+
+    A full load builds the columns off the event loop; between loads, polls
+    read only tools whose updatedAt/reviewsModifiedAt moved, and tombstones
+    of deleted tools, and patch their rows in place. Rating changes in this
+    worker are patched in as they happen. Other writes in this worker take
+    the snapshot out of service until the next poll (woken at once) has
+    applied them, so callers fall back to MongoDB instead of serving a page
+    from before the write.
+
+    With a shared response cache, writes in other workers bump its
+    generation; a snapshot that has not polled since the generation a
+    request saw is out of service for that request in the same way.
+    Otherwise other workers' writes show up within one poll interval.
+    """
+
+    def __init__(self):
+        self._columns: Optional[_Columns] = None
+        self._watermark: Optional[datetime] = None
+        self._generation: Optional[int] = None
+        self._removed: set = set()
+        self._changes = 0
+        self._synced = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def __len__(self) -> int:
+        return len(self._columns) if self._columns else 0
+
+    @property
+    def ready(self) -> bool:
+        """Whether pages can be served (loaded, no unapplied local writes)."""
+        return self._columns is not None and self._synced == self._changes
+
+    def serves(self, generation: Optional[int]) -> bool:
+        """
+        Whether pages can be served to a request that saw `generation`.
+
+        Args:
+            generation: Shared response cache generation read by the request
+                (None without a shared cache)
+        """
+        if not self.ready:
+            return False
+        if generation is None or self._generation is None or self._generation >= generation:
+            return True
+        # Another worker wrote since the last poll; catch up now
+        if self._wakeup:
+            self._wakeup.set()
+        return False
+
+    def tool_changed(self):
+        """Record that a tool was written in this worker."""
+        self._changes += 1
+        if self._wakeup:
+            self._wakeup.set()
+
+    def tool_deleted(self, tool_id: str):
+        """Record that a tool was deleted in this worker."""
+        self._removed.add(tool_id)
+        self.tool_changed()
+
+    def update_rating(self, tool_id: str, avg_rating: float, review_count: int, rank_score: Optional[float]):
+        """
+        Apply a rating change made in this worker without leaving service.
+
+        While a poll is running (it may hold an older copy of the tool), or
+        for a tool not in the snapshot, this falls back to tool_changed.
+        """
+        doc = self._columns.get(tool_id) if self._columns else None
+        if doc is None or self._get_lock().locked():
+            self.tool_changed()
+            return
+
+        doc = {**doc, "avgRating": avg_rating, "reviewCount": review_count}
+        if rank_score is not None:
+            doc["rankScore"] = rank_score
+        self._columns.upsert(doc)
+
+    def page(
+        self,
+        category: Optional[str],
+        pricingModel: Optional[str],
+        minRating: Optional[float],
+        sort: SortSpec,
+        skip: int,
+        limit: int,
+        after: Optional[List[Any]] = None,
+        include_total: bool = True
+    ) -> Tuple[List[dict], Optional[int]]:
+        """
+        Fetch a page of tools, like list_service.fetch_page on the tools collection.
+
+        Args:
+            category: Category filter
+            pricingModel: Pricing model filter
+            minRating: Minimum avgRating filter
+            sort: Sort from build_sort, or DEFAULT_SORT
+            skip: Rows to skip (0 with a cursor)
+            limit: Maximum rows to return
+            after: Sort key values decoded from a cursor
+            include_total: Whether to count the filter's matches
+
+        Returns:
+            Tuple of (copies of the tool documents, total or None)
+        """
+        columns = self._columns
+        category_code = ANY if category is None else columns.category_codes.get(category)
+        pricing_code = ANY if pricingModel is None else columns.pricing_codes.get(pricingModel)
+        field, direction = sort[0]
+        order = columns.orders.get((field, category_code, pricing_code))
+        if order is None:
+            return [], 0 if include_total else None
+
+        # Positions in the ascending permutation the page may come from
+        keys = columns.keys[field]
+        start, end = 0, len(order)
+        if minRating is not None and field == "avgRating":
+            start = bisect_left(_KeyedOrder(order, keys, slice(0, 1)), (_sort_value(float(minRating)),))
+        if after is not None:
+            boundary = _row_key(field, after[0], after[-1])
+            if direction == 1:
+                start = max(start, bisect_right(_KeyedOrder(order, keys), boundary))
+            else:
+                end = bisect_left(_KeyedOrder(order, keys), boundary)
+
+        positions = range(start, end) if direction == 1 else range(end - 1, start - 1, -1)
+        if minRating is None or field == "avgRating":
+            rows = [order[position] for position in positions[skip:skip + limit]]
+        else:
+            ratings = columns.ratings
+            matching = (row for row in map(order.__getitem__, positions) if ratings[row] >= minRating)
+            rows = list(islice(matching, skip, skip + limit))
+
+        total = None
+        if include_total:
+            rated = columns.sorted_ratings[(category_code, pricing_code)]
+            total = len(rated) - (bisect_left(rated, minRating) if minRating is not None else 0)
+
+        return [dict(columns.docs[row]) for row in rows], total
+
+    async def load(self, db: AsyncIOMotorDatabase, batch_size: int = 2000):
+        """
+        Replace the snapshot with the whole tools collection.
+
+        Args:
+            db: MongoDB database instance
+            batch_size: Tools fetched per cursor batch
+        """
+        async with self._get_lock():
+            changes, removed = self._changes, set(self._removed)
+            generation = await self._shared_generation()
+            docs = [tool async for tool in db.tools.find({}, self._projection()).batch_size(batch_size)]
+
+            self._columns = await asyncio.to_thread(_Columns, docs)
+            self._watermark = self._latest_version(docs)
+            self._generation = generation
+            self._removed -= removed
+            self._synced = changes
+
+    async def refresh(self, db: AsyncIOMotorDatabase):
+        """Apply tools modified or deleted since the last load or poll."""
+        if self._columns is None:
+            return await self.load(db)
+
+        async with self._get_lock():
+            changes, removed = self._changes, set(self._removed)
+            # Read before the tools, so every write that bumped it is seen
+            generation = await self._shared_generation()
+            query = tombstone_query = {}
+            if self._watermark:
+                since = self._watermark - POLL_OVERLAP
+                query = {"$or": [{field: {"$gte": since}} for field in VERSION_FIELDS]}
+                tombstone_query = {"deletedAt": {"$gte": since}}
+
+            columns = self._columns
+            modified = [
+                tool async for tool in db.tools.find(query, self._projection())
+                if columns.get(str(tool["_id"])) != tool
+            ]
+            tombstones = await db[TOMBSTONES_COLLECTION].find(tombstone_query).to_list(None)
+            deleted = removed | {tombstone["_id"] for tombstone in tombstones}
+            gone = [tool_id for tool_id in deleted if columns.get(tool_id) is not None]
+
+            if len(modified) + len(gone) > len(columns) * REBUILD_FRACTION:
+                docs = {tool_id: columns.docs[row] for tool_id, row in columns.row_ids.items()}
+                for tool_id in gone:
+                    del docs[tool_id]
+                for tool in modified:
+                    docs[str(tool["_id"])] = tool
+                self._columns = await asyncio.to_thread(_Columns, docs.values())
+            else:
+                for tool_id in gone:
+                    columns.remove(tool_id)
+                for tool in modified:
+                    columns.upsert(tool)
+
+            self._watermark = max(filter(None, [
+                self._watermark,
+                self._latest_version(modified),
+                *(tombstone["deletedAt"] for tombstone in tombstones)
+            ]), default=None)
+            self._generation = generation
+            self._removed -= removed
+            self._synced = changes
+
+    async def poll(self, db: AsyncIOMotorDatabase, interval: float):
+        """Refresh every `interval` seconds, or as soon as a local write is reported."""
+        self._wakeup = asyncio.Event()
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.refresh(db)
+            except Exception as e:
+                print(f"Catalog snapshot refresh failed: {e}")
+
+    @staticmethod
+    async def _shared_generation() -> Optional[int]:
+        return await response_cache.generation() if response_cache.shared else None
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    @staticmethod
+    def _projection() -> dict:
+        return {**TOOL_PROJECTION, **{field: 1 for field in VERSION_FIELDS}}
+
+    @staticmethod
+    def _latest_version(rows) -> Optional[datetime]:
+        stamps = [row[field] for row in rows for field in VERSION_FIELDS if row.get(field)]
+        return max(stamps) if stamps else None
+
+
+catalog_snapshot = CatalogSnapshot()
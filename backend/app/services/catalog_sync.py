@@ -0,0 +1,87 @@
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from typing import List, Optional
+
+from app.config import settings
+from app.services.catalog_snapshot import catalog_snapshot
+from app.services.detail_cache import tool_detail_cache
+from app.services.facet_service import facet_cache
+from app.services.response_cache import response_cache
+from app.services.search_index import search_index
+from app.services.suggest_index import suggest_index
+
+
+# In-process catalog structures only see writes made by this worker; the
+# periodic reload picks up writes from other workers and scripts.
+
+
+def tool_saved(tool: dict):
+    """Reflect a created or updated tool document in the in-memory catalog."""
+    tools_saved([tool])
+
+
+def tools_saved(tools: List[dict]):
+    """
+    Reflect a batch of created or updated tool documents in the in-memory catalog.
+
+    Catalog-wide caches are invalidated once for the whole batch.
+    """
+    if not tools:
+        return
+    for tool in tools:
+        search_index.upsert(tool)
+        suggest_index.upsert(tool)
+        tool_detail_cache.invalidate(str(tool["_id"]))
+    catalog_snapshot.tool_changed()
+    facet_cache.clear()
+    response_cache.invalidate()
+
+
+def tool_deleted(tool_id: str):
+    """Drop a deleted tool from the in-memory catalog."""
+    search_index.remove(tool_id)
+    suggest_index.remove(tool_id)
+    catalog_snapshot.tool_deleted(tool_id)
+    facet_cache.clear()
+    tool_detail_cache.invalidate(tool_id)
+    response_cache.invalidate()
+
+
+def tool_rating_changed(tool_id: str, avg_rating: float, review_count: int, rank_score: Optional[float] = None):
+    """Reflect a rating change in the in-memory catalog."""
+    search_index.update_rating(tool_id, avg_rating)
+    suggest_index.update_rating(tool_id, avg_rating)
+    catalog_snapshot.update_rating(tool_id, avg_rating, review_count, rank_score)
+    facet_cache.clear()
+    tool_detail_cache.invalidate(tool_id)
+    response_cache.invalidate()
+
+
+def tool_reviews_changed(tool_id: str):
+    """Drop cached review pages of a tool whose approved reviews were edited."""
+    tool_detail_cache.invalidate(tool_id)
+
+
+async def load_catalog(db: AsyncIOMotorDatabase):
+    """Build the in-memory catalog structures from the database."""
+    if settings.SEARCH_ENGINE == "bm25":
+        await search_index.load(db)
+        print(f"Search index loaded: {len(search_index)} tools")
+    
+    await suggest_index.load(db)
+    
+    if settings.CATALOG_SNAPSHOT:
+        await catalog_snapshot.load(db)
+        print(f"Catalog snapshot loaded: {len(catalog_snapshot)} tools")
+    
+    facet_cache.clear()
+
+
+async def refresh_catalog_periodically(db: AsyncIOMotorDatabase):
+    """Load the catalog at startup, then reload it at a fixed interval."""
+    while True:
+        try:
+            await load_catalog(db)
+        except Exception as e:
+            print(f"Catalog refresh failed: {e}")
+        await asyncio.sleep(settings.CATALOG_REFRESH_SECONDS)
@@ -0,0 +1,323 @@
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Version of the migration seeding the counters (recorded in _migrations,
+# see migration_service); until it is recorded, counters may only hold the
+# increments of writes made since deploy, so totals are counted instead
+COUNTERS_MIGRATION = 7
+MIGRATIONS_COLLECTION = "_migrations"
+
+# Databases whose counters are known to be seeded
+_seeded_databases: set = set()
+
+# Attempts at recounting a counter that keeps being written while counted
+RECOUNT_ATTEMPTS = 10
+
+
+def _value(v) -> str:
+    """Return the raw string of an enum member or plain value."""
+    return str(getattr(v, "value", v))
+
+
+def tool_counter_keys(tool: dict) -> List[str]:
+    """
+    Counter keys a tool document contributes to.
+
+    Args:
+        tool: Tool document (needs category and pricingModel)
+
+    Returns:
+        List of counter keys
+    """
+    return [
+        "tools",
+        f"tools:category:{tool['category']}",
+        f"tools:pricingModel:{_value(tool['pricingModel'])}"
+    ]
+
+
+def review_counter_keys(review: dict) -> List[str]:
+    """
+    Counter keys a review document contributes to.
+
+    Args:
+        review: Review document (needs toolId, userId and status)
+
+    Returns:
+        List of counter keys
+    """
+    review_status = _value(review["status"])
+    keys = [
+        "reviews",
+        f"reviews:status:{review_status}",
+        f"reviews:user:{review['userId']}"
+    ]
+    if review_status == "approved":
+        keys.append(f"reviews:tool:{review['toolId']}:approved")
+    return keys
+
+
+def counter_key_for_filter(collection: str, filter_query: dict) -> Optional[str]:
+    """
+    Map a list filter to the counter that answers its total, if any.
+
+    Only the common filter shapes are maintained; anything else
+    (combined filters, minRating, text search) returns None.
+    """
+    fields = set(filter_query)
+
+    if collection == "tools":
+        if not fields:
+            return "tools"
+        if fields == {"category"}:
+            return f"tools:category:{filter_query['category']}"
+        if fields == {"pricingModel"}:
+            return f"tools:pricingModel:{filter_query['pricingModel']}"
+
+    if collection == "reviews":
+        if not fields:
+            return "reviews"
+        if fields == {"status"}:
+            return f"reviews:status:{filter_query['status']}"
+        if fields == {"userId"}:
+            return f"reviews:user:{filter_query['userId']}"
+        if fields == {"toolId", "status"} and filter_query["status"] == "approved":
+            return f"reviews:tool:{filter_query['toolId']}:approved"
+
+    return None
+
+
+def counter_filter(key: str) -> Tuple[str, dict]:
+    """
+    Inverse of counter_key_for_filter: the collection and filter a counter counts.
+
+    Args:
+        key: Counter key
+
+    Returns:
+        Tuple of (collection name, filter query)
+    """
+    collection, _, rest = key.partition(":")
+    if not rest:
+        return collection, {}
+    if collection == "reviews" and rest.startswith("tool:"):
+        return collection, {"toolId": rest[len("tool:"):-len(":approved")], "status": "approved"}
+
+    field, _, value = rest.partition(":")
+    field = {"status": "status", "user": "userId"}.get(field, field)
+    return collection, {field: value}
+
+
+async def counters_seeded(db: AsyncIOMotorDatabase) -> bool:
+    """Whether the counter seeding migration has been recorded as applied."""
+    if db.name in _seeded_databases:
+        return True
+    record = await db[MIGRATIONS_COLLECTION].find_one(
+        {"_id": COUNTERS_MIGRATION, "appliedAt": {"$exists": True}},
+        {"_id": 1}
+    )
+    if record:
+        _seeded_databases.add(db.name)
+    return record is not None
+
+
+async def get_total(db: AsyncIOMotorDatabase, collection: str, filter_query: dict) -> int:
+    """
+    Get the number of documents matching a list filter.
+
+    Reads a maintained counter in O(1) when the filter shape has one,
+    falling back to count_documents otherwise. Counters are seeded by
+    rebuild_counters (a migration) and kept by writers with upserting
+    increments. Until the seeding migration is recorded, counters are
+    ignored, since upserts made before it only hold recent increments;
+    a missing counter is counted but never stored, since a count taken
+    here could miss a concurrent write's increment.
+
+    Args:
+        db: MongoDB database instance
+        collection: Collection name ("tools" or "reviews")
+        filter_query: Filter used by the list endpoint
+
+    Returns:
+        Total number of matching documents
+    """
+    key = counter_key_for_filter(collection, filter_query)
+    if key is None or not await counters_seeded(db):
+        return await db[collection].count_documents(filter_query)
+
+    counter = await db.counters.find_one({"_id": key})
+    if counter:
+        return counter["value"]
+    return await db[collection].count_documents(filter_query)
+
+
+async def apply_counter_deltas(db: AsyncIOMotorDatabase, deltas: Dict[str, int]):
+    """
+    Apply counter increments in a single bulk write.
+
+    Missing counters are created from the increment (upsert), so a
+    counter first touched after seeding starts from the right value.
+    Every increment also bumps the counter's version, which
+    rebuild_counters checks to detect writes made while it counted.
+
+    Args:
+        db: MongoDB database instance
+        deltas: Mapping of counter key to increment (may be negative)
+    """
+    operations = [
+        UpdateOne({"_id": key}, {"$inc": {"value": delta, "version": 1}}, upsert=True)
+        for key, delta in deltas.items()
+        if delta
+    ]
+    if operations:
+        await db.counters.bulk_write(operations, ordered=False)
+
+
+async def increment_counters(db: AsyncIOMotorDatabase, keys: Iterable[str], amount: int = 1):
+    """Increment (or decrement with a negative amount) each counter key."""
+    deltas: Dict[str, int] = {}
+    for key in keys:
+        deltas[key] = deltas.get(key, 0) + amount
+    await apply_counter_deltas(db, deltas)
+
+
+async def move_counters(db: AsyncIOMotorDatabase, old_keys: Iterable[str], new_keys: Iterable[str]):
+    """Move a document from one set of counters to another (e.g. on status change)."""
+    deltas: Dict[str, int] = {}
+    for key in old_keys:
+        deltas[key] = deltas.get(key, 0) - 1
+    for key in new_keys:
+        deltas[key] = deltas.get(key, 0) + 1
+    await apply_counter_deltas(db, deltas)
+
+
+async def remove_tool_reviews_from_counters(db: AsyncIOMotorDatabase, tool_id: str):
+    """
+    Decrement review counters for all reviews of a tool about to be deleted.
+
+    Args:
+        db: MongoDB database instance
+        tool_id: ID of the tool whose reviews are being deleted
+    """
+    pipeline = [
+        {"$match": {"toolId": tool_id}},
+        {
+            "$group": {
+                "_id": {"status": "$status", "userId": "$userId"},
+                "count": {"$sum": 1}
+            }
+        }
+    ]
+
+    deltas: Dict[str, int] = {}
+    async for group in db.reviews.aggregate(pipeline):
+        review = {"toolId": tool_id, **group["_id"]}
+        for key in review_counter_keys(review):
+            deltas[key] = deltas.get(key, 0) - group["count"]
+
+    await apply_counter_deltas(db, deltas)
+
+
+async def _recount(db: AsyncIOMotorDatabase, key: str) -> bool:
+    """
+    Recount one counter, writing it only if no increment landed meanwhile.
+
+    Returns:
+        True if the counter was written
+    """
+    counter = await db.counters.find_one({"_id": key}, {"version": 1})
+    collection, filter_query = counter_filter(key)
+    value = await db[collection].count_documents(filter_query)
+
+    if counter is None:
+        result = await db.counters.update_one(
+            {"_id": key},
+            {"$setOnInsert": {"value": value, "version": 0}},
+            upsert=True
+        )
+        return result.upserted_id is not None
+
+    result = await db.counters.update_one(
+        {"_id": key, "version": counter.get("version")},
+        {"$set": {"value": value}}
+    )
+    return result.matched_count == 1
+
+
+async def rebuild_counters(db: AsyncIOMotorDatabase, batch_size: int = 1000) -> int:
+    """
+    Recount every counter from the tools and reviews collections.
+
+    Seeds the counters for existing data and repairs drift; counters whose
+    documents are all gone are reset to 0. Safe while writes go on: the
+    counts come from one aggregation per collection, and each counter is
+    only overwritten if its version is still the one read before counting
+    (or, for a new counter, if no writer created it meanwhile). Counters
+    written during the count are recounted one by one.
+
+    Args:
+        db: MongoDB database instance
+        batch_size: Counters per bulk write
+
+    Returns:
+        Number of counters written
+    """
+    versions = {
+        counter["_id"]: counter.get("version")
+        async for counter in db.counters.find({}, {"version": 1})
+    }
+    values: Dict[str, int] = {"tools": 0, "reviews": 0}
+
+    def add(keys: Iterable[str], count: int):
+        for key in keys:
+            values[key] = values.get(key, 0) + count
+
+    tool_groups = db.tools.aggregate([
+        {"$group": {"_id": {"category": "$category", "pricingModel": "$pricingModel"}, "count": {"$sum": 1}}}
+    ])
+    async for group in tool_groups:
+        add(tool_counter_keys(group["_id"]), group["count"])
+
+    review_groups = db.reviews.aggregate([
+        {"$group": {"_id": {"status": "$status", "userId": "$userId"}, "count": {"$sum": 1}}}
+    ])
+    async for group in review_groups:
+        review_status = _value(group["_id"]["status"])
+        add(["reviews", f"reviews:status:{review_status}", f"reviews:user:{group['_id']['userId']}"], group["count"])
+
+    approved_groups = db.reviews.aggregate([
+        {"$match": {"status": "approved"}},
+        {"$group": {"_id": "$toolId", "count": {"$sum": 1}}}
+    ])
+    async for group in approved_groups:
+        add([f"reviews:tool:{group['_id']}:approved"], group["count"])
+
+    for key in versions:
+        values.setdefault(key, 0)
+
+    # Each write is tagged, so the counters it did not reach can be told apart
+    token = ObjectId()
+    operations = [
+        UpdateOne({"_id": key, "version": versions[key]}, {"$set": {"value": value, "rebuild": token}})
+        if key in versions else
+        UpdateOne({"_id": key}, {"$setOnInsert": {"value": value, "version": 0, "rebuild": token}}, upsert=True)
+        for key, value in values.items()
+    ]
+    for start in range(0, len(operations), batch_size):
+        await db.counters.bulk_write(operations[start:start + batch_size], ordered=False)
+
+    written = {
+        counter["_id"]
+        async for counter in db.counters.find({"_id": {"$in": list(values)}, "rebuild": token}, {"_id": 1})
+    }
+    for key in values.keys() - written:
+        for _ in range(RECOUNT_ATTEMPTS):
+            if await _recount(db, key):
+                break
+        else:
+            print(f"Counter {key} kept changing while recounted; rerun rebuild_counters")
+
+    return len(operations)
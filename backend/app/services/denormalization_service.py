@@ -0,0 +1,153 @@
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from bson import ObjectId
+from bson.errors import InvalidId
+from pymongo import UpdateMany
+from typing import Dict
+
+from app.services.rating_service import mark_reviews_changed
+
+
+async def propagate_user_name(db: AsyncIOMotorDatabase, user_id: str, name: str) -> int:
+    """
+    Copy a user's new name onto all of their reviews.
+
+    Tools showing one of the user's approved reviews get a new
+    reviewsModifiedAt, so their cached review pages are revalidated.
+
+    Args:
+        db: MongoDB database instance
+        user_id: ID of the renamed user
+        name: New user name
+
+    Returns:
+        Number of reviews updated
+    """
+    result = await db.reviews.update_many(
+        {"userId": user_id},
+        {"$set": {"userName": name}}
+    )
+
+    if result.modified_count:
+        tool_ids = await db.reviews.distinct("toolId", {"userId": user_id, "status": "approved"})
+        await mark_reviews_changed(db, tool_ids)
+
+    return result.modified_count
+
+
+async def propagate_tool_name(db: AsyncIOMotorDatabase, tool_id: str, name: str) -> int:
+    """
+    Copy a tool's new name onto all of its reviews.
+
+    Args:
+        db: MongoDB database instance
+        tool_id: ID of the renamed tool
+        name: New tool name
+
+    Returns:
+        Number of reviews updated
+    """
+    return await propagate_tool_names(db, {tool_id: name})
+
+
+async def propagate_tool_names(db: AsyncIOMotorDatabase, names: Dict[str, str]) -> int:
+    """
+    Copy the new names of many tools onto their reviews in one bulk write.
+
+    Args:
+        db: MongoDB database instance
+        names: Mapping of renamed tool ID to its new name
+
+    Returns:
+        Number of reviews updated
+    """
+    if not names:
+        return 0
+
+    result = await db.reviews.bulk_write([
+        UpdateMany({"toolId": tool_id}, {"$set": {"toolName": name}})
+        for tool_id, name in names.items()
+    ], ordered=False)
+    return result.modified_count
+
+
+async def _backfill_names(
+    db: AsyncIOMotorDatabase,
+    collection: str,
+    ref_field: str,
+    name_field: str,
+    batch_size: int
+) -> int:
+    """
+    Store the name of a referenced document on reviews missing it.
+
+    Walks the distinct referenced IDs of reviews missing name_field, looks
+    the names up in batches and writes them with one bulk update per batch.
+    """
+    pipeline = [
+        {"$match": {name_field: {"$exists": False}}},
+        {"$group": {"_id": f"${ref_field}"}}
+    ]
+
+    async def flush(ids):
+        object_ids = []
+        for ref_id in ids:
+            try:
+                object_ids.append(ObjectId(ref_id))
+            except (InvalidId, TypeError):
+                continue
+
+        docs = db[collection].find({"_id": {"$in": object_ids}}, {"name": 1})
+        operations = [
+            UpdateMany(
+                {ref_field: str(doc["_id"]), name_field: {"$exists": False}},
+                {"$set": {name_field: doc["name"]}}
+            )
+            async for doc in docs
+        ]
+        if not operations:
+            return 0
+
+        result = await db.reviews.bulk_write(operations, ordered=False)
+        return result.modified_count
+
+    updated = 0
+    ref_ids = []
+
+    async for group in db.reviews.aggregate(pipeline, allowDiskUse=True):
+        ref_ids.append(group["_id"])
+        if len(ref_ids) >= batch_size:
+            updated += await flush(ref_ids)
+            ref_ids = []
+
+    if ref_ids:
+        updated += await flush(ref_ids)
+
+    return updated
+
+
+async def backfill_review_user_names(db: AsyncIOMotorDatabase, batch_size: int = 1000) -> int:
+    """
+    Store userName on existing reviews created before it was denormalized.
+
+    Args:
+        db: MongoDB database instance
+        batch_size: Users resolved per round trip
+
+    Returns:
+        Number of reviews updated
+    """
+    return await _backfill_names(db, "users", "userId", "userName", batch_size)
+
+
+async def backfill_review_tool_names(db: AsyncIOMotorDatabase, batch_size: int = 1000) -> int:
+    """
+    Store toolName on existing reviews created before it was denormalized.
+
+    Args:
+        db: MongoDB database instance
+        batch_size: Tools resolved per round trip
+
+    Returns:
+        Number of reviews updated
+    """
+    return await _backfill_names(db, "tools", "toolId", "toolName", batch_size)
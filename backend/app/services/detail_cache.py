@@ -0,0 +1,102 @@
+import time
+from typing import Hashable, NamedTuple, Optional, Tuple
+
+from app.config import settings
+from app.utils.cache import TTLCache
+from app.utils.http_cache import CachedResponse
+
+
+# Variants (field sets, review pages) kept per tool before the oldest is dropped
+MAX_VARIANTS_PER_TOOL = 32
+
+
+class _Entry(NamedTuple):
+    response: CachedResponse
+    stored_at: float
+
+
+class ToolDetailCache:
+    """
+    Per-worker LRU of serialized tool detail and review page responses.
+
+    Entries are grouped per tool so a write drops every representation of
+    that tool at once (catalog_sync calls invalidate). Writes made by other
+    workers are only seen once entries go stale.
+
+    An entry is fresh for `ttl` seconds, then may still be served for
+    `stale_ttl` seconds while the caller refreshes it in the background.
+
+    Args:
+        maxsize: Maximum number of tools cached
+        ttl: Seconds an entry is fresh
+        stale_ttl: Further seconds a stale entry may be served
+    """
+
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float = 0):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl + stale_ttl)
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        # Bumped by every invalidation; fills started before one are dropped
+        self.generation = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def get(self, tool_id: str, variant: Hashable) -> Tuple[Optional[CachedResponse], bool]:
+        """
+        Look up one representation of a tool.
+
+        Returns:
+            Tuple of (cached response or None, whether it is stale and
+            should be refreshed)
+        """
+        entry = (self.cache.get(tool_id) or {}).get(variant)
+        age = time.monotonic() - entry.stored_at if entry else None
+        if entry is None or age > self.ttl + self.stale_ttl:
+            self.misses += 1
+            return None, False
+        if age > self.ttl:
+            self.stale_hits += 1
+            return entry.response, True
+        self.hits += 1
+        return entry.response, False
+
+    def set(self, tool_id: str, variant: Hashable, cached: CachedResponse, generation: int):
+        """
+        Store one representation of a tool.
+
+        Args:
+            tool_id: Tool ID
+            variant: Representation key
+            cached: Body and validators
+            generation: Value of self.generation read before the database
+                read; the entry is dropped if a write invalidated since
+        """
+        if generation != self.generation:
+            return
+        variants = self.cache.get(tool_id) or {}
+        variants.pop(variant, None)
+        variants[variant] = _Entry(cached, time.monotonic())
+        while len(variants) > MAX_VARIANTS_PER_TOOL:
+            del variants[next(iter(variants))]
+        self.cache.set(tool_id, variants)
+
+    def invalidate(self, tool_id: str):
+        """Drop every cached representation of a tool."""
+        self.generation += 1
+        self.cache.pop(tool_id)
+
+    def clear(self):
+        self.generation += 1
+        self.cache.clear()
+
+    def stats(self) -> dict:
+        """Hit (fresh and stale)/miss counters and number of tools cached."""
+        return {"hits": self.hits, "staleHits": self.stale_hits, "misses": self.misses, "size": len(self.cache)}
+
+
+tool_detail_cache = ToolDetailCache(
+    maxsize=settings.TOOL_CACHE_SIZE,
+    ttl=settings.TOOL_CACHE_SECONDS,
+    stale_ttl=settings.TOOL_CACHE_STALE_SECONDS
+)
@@ -0,0 +1,161 @@
+import asyncio
+import math
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from typing import Dict, Iterable, Optional, Tuple
+
+from app.config import settings
+from app.services.search_index import search_index
+from app.utils.cache import TTLCache
+
+
+# Rating facet thresholds, matching the minRating filter ("4 stars & up")
+RATING_THRESHOLDS = [4, 3, 2, 1]
+
+# Cleared by catalog_sync on every tool write in this worker
+facet_cache = TTLCache(maxsize=512, ttl=settings.FACET_CACHE_SECONDS)
+
+
+def _sorted_counts(counts: Dict[str, int]) -> list:
+    """Facet values ordered by count, then value."""
+    return [
+        {"value": value, "count": count}
+        for value, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        if value is not None
+    ]
+
+
+def _rating_counts(floor_counts: Dict[int, int]) -> list:
+    """Turn counts per whole-star rating into cumulative "N & up" counts."""
+    return [
+        {
+            "minRating": threshold,
+            "count": sum(count for floor, count in floor_counts.items() if floor >= threshold)
+        }
+        for threshold in RATING_THRESHOLDS
+    ]
+
+
+def _facets_from_rows(
+    rows: Iterable[Tuple[str, str, float]],
+    category: Optional[str],
+    pricingModel: Optional[str],
+    minRating: Optional[float]
+) -> dict:
+    """
+    Count facets over (category, pricingModel, avgRating) rows in memory.
+
+    Each facet ignores its own filter, so the sidebar can show how many
+    tools selecting another value would give.
+    """
+    total = 0
+    categories: Dict[str, int] = {}
+    pricing_models: Dict[str, int] = {}
+    floors: Dict[int, int] = {}
+
+    for tool_category, tool_pricing, tool_rating in rows:
+        category_ok = not category or tool_category == category
+        pricing_ok = not pricingModel or tool_pricing == pricingModel
+        rating_ok = minRating is None or tool_rating >= minRating
+
+        if pricing_ok and rating_ok:
+            categories[tool_category] = categories.get(tool_category, 0) + 1
+        if category_ok and rating_ok:
+            pricing_models[tool_pricing] = pricing_models.get(tool_pricing, 0) + 1
+        if category_ok and pricing_ok:
+            floor = math.floor(tool_rating)
+            floors[floor] = floors.get(floor, 0) + 1
+            if rating_ok:
+                total += 1
+
+    return {
+        "total": total,
+        "categories": _sorted_counts(categories),
+        "pricingModels": _sorted_counts(pricing_models),
+        "ratings": _rating_counts(floors)
+    }
+
+
+async def _facets_from_database(
+    db: AsyncIOMotorDatabase,
+    category: Optional[str],
+    pricingModel: Optional[str],
+    minRating: Optional[float],
+    search: Optional[str]
+) -> dict:
+    """Count all facets in a single $facet aggregation."""
+    filters = {}
+    if category:
+        filters["category"] = category
+    if pricingModel:
+        filters["pricingModel"] = pricingModel
+    if minRating is not None:
+        filters["avgRating"] = {"$gte": minRating}
+
+    def without(field):
+        return {"$match": {key: value for key, value in filters.items() if key != field}}
+
+    def count_by(expression):
+        return {"$group": {"_id": expression, "count": {"$sum": 1}}}
+
+    pipeline = []
+    if search:
+        # $text has to be in the first stage
+        pipeline.append({"$match": {"$text": {"$search": search}}})
+    pipeline.append({
+        "$facet": {
+            "total": [{"$match": filters}, {"$count": "count"}],
+            "categories": [without("category"), count_by("$category")],
+            "pricingModels": [without("pricingModel"), count_by("$pricingModel")],
+            "ratings": [without("avgRating"), count_by({"$floor": {"$ifNull": ["$avgRating", 0]}})]
+        }
+    })
+
+    result = await db.tools.aggregate(pipeline).to_list(length=1)
+    facets = result[0]
+
+    return {
+        "total": facets["total"][0]["count"] if facets["total"] else 0,
+        "categories": _sorted_counts({group["_id"]: group["count"] for group in facets["categories"]}),
+        "pricingModels": _sorted_counts({group["_id"]: group["count"] for group in facets["pricingModels"]}),
+        "ratings": _rating_counts({int(group["_id"]): group["count"] for group in facets["ratings"]})
+    }
+
+
+async def get_tool_facets(
+    db: AsyncIOMotorDatabase,
+    category: Optional[str] = None,
+    pricingModel: Optional[str] = None,
+    minRating: Optional[float] = None,
+    search: Optional[str] = None
+) -> dict:
+    """
+    Get category, pricing model and rating facet counts for a tool filter.
+
+    Searches are counted in memory from the BM25 index when it is loaded;
+    everything else takes one aggregation. Results are cached per filter.
+
+    Args:
+        db: MongoDB database instance
+        category: Category filter
+        pricingModel: Pricing model filter
+        minRating: Minimum average rating filter
+        search: Free-text search
+
+    Returns:
+        Dict with total, categories, pricingModels and ratings
+    """
+    search = " ".join(search.lower().split()) if search else None
+    key = (category, pricingModel, minRating, search)
+    cached = facet_cache.get(key)
+    if cached is not None:
+        return cached
+
+    if search and settings.SEARCH_ENGINE == "bm25" and search_index.ready:
+        # Scoring is pure Python; keep it off the event loop
+        tool_ids, _ = await asyncio.to_thread(search_index.search, search)
+        facets = _facets_from_rows(search_index.attributes(tool_ids), category, pricingModel, minRating)
+    else:
+        facets = await _facets_from_database(db, category, pricingModel, minRating, search)
+
+    facet_cache.set(key, facets)
+    return facets
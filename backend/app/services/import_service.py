@@ -0,0 +1,298 @@
+import codecs
+import json
+from datetime import datetime
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pydantic import ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from app.models.tool import ToolCreate
+from app.services import catalog_sync
+from app.services.counter_service import apply_counter_deltas, tool_counter_keys
+from app.services.denormalization_service import propagate_tool_names
+from app.services.rating_service import rank_score
+
+
+# Per-line errors reported back to the client (the rest are only counted)
+MAX_IMPORT_ERRORS = 1000
+
+# Server error code of a unique index violation
+DUPLICATE_KEY = 11000
+
+# Largest single document accepted before giving up on a malformed stream
+MAX_DOCUMENT_CHARS = 1_000_000
+
+
+class JsonDocumentSplitter:
+    """
+    Incrementally split a text stream into JSON documents.
+
+    Accepts newline-delimited JSON as well as a single JSON array of
+    objects, so only one document (plus the current chunk) is ever held
+    in memory. Malformed NDJSON lines are reported and skipped; a
+    malformed JSON array cannot be resynchronised and ends the stream.
+    """
+
+    def __init__(self):
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.line = 1
+        self.started = False
+        self.in_array = False
+        self.finished = False
+
+    def feed(self, text: str, final: bool = False) -> List[Tuple[int, object]]:
+        """
+        Add text and return the complete documents found so far.
+
+        Args:
+            text: Next piece of the decoded request body
+            final: Whether this is the end of the stream
+
+        Returns:
+            List of (line number, document or ValueError) tuples
+        """
+        self.buffer += text
+        buffer = self.buffer
+        documents = []
+        pos = 0
+
+        while not self.finished:
+            # Skip whitespace and array separators
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                if buffer[pos] == "\n":
+                    self.line += 1
+                pos += 1
+
+            if pos == len(buffer):
+                break
+
+            if not self.started:
+                self.started = True
+                if buffer[pos] == "[":
+                    self.in_array = True
+                    pos += 1
+                    continue
+
+            if self.in_array and buffer[pos] == "]":
+                self.finished = True
+                break
+
+            try:
+                document, end = self.decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                newline = buffer.find("\n", pos)
+                if not self.in_array and newline != -1:
+                    # Complete but malformed NDJSON line: report it and move on
+                    documents.append((self.line, ValueError(f"Invalid JSON: {e.msg}")))
+                    pos = newline
+                    continue
+                if not final and len(buffer) - pos < MAX_DOCUMENT_CHARS:
+                    # Probably a document split across chunks: wait for more
+                    break
+                documents.append((self.line, ValueError(f"Invalid JSON: {e.msg}")))
+                self.finished = self.in_array
+                pos = len(buffer) if self.in_array or newline == -1 else newline
+                continue
+
+            documents.append((self.line, document))
+            self.line += buffer.count("\n", pos, end)
+            pos = end
+
+        self.buffer = buffer[pos:]
+        return documents
+
+
+async def iter_json_documents(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, object]]:
+    """
+    Yield (line number, document or ValueError) from a streamed request body.
+
+    Args:
+        chunks: Async iterator of raw body bytes (e.g. request.stream())
+    """
+    splitter = JsonDocumentSplitter()
+    text_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+    async for chunk in chunks:
+        for item in splitter.feed(text_decoder.decode(chunk)):
+            yield item
+
+    for item in splitter.feed(text_decoder.decode(b"", final=True), final=True):
+        yield item
+
+
+def _validation_message(error: ValidationError) -> str:
+    """Flatten a pydantic validation error into a single line."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}"
+        for err in error.errors()
+    )
+
+
+def _rank_score(fields: dict, old: Optional[dict]) -> float:
+    """rankScore of an imported tool, keeping an existing tool's review ratings."""
+    return rank_score(
+        fields.get("ratingSeed"),
+        fields.get("votes"),
+        old.get("avgRating") if old else 0.0,
+        old.get("reviewCount") if old else 0
+    )
+
+
+async def _find_existing(db: AsyncIOMotorDatabase, source_urls: List[str]) -> Dict[str, dict]:
+    """Read the fields an upsert depends on for tools already stored, by sourceUrl."""
+    return {
+        tool["sourceUrl"]: tool
+        async for tool in db.tools.find(
+            {"sourceUrl": {"$in": source_urls}},
+            {"sourceUrl": 1, "name": 1, "category": 1, "pricingModel": 1, "avgRating": 1, "reviewCount": 1}
+        )
+    }
+
+
+def _upsert_operation(source_url: str, fields: dict, old: Optional[dict], now: datetime) -> UpdateOne:
+    """Upsert of one imported tool, given its stored fields if it exists."""
+    return UpdateOne(
+        {"sourceUrl": source_url},
+        {
+            "$set": {**fields, "rankScore": _rank_score(fields, old), "updatedAt": now},
+            "$setOnInsert": {
+                "avgRating": 0.0,
+                "reviewCount": 0,
+                "ratingSum": 0,
+                "ratingCount": 0,
+                "createdAt": now
+            }
+        },
+        upsert=True
+    )
+
+
+async def _write_batch(db: AsyncIOMotorDatabase, batch: Dict[str, dict]) -> Tuple[int, int]:
+    """
+    Upsert one batch of validated tools keyed by sourceUrl.
+
+    A sourceUrl inserted by a concurrent import after the lookup fails
+    the unique index; those tools are read again and updated instead.
+
+    Returns:
+        Tuple of (inserted, updated) counts
+    """
+    source_urls = list(batch)
+    existing = await _find_existing(db, source_urls)
+
+    now = datetime.utcnow()
+    operations = [
+        _upsert_operation(source_url, fields, existing.get(source_url), now)
+        for source_url, fields in batch.items()
+    ]
+    try:
+        result = await db.tools.bulk_write(operations, ordered=False)
+        upserted_ids, updated = result.upserted_ids, result.matched_count
+    except BulkWriteError as e:
+        errors = e.details["writeErrors"]
+        if any(error["code"] != DUPLICATE_KEY for error in errors):
+            raise
+        upserted_ids = {upsert["index"]: upsert["_id"] for upsert in e.details["upserted"]}
+        updated = e.details["nMatched"]
+
+        # Only duplicate sourceUrls failed: retry them as updates of the stored tools
+        raced = [error["index"] for error in errors]
+        raced_urls = [source_urls[index] for index in raced]
+        existing.update(await _find_existing(db, raced_urls))
+        retry = await db.tools.bulk_write([
+            _upsert_operation(source_url, batch[source_url], existing.get(source_url), now)
+            for source_url in raced_urls
+        ], ordered=False)
+        updated += retry.matched_count
+        for position, tool_id in retry.upserted_ids.items():
+            upserted_ids[raced[position]] = tool_id
+
+    # Keep counters, denormalized review names and the in-memory catalog
+    # in step with the upserts, with one write or invalidation per batch
+    deltas: Dict[str, int] = {}
+    saved: List[dict] = []
+    renamed: Dict[str, str] = {}
+    for index, (source_url, fields) in enumerate(batch.items()):
+        old = existing.get(source_url)
+        if old:
+            saved.append({**fields, "_id": old["_id"], "avgRating": old.get("avgRating")})
+        elif index in upserted_ids:
+            saved.append({**fields, "_id": upserted_ids[index], "avgRating": 0.0})
+        if old:
+            for key in tool_counter_keys(old):
+                deltas[key] = deltas.get(key, 0) - 1
+        for key in tool_counter_keys(fields):
+            deltas[key] = deltas.get(key, 0) + 1
+        if old and old["name"] != fields["name"]:
+            renamed[str(old["_id"])] = fields["name"]
+    await apply_counter_deltas(db, deltas)
+    await propagate_tool_names(db, renamed)
+    catalog_sync.tools_saved(saved)
+
+    return len(upserted_ids), updated
+
+
+async def import_tools(
+    db: AsyncIOMotorDatabase,
+    chunks: AsyncIterator[bytes],
+    batch_size: int = 500
+) -> dict:
+    """
+    Import tools from a streamed NDJSON body or JSON array.
+
+    Each document is validated against ToolCreate and upserted by
+    sourceUrl in bounded unordered bulk writes, so memory use stays flat
+    regardless of the feed size.
+
+    Args:
+        db: MongoDB database instance
+        chunks: Async iterator of raw body bytes
+        batch_size: Tools written per bulk write
+
+    Returns:
+        Dictionary with received/inserted/updated/failed counts and per-line errors
+    """
+    summary = {"received": 0, "inserted": 0, "updated": 0, "failed": 0, "errors": []}
+    batch: Dict[str, dict] = {}
+
+    async def flush():
+        nonlocal batch
+        if batch:
+            inserted, updated = await _write_batch(db, batch)
+            summary["inserted"] += inserted
+            summary["updated"] += updated
+            batch = {}
+
+    def fail(line: int, message: str):
+        summary["failed"] += 1
+        if len(summary["errors"]) < MAX_IMPORT_ERRORS:
+            summary["errors"].append({"line": line, "error": message})
+
+    async for line, document in iter_json_documents(chunks):
+        summary["received"] += 1
+
+        if isinstance(document, ValueError):
+            fail(line, str(document))
+            continue
+        if not isinstance(document, dict):
+            fail(line, "Expected a JSON object")
+            continue
+
+        try:
+            tool = ToolCreate(**document)
+        except ValidationError as e:
+            fail(line, _validation_message(e))
+            continue
+
+        # A repeated sourceUrl must not be upserted twice in one bulk write
+        if tool.sourceUrl in batch:
+            await flush()
+
+        batch[tool.sourceUrl] = tool.model_dump()
+        if len(batch) >= batch_size:
+            await flush()
+
+    await flush()
+    return summary
@@ -0,0 +1,138 @@
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from typing import List, Optional, Tuple
+
+from app.config import settings
+from app.services.counter_service import counter_key_for_filter, get_total
+from app.utils.pagination import SortSpec
+
+
+def build_tool_filter(
+    category: Optional[str],
+    pricingModel: Optional[str],
+    minRating: Optional[float],
+    search: Optional[str]
+) -> dict:
+    """Build the MongoDB filter shared by the public and admin tool lists and the export."""
+    filter_query = {}
+
+    if category:
+        filter_query["category"] = category
+
+    if pricingModel:
+        filter_query["pricingModel"] = pricingModel
+
+    if minRating is not None:
+        filter_query["avgRating"] = {"$gte": minRating}
+
+    if search:
+        filter_query["$text"] = {"$search": search}
+
+    return filter_query
+
+
+async def _find_page(
+    db: AsyncIOMotorDatabase,
+    collection: str,
+    page_query: dict,
+    sort: Optional[SortSpec],
+    skip: int,
+    limit: int,
+    projection: Optional[dict]
+) -> List[dict]:
+    """Fetch one page of documents with a plain find."""
+    cursor = db[collection].find(page_query, projection)
+    if sort:
+        cursor = cursor.sort(sort)
+    return await cursor.skip(skip).limit(limit).to_list(length=limit)
+
+
+async def _facet_page(
+    db: AsyncIOMotorDatabase,
+    collection: str,
+    filter_query: dict,
+    page_filter: Optional[dict],
+    sort: Optional[SortSpec],
+    skip: int,
+    limit: int,
+    projection: Optional[dict]
+) -> Tuple[List[dict], int]:
+    """Fetch one page and its total in a single $facet aggregation."""
+    items_pipeline = []
+    if page_filter:
+        items_pipeline.append({"$match": page_filter})
+    if sort:
+        items_pipeline.append({"$sort": dict(sort)})
+    items_pipeline += [{"$skip": skip}, {"$limit": limit}]
+    if projection:
+        items_pipeline.append({"$project": projection})
+
+    pipeline = [
+        {"$match": filter_query},
+        {
+            "$facet": {
+                "items": items_pipeline,
+                "total": [{"$count": "count"}]
+            }
+        }
+    ]
+
+    result = await db[collection].aggregate(pipeline).to_list(length=1)
+    facets = result[0]
+    total = facets["total"][0]["count"] if facets["total"] else 0
+    return facets["items"], total
+
+
+async def fetch_page(
+    db: AsyncIOMotorDatabase,
+    collection: str,
+    filter_query: dict,
+    sort: Optional[SortSpec],
+    skip: int,
+    limit: int,
+    include_total: bool = True,
+    page_filter: Optional[dict] = None,
+    projection: Optional[dict] = None
+) -> Tuple[List[dict], Optional[int]]:
+    """
+    Fetch a page of documents together with the total for its filter.
+
+    The strategy is chosen by settings.LIST_QUERY_STRATEGY:
+
+    - "gather": run the total and the page query concurrently
+    - "facet": compute both in one $facet aggregation (only used when the
+      total is not already answered by a maintained counter)
+    - "sequential": total first, then the page
+
+    Args:
+        db: MongoDB database instance
+        collection: Collection name
+        filter_query: Filter the total is computed for
+        sort: Sort specification, or None for natural order
+        skip: Number of documents to skip
+        limit: Maximum number of documents to return
+        include_total: Whether to compute the total at all
+        page_filter: Extra filter for the page only (e.g. a keyset cursor)
+        projection: Fields to return (all when None)
+
+    Returns:
+        Tuple of (documents, total or None)
+    """
+    page_query = {**filter_query, **page_filter} if page_filter else filter_query
+    strategy = settings.LIST_QUERY_STRATEGY
+
+    if not include_total:
+        return await _find_page(db, collection, page_query, sort, skip, limit, projection), None
+
+    if strategy == "facet" and counter_key_for_filter(collection, filter_query) is None:
+        return await _facet_page(db, collection, filter_query, page_filter, sort, skip, limit, projection)
+
+    if strategy == "sequential":
+        total = await get_total(db, collection, filter_query)
+        return await _find_page(db, collection, page_query, sort, skip, limit, projection), total
+
+    total, docs = await asyncio.gather(
+        get_total(db, collection, filter_query),
+        _find_page(db, collection, page_query, sort, skip, limit, projection)
+    )
+    return docs, total
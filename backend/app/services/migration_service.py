@@ -0,0 +1,299 @@
+import asyncio
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import DuplicateKeyError
+from typing import Awaitable, Callable, Dict, List, NamedTuple, Optional
+
+from app.services.catalog_snapshot import TOMBSTONE_SECONDS, TOMBSTONES_COLLECTION
+from app.services.counter_service import rebuild_counters
+from app.services.denormalization_service import backfill_review_tool_names, backfill_review_user_names
+from app.services.rating_service import backfill_rank_scores
+
+
+# Applied versions and leader locks live in this collection
+MIGRATIONS_COLLECTION = "_migrations"
+LOCK_ID = "lock"
+
+# A leader that dies mid-migration loses the lock after this long
+LOCK_SECONDS = 600
+
+
+class Migration(NamedTuple):
+    """One schema step: indexes to build and/or a data migration to run."""
+    version: int
+    description: str
+    indexes: Optional[Dict[str, List[IndexModel]]] = None
+    run: Optional[Callable[[AsyncIOMotorDatabase], Awaitable]] = None
+    # Index names dropped (if present) before the indexes are built
+    drop_indexes: Optional[Dict[str, List[str]]] = None
+
+
+async def _backfill_review_names(db: AsyncIOMotorDatabase):
+    await backfill_review_user_names(db)
+    await backfill_review_tool_names(db)
+
+
+# Equality filters a sorted tool page can be read behind
+SORT_INDEX_PREFIXES = ([], [("category", ASCENDING)], [("pricingModel", ASCENDING)])
+
+
+# Append new steps with the next version; never edit an applied one
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Baseline indexes", indexes={
+        "tools": [
+            IndexModel("name"),
+            IndexModel("category"),
+            IndexModel("pricingModel"),
+            IndexModel("avgRating"),
+            IndexModel([("name", TEXT), ("shortDescription", TEXT)]),
+            IndexModel([("category", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel([("pricingModel", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel("sourceUrl")
+        ],
+        "reviews": [
+            IndexModel("toolId"),
+            IndexModel("userId"),
+            IndexModel("status"),
+            IndexModel([("toolId", ASCENDING), ("status", ASCENDING)])
+        ],
+        "users": [
+            IndexModel("email", unique=True)
+        ]
+    }),
+    # (field, _id), also behind the category/pricingModel equality filters,
+    # so sorted tool pages are read in index order without a SORT stage
+    Migration(2, "Tool sort indexes", indexes={
+        "tools": [
+            IndexModel(prefix + [(field, ASCENDING), ("_id", ASCENDING)])
+            for field in ["avgRating", "votes", "reviewCount", "createdAt", "name"]
+            for prefix in SORT_INDEX_PREFIXES
+        ]
+    }),
+    Migration(3, "Review uniqueness and listing indexes", indexes={
+        "reviews": [
+            # One review per user and tool (fails if duplicates already exist)
+            IndexModel([("toolId", ASCENDING), ("userId", ASCENDING)], unique=True),
+            # My reviews, newest first
+            IndexModel([("userId", ASCENDING), ("createdAt", DESCENDING), ("_id", DESCENDING)]),
+            # Moderation queue, oldest first, with and without a status filter
+            IndexModel([("status", ASCENDING), ("createdAt", ASCENDING), ("_id", ASCENDING)]),
+            IndexModel([("createdAt", ASCENDING), ("_id", ASCENDING)])
+        ]
+    }),
+    Migration(4, "Backfill userName/toolName on reviews", run=_backfill_review_names),
+    # Catalog snapshot polls for tools modified since its last read
+    Migration(5, "Tool modification time indexes", indexes={
+        "tools": [
+            IndexModel("updatedAt"),
+            IndexModel("reviewsModifiedAt", sparse=True)
+        ]
+    }),
+    # sort=rank and the top tools lists read rankScore in index order
+    Migration(6, "Tool rankScore indexes and backfill", indexes={
+        "tools": [
+            IndexModel(prefix + [("rankScore", ASCENDING), ("_id", ASCENDING)])
+            for prefix in SORT_INDEX_PREFIXES
+        ]
+    }, run=backfill_rank_scores),
+    # List totals read counters only once this is recorded
+    # (counter_service.COUNTERS_MIGRATION)
+    Migration(7, "Seed list counters", run=rebuild_counters),
+    # Imports upsert by sourceUrl; replaces the plain index from migration 1
+    # (fails if duplicate sourceUrls already exist)
+    Migration(8, "Unique tool sourceUrl", drop_indexes={"tools": ["sourceUrl_1"]}, indexes={
+        "tools": [
+            IndexModel("sourceUrl", unique=True, partialFilterExpression={"sourceUrl": {"$type": "string"}})
+        ]
+    }),
+    # The (field, _id) indexes from migrations 1 and 2 have these as prefixes
+    Migration(9, "Drop redundant single-field tool indexes", drop_indexes={
+        "tools": ["name_1", "avgRating_1", "category_1", "pricingModel_1"]
+    }),
+    # Catalog snapshot polls read recent tombstones of deleted tools
+    Migration(10, "Expiring tool tombstones", indexes={
+        TOMBSTONES_COLLECTION: [IndexModel("deletedAt", expireAfterSeconds=TOMBSTONE_SECONDS)]
+    })
+]
+
+
+def default_owner() -> str:
+    """Lock owner identifier of this process (host:pid)."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+async def _build_indexes(db: AsyncIOMotorDatabase, indexes: Dict[str, List[IndexModel]]):
+    """Build indexes, one createIndexes per collection, all collections concurrently."""
+    await asyncio.gather(*(
+        db[collection].create_indexes(models)
+        for collection, models in indexes.items()
+    ))
+
+
+async def _drop_indexes(db: AsyncIOMotorDatabase, names: Dict[str, List[str]]):
+    """Drop the named indexes that exist, skipping ones already gone."""
+    for collection, index_names in names.items():
+        existing = await db[collection].index_information()
+        for name in index_names:
+            if name in existing:
+                await db[collection].drop_index(name)
+
+
+async def build_all_indexes(db: AsyncIOMotorDatabase):
+    """
+    Build every registered index without recording anything.
+
+    For scripts working on throwaway databases; servers go through
+    apply_migrations.
+    """
+    for position, migration in enumerate(MIGRATIONS):
+        if migration.drop_indexes:
+            await _drop_indexes(db, migration.drop_indexes)
+        if migration.indexes:
+            # Skip indexes a later migration drops, so a rerun never
+            # recreates one that conflicts with its replacement
+            dropped = {
+                (collection, name)
+                for later in MIGRATIONS[position + 1:]
+                for collection, names in (later.drop_indexes or {}).items()
+                for name in names
+            }
+            await _build_indexes(db, {
+                collection: [model for model in models if (collection, model.document["name"]) not in dropped]
+                for collection, models in migration.indexes.items()
+            })
+
+
+async def get_applied_versions(db: AsyncIOMotorDatabase) -> Dict[int, dict]:
+    """
+    Get the migrations recorded as applied.
+
+    Returns:
+        Mapping of version to its _migrations record
+    """
+    records = db[MIGRATIONS_COLLECTION].find({"appliedAt": {"$exists": True}})
+    return {record["_id"]: record async for record in records}
+
+
+async def get_pending_migrations(db: AsyncIOMotorDatabase) -> List[Migration]:
+    """Get registered migrations not applied yet, in version order."""
+    applied = await get_applied_versions(db)
+    return [migration for migration in MIGRATIONS if migration.version not in applied]
+
+
+async def acquire_lock(
+    db: AsyncIOMotorDatabase,
+    owner: str,
+    lock_id: str = LOCK_ID,
+    seconds: float = LOCK_SECONDS
+) -> bool:
+    """
+    Take (or renew) a leader lock, the migration lock by default.
+
+    Args:
+        db: MongoDB database instance
+        owner: Identifier of the process asking
+        lock_id: Lock to take
+        seconds: How long the lock is held unless renewed
+
+    Returns:
+        True if owner now holds the lock
+    """
+    now = datetime.utcnow()
+    try:
+        await db[MIGRATIONS_COLLECTION].update_one(
+            {"_id": lock_id, "$or": [{"expiresAt": {"$lt": now}}, {"owner": owner}]},
+            {"$set": {"owner": owner, "expiresAt": now + timedelta(seconds=seconds)}},
+            upsert=True
+        )
+    except DuplicateKeyError:
+        # Someone else holds an unexpired lock
+        return False
+    return True
+
+
+async def release_lock(db: AsyncIOMotorDatabase, owner: str, lock_id: str = LOCK_ID):
+    """Release a leader lock if owner holds it."""
+    await db[MIGRATIONS_COLLECTION].delete_one({"_id": lock_id, "owner": owner})
+
+
+async def apply_migrations(
+    db: AsyncIOMotorDatabase,
+    owner: Optional[str] = None,
+    on_progress: Optional[Callable[[Migration, float], None]] = None
+) -> Optional[List[int]]:
+    """
+    Apply pending migrations in version order under the leader lock.
+
+    Each migration drops the indexes it replaces, then builds its indexes
+    concurrently across collections before its data step runs; it is
+    recorded in _migrations only once it succeeded, so a failed migration
+    is retried on the next run.
+
+    Args:
+        db: MongoDB database instance
+        owner: Lock owner identifier (defaults to host:pid)
+        on_progress: Called with (migration, seconds taken) after each one
+
+    Returns:
+        Versions applied, or None if another process holds the lock
+    """
+    owner = owner or default_owner()
+    if not await acquire_lock(db, owner):
+        return None
+
+    applied = []
+    try:
+        for migration in await get_pending_migrations(db):
+            started = time.perf_counter()
+
+            if migration.drop_indexes:
+                await _drop_indexes(db, migration.drop_indexes)
+            if migration.indexes:
+                await _build_indexes(db, migration.indexes)
+            if migration.run:
+                await migration.run(db)
+
+            elapsed = time.perf_counter() - started
+            await db[MIGRATIONS_COLLECTION].insert_one({
+                "_id": migration.version,
+                "description": migration.description,
+                "appliedAt": datetime.utcnow(),
+                "appliedBy": owner,
+                "durationMs": round(elapsed * 1000)
+            })
+            applied.append(migration.version)
+            if on_progress:
+                on_progress(migration, elapsed)
+
+            # Keep the lock alive through long runs
+            await acquire_lock(db, owner)
+    finally:
+        await release_lock(db, owner)
+
+    return applied
+
+
+async def migrate_in_background(db: AsyncIOMotorDatabase):
+    """
+    Startup hook: apply pending migrations if this worker wins the lock.
+
+    Runs as a background task, so workers serve requests while indexes
+    build; failures are logged and retried on the next start or by the CLI.
+    """
+    try:
+        applied = await apply_migrations(
+            db,
+            on_progress=lambda migration, elapsed: print(
+                f"Migration {migration.version} applied: {migration.description} ({elapsed:.1f}s)"
+            )
+        )
+    except Exception as e:
+        print(f"Migrations failed: {e}")
+        return
+
+    if applied is None:
+        print("Migrations are being applied by another worker")
@@ -1,5 +1,189 @@
+import math
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
+from datetime import datetime
+from pymongo import ReturnDocument, UpdateOne
+from typing import Callable, Iterable, Optional, Tuple
+
+from app.config import settings
+from app.services import catalog_sync
+
+
+def rank_score(
+    rating_seed: Optional[float],
+    votes: Optional[int],
+    avg_rating: Optional[float],
+    review_count: Optional[int]
+) -> float:
+    """
+    Compute a tool's ranking score, a Bayesian average of its ratings.
+
+    The prior (RANK_PRIOR_MEAN, weighted as RANK_PRIOR_WEIGHT reviews) keeps
+    a handful of reviews from outranking a long track record; ratingSeed
+    counts as RANK_SEED_WEIGHT * log10(1 + votes) reviews, so popular
+    tools' seeded ratings carry more evidence.
+
+    Args:
+        rating_seed: Seeded rating, if any
+        votes: Upvote count
+        avg_rating: Average of approved reviews
+        review_count: Number of approved reviews
+
+    Returns:
+        Score on the 0-5 rating scale, rounded to 4 decimals
+    """
+    seed_weight = settings.RANK_SEED_WEIGHT * math.log10(1 + max(votes or 0, 0)) if rating_seed is not None else 0.0
+    review_count = review_count or 0
+    total = (
+        settings.RANK_PRIOR_WEIGHT * settings.RANK_PRIOR_MEAN
+        + seed_weight * (rating_seed or 0.0)
+        + (avg_rating or 0.0) * review_count
+    )
+    return round(total / (settings.RANK_PRIOR_WEIGHT + seed_weight + review_count), 4)
+
+
+def tool_rank_score(tool: dict) -> float:
+    """rank_score of a tool document."""
+    return rank_score(tool.get("ratingSeed"), tool.get("votes"), tool.get("avgRating"), tool.get("reviewCount"))
+
+
+def review_transition_delta(rating: int, old_status: Optional[str], new_status: Optional[str]) -> Tuple[int, int]:
+    """
+    Compute how a review status transition changes a tool's running totals.
+
+    Only approved reviews count towards a tool's rating, so a transition
+    matters when it enters or leaves the approved state. A status of None
+    stands for a review that does not exist (created or deleted).
+
+    Args:
+        rating: Rating of the review
+        old_status: Status before the transition
+        new_status: Status after the transition
+
+    Returns:
+        Tuple of (ratingSum delta, ratingCount delta)
+    """
+    was_approved = old_status == "approved"
+    is_approved = new_status == "approved"
+
+    if was_approved == is_approved:
+        return 0, 0
+    if is_approved:
+        return rating, 1
+    return -rating, -1
+
+
+async def apply_rating_delta(db: AsyncIOMotorDatabase, tool_id: str, rating_delta: int, count_delta: int):
+    """
+    Atomically adjust a tool's running rating totals and derived fields.
+
+    The tool document carries ratingSum/ratingCount; avgRating and
+    reviewCount are derived from them in the same update, so concurrent
+    moderations never lose an increment. reviewsModifiedAt records the
+    change for the tool's ETag/Last-Modified. rankScore is then written
+    only if no other moderation moved the totals in between (that one
+    writes its own). Tools created before running totals existed are
+    repaired with a full recalculation instead.
+
+    Args:
+        db: MongoDB database instance
+        tool_id: ID of the tool to update
+        rating_delta: Change to the sum of approved ratings
+        count_delta: Change to the number of approved reviews
+
+    Returns:
+        Dictionary with the new avgRating and reviewCount
+    """
+    if not rating_delta and not count_delta:
+        return None
+
+    tool = await db.tools.find_one_and_update(
+        {"_id": ObjectId(tool_id), "ratingCount": {"$exists": True}},
+        [
+            {
+                "$set": {
+                    "ratingSum": {"$add": ["$ratingSum", rating_delta]},
+                    "ratingCount": {"$add": ["$ratingCount", count_delta]},
+                    "reviewsModifiedAt": datetime.utcnow()
+                }
+            },
+            {
+                "$set": {
+                    "reviewCount": "$ratingCount",
+                    "avgRating": {
+                        "$cond": [
+                            {"$gt": ["$ratingCount", 0]},
+                            {"$round": [{"$divide": ["$ratingSum", "$ratingCount"]}, 2]},
+                            0.0
+                        ]
+                    }
+                }
+            }
+        ],
+        projection={"avgRating": 1, "reviewCount": 1, "ratingSum": 1, "ratingCount": 1, "ratingSeed": 1, "votes": 1},
+        return_document=ReturnDocument.AFTER
+    )
+
+    if tool is None:
+        return await recalculate_tool_rating(db, tool_id)
+
+    score = tool_rank_score(tool)
+    await db.tools.update_one(
+        {"_id": tool["_id"], "ratingSum": tool["ratingSum"], "ratingCount": tool["ratingCount"]},
+        {"$set": {"rankScore": score}}
+    )
+
+    catalog_sync.tool_rating_changed(tool_id, tool["avgRating"], tool["reviewCount"], score)
+    return {"avgRating": tool["avgRating"], "reviewCount": tool["reviewCount"]}
+
+
+async def apply_review_transition(
+    db: AsyncIOMotorDatabase,
+    tool_id: str,
+    rating: int,
+    old_status: Optional[str],
+    new_status: Optional[str]
+):
+    """
+    Update a tool's rating after a review changes status or is deleted.
+
+    Args:
+        db: MongoDB database instance
+        tool_id: ID of the reviewed tool
+        rating: Rating of the review
+        old_status: Status before the change
+        new_status: Status after the change (None if the review was deleted)
+
+    Returns:
+        Dictionary with the new avgRating and reviewCount, or None if unchanged
+    """
+    rating_delta, count_delta = review_transition_delta(rating, old_status, new_status)
+    return await apply_rating_delta(db, tool_id, rating_delta, count_delta)
+
+
+async def mark_reviews_changed(db: AsyncIOMotorDatabase, tool_ids: Iterable[str]):
+    """
+    Record that approved reviews of tools changed without moving their rating.
+
+    Review pages show moderation notes, moderators and edit times, so a
+    change to any of them needs a new reviewsModifiedAt (the pages' ETag and
+    Last-Modified) and fresh cached pages, as rating changes get from
+    apply_rating_delta.
+
+    Args:
+        db: MongoDB database instance
+        tool_ids: IDs of the tools whose approved reviews changed
+    """
+    tool_ids = list(dict.fromkeys(tool_ids))
+    if not tool_ids:
+        return
+
+    await db.tools.update_many(
+        {"_id": {"$in": [ObjectId(tool_id) for tool_id in tool_ids]}},
+        {"$set": {"reviewsModifiedAt": datetime.utcnow()}}
+    )
+    for tool_id in tool_ids:
+        catalog_sync.tool_reviews_changed(tool_id)
 
 
 async def recalculate_tool_rating(db: AsyncIOMotorDatabase, tool_id: str):
@@ -7,7 +191,9 @@ async def recalculate_tool_rating(db: AsyncIOMotorDatabase, tool_id: str):
     Recalculate and update a tool's average rating and review count.
     
     This function aggregates all approved reviews for a specific tool,
-    calculates the average rating, and updates the tool document.
+    calculates the average rating, and updates the tool document. Regular
+    moderation uses apply_review_transition; this full aggregation is the
+    repair path for tools whose running totals are missing or have drifted.
     
     Args:
         db: MongoDB database instance
@@ -24,7 +210,7 @@ async def recalculate_tool_rating(db: AsyncIOMotorDatabase, tool_id: str):
         {
             "$group": {
                 "_id": None,
-                "avgRating": {"$avg": "$rating"},
+                "ratingSum": {"$sum": "$rating"},
                 "count": {"$sum": 1}
             }
         }
@@ -33,22 +219,155 @@ async def recalculate_tool_rating(db: AsyncIOMotorDatabase, tool_id: str):
     result = await db.reviews.aggregate(pipeline).to_list(length=1)
     
     if result:
-        avg_rating = round(result[0]["avgRating"], 2)
+        rating_sum = result[0]["ratingSum"]
         review_count = result[0]["count"]
+        avg_rating = round(rating_sum / review_count, 2)
     else:
         # No approved reviews
+        rating_sum = 0
         avg_rating = 0.0
         review_count = 0
     
-    # Update tool document
+    # Update tool document (and its ranking from the new rating)
+    tool = await db.tools.find_one({"_id": ObjectId(tool_id)}, {"ratingSeed": 1, "votes": 1}) or {}
+    score = rank_score(tool.get("ratingSeed"), tool.get("votes"), avg_rating, review_count)
     await db.tools.update_one(
         {"_id": ObjectId(tool_id)},
         {
             "$set": {
                 "avgRating": avg_rating,
-                "reviewCount": review_count
+                "reviewCount": review_count,
+                "ratingSum": rating_sum,
+                "ratingCount": review_count,
+                "rankScore": score,
+                "reviewsModifiedAt": datetime.utcnow()
             }
         }
     )
     
+    catalog_sync.tool_rating_changed(tool_id, avg_rating, review_count, score)
     return {"avgRating": avg_rating, "reviewCount": review_count}
+
+
+async def rebuild_all_ratings(
+    db: AsyncIOMotorDatabase,
+    batch_size: int = 1000,
+    dry_run: bool = False,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+    on_change: Optional[Callable[[dict, dict], None]] = None,
+    reset_unreviewed: bool = False
+):
+    """
+    Rebuild avgRating/reviewCount, running totals and rankScore for every tool.
+
+    Runs a single $group over all approved reviews, then walks the tools
+    collection once and writes only the tools whose stored values differ,
+    in batched unordered bulk writes. Tools without approved reviews keep
+    their stored avgRating (seeded tools carry their seed rating there)
+    unless reset_unreviewed is set; their totals are rebuilt either way.
+
+    Args:
+        db: MongoDB database instance
+        batch_size: Tools fetched and updates written per round trip
+        dry_run: Compute the differences without writing them
+        on_progress: Called with (tools scanned, tools changed) after each batch
+        on_change: Called with (stored tool, rebuilt values) for each differing tool
+        reset_unreviewed: Reset avgRating to 0.0 on tools without approved
+            reviews, as recalculate_tool_rating does
+
+    Returns:
+        Dictionary with scanned, changed and updated tool counts
+    """
+    # One pass over approved reviews for the whole catalog
+    pipeline = [
+        {"$match": {"status": "approved"}},
+        {
+            "$group": {
+                "_id": "$toolId",
+                "ratingSum": {"$sum": "$rating"},
+                "count": {"$sum": 1}
+            }
+        }
+    ]
+
+    totals = {}
+    async for group in db.reviews.aggregate(pipeline, allowDiskUse=True):
+        totals[group["_id"]] = (group["ratingSum"], group["count"])
+
+    scanned = changed = updated = 0
+    operations = []
+    projection = {
+        "name": 1, "avgRating": 1, "reviewCount": 1, "ratingSum": 1, "ratingCount": 1,
+        "rankScore": 1, "ratingSeed": 1, "votes": 1
+    }
+
+    async for tool in db.tools.find({}, projection).batch_size(batch_size):
+        scanned += 1
+        rating_sum, count = totals.get(str(tool["_id"]), (0, 0))
+        if count:
+            avg_rating = round(rating_sum / count, 2)
+        else:
+            avg_rating = 0.0 if reset_unreviewed else tool.get("avgRating") or 0.0
+        rebuilt = {
+            "avgRating": avg_rating,
+            "reviewCount": count,
+            "ratingSum": rating_sum,
+            "ratingCount": count
+        }
+        rebuilt["rankScore"] = rank_score(tool.get("ratingSeed"), tool.get("votes"), rebuilt["avgRating"], count)
+
+        if any(tool.get(field) != value for field, value in rebuilt.items()):
+            changed += 1
+            if on_change:
+                on_change(tool, rebuilt)
+            if not dry_run:
+                operations.append(UpdateOne({"_id": tool["_id"]}, {"$set": {**rebuilt, "reviewsModifiedAt": datetime.utcnow()}}))
+
+        if len(operations) >= batch_size:
+            await db.tools.bulk_write(operations, ordered=False)
+            updated += len(operations)
+            operations = []
+
+        if on_progress and scanned % batch_size == 0:
+            on_progress(scanned, changed)
+
+    if operations:
+        await db.tools.bulk_write(operations, ordered=False)
+        updated += len(operations)
+
+    if on_progress:
+        on_progress(scanned, changed)
+
+    return {"scanned": scanned, "changed": changed, "updated": updated}
+
+
+async def backfill_rank_scores(db: AsyncIOMotorDatabase, batch_size: int = 1000) -> int:
+    """
+    Store rankScore on every tool whose stored score is missing or stale.
+
+    Args:
+        db: MongoDB database instance
+        batch_size: Tools fetched and updates written per round trip
+
+    Returns:
+        Number of tools updated
+    """
+    updated = 0
+    operations = []
+    projection = {"rankScore": 1, "ratingSeed": 1, "votes": 1, "avgRating": 1, "reviewCount": 1}
+
+    async for tool in db.tools.find({}, projection).batch_size(batch_size):
+        score = tool_rank_score(tool)
+        if tool.get("rankScore") != score:
+            operations.append(UpdateOne({"_id": tool["_id"]}, {"$set": {"rankScore": score}}))
+
+        if len(operations) >= batch_size:
+            await db.tools.bulk_write(operations, ordered=False)
+            updated += len(operations)
+            operations = []
+
+    if operations:
+        await db.tools.bulk_write(operations, ordered=False)
+        updated += len(operations)
+
+    return updated
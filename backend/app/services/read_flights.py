@@ -0,0 +1,7 @@
+from app.utils.single_flight import SingleFlight
+
+
+# Identical tool reads in flight at the same time share one database call
+list_flight = SingleFlight()
+detail_flight = SingleFlight()
+reviews_flight = SingleFlight()
@@ -0,0 +1,220 @@
+import asyncio
+import hashlib
+import json
+from typing import Optional
+
+from app.config import settings
+from app.utils.cache import TTLCache
+
+
+# Serialized GET /tools responses, keyed on the normalized query and the
+# catalog generation. catalog_sync bumps the generation on every tool or
+# rating write, so entries filled before a write are never served after
+# it, even if the fill raced with the write.
+
+
+class MemoryResponseBackend:
+    """
+    Per-worker backend: a size-bounded LRU/TTL cache and a local generation.
+
+    Writes made by other workers are only seen once entries expire.
+
+    Args:
+        maxsize: Maximum number of cached responses
+        ttl: Seconds a response may be served
+    """
+
+    shared = False
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.generation = 0
+
+    async def get_generation(self) -> int:
+        return self.generation
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self.cache.get(key)
+
+    async def set(self, key: str, value: bytes):
+        self.cache.set(key, value)
+
+    async def bump(self):
+        self.generation += 1
+        self.cache.clear()
+
+    def size(self) -> Optional[int]:
+        return len(self.cache)
+
+    async def close(self):
+        pass
+
+
+class RedisResponseBackend:
+    """
+    Backend on a Redis-compatible server, shared by every worker.
+
+    The generation is a counter on the server, so a write in any worker
+    invalidates all of them. Entries expire after the TTL; the size bound
+    is the server's maxmemory with an LRU eviction policy.
+
+    Args:
+        url: Server URL (redis://host:port/db)
+        ttl: Seconds a response may be served
+        prefix: Namespace for this app's keys
+    """
+
+    shared = True
+
+    def __init__(self, url: str, ttl: float, prefix: str = "tools:"):
+        # Optional dependency, only needed for this backend
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+        self.ttl = int(ttl)
+        self.prefix = prefix
+
+    async def get_generation(self) -> int:
+        return int(await self.client.get(f"{self.prefix}generation") or 0)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(f"{self.prefix}{key}")
+
+    async def set(self, key: str, value: bytes):
+        await self.client.set(f"{self.prefix}{key}", value, ex=self.ttl)
+
+    async def bump(self):
+        await self.client.incr(f"{self.prefix}generation")
+
+    def size(self) -> Optional[int]:
+        return None
+
+    async def close(self):
+        await self.client.aclose()
+
+
+class ResponseCache:
+    """
+    Read-through cache of serialized responses in front of a backend.
+
+    Backend errors are treated as misses so an unavailable cache server
+    never fails a request.
+
+    Args:
+        backend: MemoryResponseBackend or RedisResponseBackend, or None to disable
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._pending: set = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    @property
+    def shared(self) -> bool:
+        """Whether every worker reads and invalidates the same entries."""
+        return self.enabled and self.backend.shared
+
+    async def generation(self) -> Optional[int]:
+        """
+        Read the current generation.
+
+        Waits for invalidations issued by this worker first, so a request
+        that follows a write never reads the old generation.
+
+        Returns:
+            Generation, or None if the cache is disabled or unreachable
+        """
+        if not self.enabled:
+            return None
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+        try:
+            return await self.backend.get_generation()
+        except Exception as e:
+            print(f"Response cache unavailable: {e}")
+            return None
+
+    @staticmethod
+    def key(params: dict, generation: Optional[int]) -> str:
+        """
+        Build the cache key for normalized query parameters.
+
+        Args:
+            params: JSON-serializable query parameters, defaults resolved
+            generation: Generation read by generation() for this request
+
+        Returns:
+            Key combining the generation and a digest of params
+        """
+        digest = hashlib.blake2b(
+            json.dumps(params, sort_keys=True, separators=(",", ":")).encode(),
+            digest_size=16
+        ).hexdigest()
+        return f"{generation}:{digest}"
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the cached response body for key, or None."""
+        try:
+            value = await self.backend.get(key)
+        except Exception as e:
+            print(f"Response cache unavailable: {e}")
+            value = None
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    async def set(self, key: str, value: bytes):
+        """Store a response body under key."""
+        # A key built while the backend was unreachable has no generation
+        # and could outlive a write, so it is never stored
+        if key.startswith("None:"):
+            return
+        try:
+            await self.backend.set(key, value)
+        except Exception as e:
+            print(f"Response cache unavailable: {e}")
+
+    def invalidate(self):
+        """Start a new generation; called from catalog_sync on every write."""
+        if not self.enabled:
+            return
+        task = asyncio.get_running_loop().create_task(self._bump())
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _bump(self):
+        try:
+            await self.backend.bump()
+        except Exception as e:
+            print(f"Response cache invalidation failed: {e}")
+
+    def stats(self) -> dict:
+        """Hit/miss counters and, for the in-process backend, its size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": self.backend.size() if self.enabled else 0
+        }
+
+    async def close(self):
+        if self.enabled:
+            await self.backend.close()
+
+
+def create_response_cache() -> ResponseCache:
+    """Build the response cache selected by RESPONSE_CACHE_BACKEND."""
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        return ResponseCache(RedisResponseBackend(settings.RESPONSE_CACHE_URL, settings.RESPONSE_CACHE_SECONDS))
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return ResponseCache(MemoryResponseBackend(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_SECONDS))
+    return ResponseCache()
+
+
+response_cache = create_response_cache()
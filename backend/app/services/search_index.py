@@ -0,0 +1,322 @@
+import asyncio
+import heapq
+import math
+import re
+from bisect import bisect_left
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from typing import Dict, List, Optional, Tuple
+
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Field weights: matches in the name count more than in the description
+FIELD_BOOSTS = {"name": 3.0, "shortDescription": 1.0}
+
+# Score multipliers for expanded query terms
+PREFIX_WEIGHT = 0.7
+TYPO_WEIGHT = 0.5
+
+# Limits on query expansion per term
+MAX_PREFIX_TERMS = 50
+MIN_TYPO_LENGTH = 4
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+ALPHABET = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+# Suffix rules for the light stemmer, checked in order
+SUFFIX_RULES = [
+    ("sses", "ss"),
+    ("ies", "y"),
+    ("ing", ""),
+    ("ers", ""),
+    ("er", ""),
+    ("ed", ""),
+    ("es", ""),
+    ("ss", "ss"),
+    ("s", ""),
+    ("e", "")
+]
+
+
+def stem(token: str) -> str:
+    """
+    Reduce a token to a crude stem so that e.g. image/images and
+    write/writer/writing share an index term.
+    """
+    for suffix, replacement in SUFFIX_RULES:
+        if token.endswith(suffix) and len(token) - len(suffix) + len(replacement) >= 3:
+            return token[:len(token) - len(suffix)] + replacement
+    return token
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase stemmed terms."""
+    if not text:
+        return []
+    return [stem(token) for token in TOKEN_PATTERN.findall(text.lower())]
+
+
+def _edits1(term: str) -> set:
+    """All strings one delete, transpose, replace or insert away from term."""
+    splits = [(term[:i], term[i:]) for i in range(len(term) + 1)]
+    deletes = [left + right[1:] for left, right in splits if right]
+    transposes = [left + right[1] + right[0] + right[2:] for left, right in splits if len(right) > 1]
+    replaces = [left + c + right[1:] for left, right in splits if right for c in ALPHABET]
+    inserts = [left + c + right for left, right in splits for c in ALPHABET]
+    return set(deletes + transposes + replaces + inserts)
+
+
+class ToolSearchIndex:
+    """
+    In-memory inverted index over the tool catalog with BM25F scoring.
+
+    Indexes name and shortDescription, keeps category, pricingModel and
+    avgRating per tool so filters are applied while scoring, and supports
+    incremental upserts/removals alongside periodic full reloads.
+
+    Each posting stores the tool's saturated, length-normalised term
+    weight, so a query only multiplies it by the term's idf. Length
+    normalisation uses the average field lengths at the time a tool is
+    indexed; the periodic full reload corrects any drift.
+
+    search only reads, so callers run it on a worker thread while the
+    event loop keeps applying upserts; it scores from a copy of each
+    postings dict and skips tools removed meanwhile.
+    """
+
+    def __init__(self):
+        self.ready = False
+        # Writes made while a load builds its index, replayed onto it
+        self._pending: Optional[list] = None
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._lengths: Dict[str, Tuple[int, int]] = {}
+        self._terms: Dict[str, set] = {}
+        self._attributes: Dict[str, Tuple[str, str, float]] = {}
+        self._total_lengths = [0, 0]
+        self._vocabulary: List[str] = []
+        self._vocabulary_dirty = False
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def upsert(self, tool: dict):
+        """
+        Add a tool to the index, replacing any previous version.
+
+        Args:
+            tool: Tool document (needs _id, name, shortDescription,
+                category, pricingModel and avgRating)
+        """
+        self._record("upsert", tool)
+        tool_id = str(tool["_id"])
+        self._remove(tool_id)
+
+        name_terms = tokenize(tool.get("name"))
+        description_terms = tokenize(tool.get("shortDescription"))
+
+        self._lengths[tool_id] = (len(name_terms), len(description_terms))
+        self._total_lengths[0] += len(name_terms)
+        self._total_lengths[1] += len(description_terms)
+        self._attributes[tool_id] = (
+            tool.get("category"),
+            str(getattr(tool.get("pricingModel"), "value", tool.get("pricingModel"))),
+            tool.get("avgRating") or 0.0
+        )
+
+        frequencies: Dict[str, List[int]] = {}
+        for term in name_terms:
+            frequencies.setdefault(term, [0, 0])[0] += 1
+        for term in description_terms:
+            frequencies.setdefault(term, [0, 0])[1] += 1
+
+        # BM25F: combine boosted, length-normalised field frequencies, then saturate
+        document_count = len(self._lengths)
+        name_norm = 1 - B + B * len(name_terms) / ((self._total_lengths[0] / document_count) or 1.0)
+        description_norm = 1 - B + B * len(description_terms) / ((self._total_lengths[1] / document_count) or 1.0)
+
+        for term, (name_tf, description_tf) in frequencies.items():
+            tf = (
+                FIELD_BOOSTS["name"] * name_tf / name_norm
+                + FIELD_BOOSTS["shortDescription"] * description_tf / description_norm
+            )
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._vocabulary_dirty = True
+            postings[tool_id] = tf * (K1 + 1) / (tf + K1)
+
+        self._terms[tool_id] = set(frequencies)
+
+    def remove(self, tool_id: str):
+        """Remove a tool from the index if present."""
+        self._record("remove", tool_id)
+        self._remove(tool_id)
+
+    def _remove(self, tool_id: str):
+        terms = self._terms.pop(tool_id, None)
+        if terms is None:
+            return
+
+        for term in terms:
+            postings = self._postings[term]
+            del postings[tool_id]
+            if not postings:
+                del self._postings[term]
+                self._vocabulary_dirty = True
+
+        name_length, description_length = self._lengths.pop(tool_id)
+        self._total_lengths[0] -= name_length
+        self._total_lengths[1] -= description_length
+        del self._attributes[tool_id]
+
+    def update_rating(self, tool_id: str, avg_rating: float):
+        """Update the avgRating used for minRating filtering."""
+        self._record("update_rating", tool_id, avg_rating)
+        attributes = self._attributes.get(tool_id)
+        if attributes:
+            self._attributes[tool_id] = (attributes[0], attributes[1], avg_rating)
+
+    def attributes(self, tool_ids: List[str]) -> List[Tuple[str, str, float]]:
+        """(category, pricingModel, avgRating) of each indexed tool in tool_ids."""
+        attributes = [self._attributes.get(tool_id) for tool_id in tool_ids]
+        return [row for row in attributes if row is not None]
+
+    def _expand(self, token: str, is_last: bool) -> List[Tuple[str, float]]:
+        """Map one query token to weighted index terms (exact, prefix, typo)."""
+        term = stem(token)
+        expansions = {}
+        if term in self._postings:
+            expansions[term] = 1.0
+
+        # The last token may still be being typed: match it as a prefix
+        if is_last and len(token) >= 2:
+            if self._vocabulary_dirty:
+                # Cleared first, so a term added while sorting marks it dirty again
+                self._vocabulary_dirty = False
+                self._vocabulary = sorted(self._postings)
+            start = bisect_left(self._vocabulary, token)
+            for candidate in self._vocabulary[start:start + MAX_PREFIX_TERMS]:
+                if not candidate.startswith(token):
+                    break
+                expansions.setdefault(candidate, PREFIX_WEIGHT)
+
+        # Tolerate a single typo when nothing matches exactly
+        if not expansions and len(term) >= MIN_TYPO_LENGTH:
+            for candidate in _edits1(term):
+                if candidate in self._postings:
+                    expansions[candidate] = TYPO_WEIGHT
+
+        return list(expansions.items())
+
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        pricingModel: Optional[str] = None,
+        minRating: Optional[float] = None,
+        limit: Optional[int] = None
+    ) -> Tuple[List[str], int]:
+        """
+        Rank tools matching any query term by BM25F relevance.
+
+        Args:
+            query: Free-text query
+            category: Only return tools in this category
+            pricingModel: Only return tools with this pricing model
+            minRating: Only return tools with at least this avgRating
+            limit: Return only the best `limit` tools (all when None)
+
+        Returns:
+            Tuple of (tool IDs ordered by descending score, total matches)
+        """
+        tokens = TOKEN_PATTERN.findall(query.lower())
+        if not tokens or not self._lengths:
+            return [], 0
+
+        document_count = len(self._lengths)
+        filtered = bool(category or pricingModel or minRating is not None)
+        allowed: Dict[str, bool] = {}
+        scores: Dict[str, float] = {}
+        scores_get = scores.get
+
+        for position, token in enumerate(tokens):
+            for term, weight in self._expand(token, position == len(tokens) - 1):
+                # A copy, since upserts may change the index while this runs
+                postings = self._postings.get(term, {}).copy()
+                if not postings:
+                    continue
+                idf = math.log(1 + (document_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                factor = weight * idf
+
+                if not filtered:
+                    for tool_id, saturated_tf in postings.items():
+                        scores[tool_id] = scores_get(tool_id, 0.0) + factor * saturated_tf
+                    continue
+
+                # Filter pushdown: each tool's attributes are checked once per query
+                for tool_id, saturated_tf in postings.items():
+                    ok = allowed.get(tool_id)
+                    if ok is None:
+                        attributes = self._attributes.get(tool_id)
+                        if attributes is None:
+                            continue
+                        tool_category, tool_pricing, tool_rating = attributes
+                        ok = allowed[tool_id] = not (
+                            (category and tool_category != category)
+                            or (pricingModel and tool_pricing != pricingModel)
+                            or (minRating is not None and tool_rating < minRating)
+                        )
+                    if ok:
+                        scores[tool_id] = scores_get(tool_id, 0.0) + factor * saturated_tf
+
+        def rank_key(tool_id):
+            return (scores[tool_id], tool_id)
+
+        if limit is not None and limit < len(scores):
+            ranked = heapq.nlargest(limit, scores, key=rank_key)
+        else:
+            ranked = sorted(scores, key=rank_key, reverse=True)
+
+        return ranked, len(scores)
+
+    def _record(self, *write):
+        if self._pending is not None:
+            self._pending.append(write)
+
+    @classmethod
+    def _build(cls, tools: List[dict]) -> "ToolSearchIndex":
+        fresh = cls()
+        for tool in tools:
+            fresh.upsert(tool)
+        return fresh
+
+    async def load(self, db: AsyncIOMotorDatabase, batch_size: int = 2000):
+        """
+        Rebuild the index from the tools collection.
+
+        The new index is tokenized and built on a worker thread, then
+        swapped in, so the event loop keeps serving (searches from the
+        previous index) while it loads. Writes made meanwhile are replayed
+        onto the new index before the swap.
+
+        Args:
+            db: MongoDB database instance
+            batch_size: Tools fetched per cursor batch
+        """
+        self._pending = []
+        try:
+            projection = {"name": 1, "shortDescription": 1, "category": 1, "pricingModel": 1, "avgRating": 1}
+            tools = [tool async for tool in db.tools.find({}, projection).batch_size(batch_size)]
+            fresh = await asyncio.to_thread(self._build, tools)
+            for method, *args in self._pending:
+                getattr(fresh, method)(*args)
+        finally:
+            self._pending = None
+
+        self.__dict__.update(fresh.__dict__)
+        self.ready = True
+
+
+search_index = ToolSearchIndex()
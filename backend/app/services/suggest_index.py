@@ -0,0 +1,225 @@
+import asyncio
+import heapq
+import re
+from bisect import bisect_left, insort
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from typing import Dict, List, Optional, Tuple
+
+
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Cached answers for recent prefixes (cleared on every catalog change)
+MAX_CACHED_PREFIXES = 2048
+
+
+class SuggestIndex:
+    """
+    Sorted-array prefix index over tool names and categories for typeahead.
+
+    Every tool contributes its full lowercased name and each word of it as
+    keys, so "stu" finds "Image Studio". A prefix lookup is two bisects
+    into the sorted key array; matches are ranked by votes, then avgRating.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self._entries: List[Tuple[str, str]] = []
+        self._keys: Dict[str, List[str]] = {}
+        self._tools: Dict[str, dict] = {}
+        self._categories: Dict[str, int] = {}
+        self._cache: Dict[Tuple[str, int], List[dict]] = {}
+        # Writes made while a load builds its index, replayed onto it
+        self._pending: Optional[list] = None
+
+    def __len__(self) -> int:
+        return len(self._tools)
+
+    @staticmethod
+    def _tool_keys(name: str) -> List[str]:
+        """Keys a tool name is findable under."""
+        lowered = name.lower().strip()
+        return sorted({lowered, *WORD_PATTERN.findall(lowered)})
+
+    def _add_entry(self, key: str, ref: str):
+        insort(self._entries, (key, ref))
+
+    def _remove_entry(self, key: str, ref: str):
+        position = bisect_left(self._entries, (key, ref))
+        if position < len(self._entries) and self._entries[position] == (key, ref):
+            del self._entries[position]
+
+    def _add_category(self, category: str):
+        count = self._categories.get(category, 0)
+        if count == 0:
+            self._add_entry(category.lower(), f"category:{category}")
+        self._categories[category] = count + 1
+
+    def _remove_category(self, category: str):
+        count = self._categories.get(category, 0) - 1
+        if count <= 0:
+            self._categories.pop(category, None)
+            self._remove_entry(category.lower(), f"category:{category}")
+        else:
+            self._categories[category] = count
+
+    def upsert(self, tool: dict):
+        """
+        Add or replace a tool.
+
+        Args:
+            tool: Tool document (needs _id, name, category, votes and avgRating)
+        """
+        self._record("upsert", tool)
+        tool_id = str(tool["_id"])
+        self._remove(tool_id)
+
+        keys = self._tool_keys(tool.get("name") or "")
+        for key in keys:
+            self._add_entry(key, tool_id)
+        self._keys[tool_id] = keys
+
+        self._tools[tool_id] = {
+            "name": tool.get("name"),
+            "category": tool.get("category"),
+            "votes": tool.get("votes") or 0,
+            "avgRating": tool.get("avgRating") or 0.0
+        }
+        if tool.get("category"):
+            self._add_category(tool["category"])
+        self._cache.clear()
+
+    def remove(self, tool_id: str):
+        """Remove a tool if present."""
+        self._record("remove", tool_id)
+        self._remove(tool_id)
+
+    def _remove(self, tool_id: str):
+        keys = self._keys.pop(tool_id, None)
+        if keys is None:
+            return
+
+        for key in keys:
+            self._remove_entry(key, tool_id)
+        tool = self._tools.pop(tool_id)
+        if tool["category"]:
+            self._remove_category(tool["category"])
+        self._cache.clear()
+
+    def update_rating(self, tool_id: str, avg_rating: float):
+        """Update the avgRating used for ranking."""
+        self._record("update_rating", tool_id, avg_rating)
+        tool = self._tools.get(tool_id)
+        if tool:
+            tool["avgRating"] = avg_rating
+            self._cache.clear()
+
+    def suggest(self, query: str, limit: int = 10) -> List[dict]:
+        """
+        Return the best tools and categories whose keys start with query.
+
+        Args:
+            query: Typed prefix
+            limit: Maximum number of suggestions
+
+        Returns:
+            Suggestions ordered categories first, then tools by votes/avgRating
+        """
+        prefix = query.strip().lower()
+        if not prefix:
+            return []
+
+        cached = self._cache.get((prefix, limit))
+        if cached is not None:
+            return cached
+
+        start = bisect_left(self._entries, (prefix,))
+        end = bisect_left(self._entries, (prefix + "\uffff",))
+
+        categories = []
+        tool_ids = set()
+        for _, ref in self._entries[start:end]:
+            if ref.startswith("category:"):
+                categories.append(ref[len("category:"):])
+            else:
+                tool_ids.add(ref)
+
+        suggestions = [
+            {"type": "category", "label": category, "category": category}
+            for category in sorted(categories)[:limit]
+        ]
+
+        def rank(tool_id):
+            tool = self._tools[tool_id]
+            return (tool["votes"], tool["avgRating"])
+
+        for tool_id in heapq.nlargest(limit - len(suggestions), tool_ids, key=rank):
+            tool = self._tools[tool_id]
+            suggestions.append({
+                "type": "tool",
+                "id": tool_id,
+                "label": tool["name"],
+                "category": tool["category"]
+            })
+
+        if len(self._cache) >= MAX_CACHED_PREFIXES:
+            self._cache.clear()
+        self._cache[(prefix, limit)] = suggestions
+        return suggestions
+
+    def _record(self, *write):
+        if self._pending is not None:
+            self._pending.append(write)
+
+    async def load(self, db: AsyncIOMotorDatabase, batch_size: int = 2000):
+        """
+        Rebuild the index from the tools collection and swap it in.
+
+        The new index is built on a worker thread, so the event loop keeps
+        serving from the previous one; writes made meanwhile are replayed
+        onto the new index before the swap.
+
+        Args:
+            db: MongoDB database instance
+            batch_size: Tools fetched per cursor batch
+        """
+        self._pending = []
+        try:
+            projection = {"name": 1, "category": 1, "votes": 1, "avgRating": 1}
+            tools = [tool async for tool in db.tools.find({}, projection).batch_size(batch_size)]
+            fresh = await asyncio.to_thread(self._build, tools)
+            for method, *args in self._pending:
+                getattr(fresh, method)(*args)
+        finally:
+            self._pending = None
+
+        self.__dict__.update(fresh.__dict__)
+        self.ready = True
+
+    @classmethod
+    def _build(cls, tools: List[dict]) -> "SuggestIndex":
+        fresh = cls()
+        entries = []
+        for tool in tools:
+            tool_id = str(tool["_id"])
+            keys = cls._tool_keys(tool.get("name") or "")
+            entries.extend((key, tool_id) for key in keys)
+            fresh._keys[tool_id] = keys
+            fresh._tools[tool_id] = {
+                "name": tool.get("name"),
+                "category": tool.get("category"),
+                "votes": tool.get("votes") or 0,
+                "avgRating": tool.get("avgRating") or 0.0
+            }
+            if tool.get("category"):
+                category = tool["category"]
+                if category not in fresh._categories:
+                    entries.append((category.lower(), f"category:{category}"))
+                fresh._categories[category] = fresh._categories.get(category, 0) + 1
+
+        # One sort instead of an insort per key
+        entries.sort()
+        fresh._entries = entries
+        return fresh
+
+
+suggest_index = SuggestIndex()
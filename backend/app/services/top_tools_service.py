@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReplaceOne
+from typing import Optional
+
+from app.config import settings
+from app.models.tool import TOOL_PROJECTION
+from app.services.migration_service import acquire_lock, default_owner
+from app.utils.pagination import build_sort
+
+
+# Materialized top lists: one document per category, plus one for all
+# tools; category lists carry a prefix so no category name can collide
+# with the overall list
+TOP_TOOLS_COLLECTION = "top_tools"
+ALL_CATEGORIES = "all"
+CATEGORY_PREFIX = "category:"
+
+# Highest rankScore first, served by the (rankScore, _id) indexes
+RANK_SORT = build_sort("rankScore", True)
+
+# Leader lock of the worker rebuilding the lists; another worker takes
+# over once the leader has not renewed it for this many intervals
+TOP_TOOLS_LOCK_ID = "top_tools_lock"
+TOP_TOOLS_LOCK_INTERVALS = 3
+
+
+def _list_id(category: Optional[str]) -> str:
+    """_id of the materialized list of a category, or of all tools."""
+    return f"{CATEGORY_PREFIX}{category}" if category else ALL_CATEGORIES
+
+
+async def _rank_tools(db: AsyncIOMotorDatabase, category: Optional[str], limit: int) -> list:
+    """Read the highest-ranked tools, optionally within one category."""
+    query = {"category": category} if category else {}
+    return await db.tools.find(query, TOOL_PROJECTION).sort(RANK_SORT).limit(limit).to_list(length=limit)
+
+
+async def refresh_top_tools(db: AsyncIOMotorDatabase) -> int:
+    """
+    Rebuild the materialized top tools lists.
+
+    The lists are read concurrently, one indexed query each, and written
+    in one bulk write. Each list is replaced as a whole, so readers see
+    either the previous or the new list; lists of categories that no
+    longer exist are dropped.
+
+    Args:
+        db: MongoDB database instance
+
+    Returns:
+        Number of lists written
+    """
+    categories = [None] + [category for category in await db.tools.distinct("category") if category]
+    refreshed_at = datetime.utcnow()
+
+    lists = await asyncio.gather(*(
+        _rank_tools(db, category, settings.TOP_TOOLS_SIZE) for category in categories
+    ))
+    list_ids = [_list_id(category) for category in categories]
+    await db[TOP_TOOLS_COLLECTION].bulk_write([
+        ReplaceOne({"_id": list_id}, {"tools": tools, "refreshedAt": refreshed_at}, upsert=True)
+        for list_id, tools in zip(list_ids, lists)
+    ], ordered=False)
+
+    await db[TOP_TOOLS_COLLECTION].delete_many({"_id": {"$nin": list_ids}})
+    return len(list_ids)
+
+
+async def get_top_tools(db: AsyncIOMotorDatabase, category: Optional[str], limit: int) -> dict:
+    """
+    Get the highest-ranked tools from the materialized lists.
+
+    Falls back to an indexed query while the lists have not been built.
+
+    Args:
+        db: MongoDB database instance
+        category: Category, or None for all tools
+        limit: Number of tools (at most TOP_TOOLS_SIZE)
+
+    Returns:
+        Dictionary with category, tools and refreshedAt (None when live)
+    """
+    top = await db[TOP_TOOLS_COLLECTION].find_one(
+        {"_id": _list_id(category)},
+        {"tools": {"$slice": limit}, "refreshedAt": 1}
+    )
+    if top is not None:
+        return {"category": category, "tools": top["tools"], "refreshedAt": top["refreshedAt"]}
+
+    return {"category": category, "tools": await _rank_tools(db, category, limit), "refreshedAt": None}
+
+
+async def refresh_top_tools_if_leader(db: AsyncIOMotorDatabase, owner: str) -> bool:
+    """
+    Rebuild the top tools lists if owner holds (or wins) the leader lock.
+
+    Args:
+        db: MongoDB database instance
+        owner: Lock owner identifier of this worker
+
+    Returns:
+        True if the lists were rebuilt
+    """
+    seconds = settings.TOP_TOOLS_REFRESH_SECONDS * TOP_TOOLS_LOCK_INTERVALS
+    if not await acquire_lock(db, owner, TOP_TOOLS_LOCK_ID, seconds):
+        return False
+    await refresh_top_tools(db)
+    return True
+
+
+async def refresh_top_tools_periodically(db: AsyncIOMotorDatabase):
+    """
+    Rebuild the top tools lists at startup, then at a fixed interval.
+
+    Every worker runs this loop, but only the one holding the leader lock
+    rebuilds the lists.
+    """
+    owner = default_owner()
+    while True:
+        try:
+            await refresh_top_tools_if_leader(db, owner)
+        except Exception as e:
+            print(f"Top tools refresh failed: {e}")
+        await asyncio.sleep(settings.TOP_TOOLS_REFRESH_SECONDS)
@@ -1,3 +1,10 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
@@ -5,11 +12,25 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.config import settings
 from app.models.user import UserInDB
+from app.utils.cache import TTLCache
 
 
 # Security scheme for JWT
 security = HTTPBearer()
 
+# Verified payloads by raw token, so repeat requests skip signature checks
+token_cache = TTLCache(maxsize=settings.TOKEN_CACHE_SIZE, ttl=settings.TOKEN_CACHE_SECONDS)
+
+# Password hashes: pbkdf2_sha256$<iterations>$<salt>$<hash>
+PASSWORD_HASH_SCHEME = "pbkdf2_sha256"
+
+# The KDF runs on these threads (hashlib releases the GIL), never on the
+# event loop; None runs it inline
+password_executor = (
+    ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+    if settings.PASSWORD_HASH_WORKERS > 0 else None
+)
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -39,6 +60,9 @@ def verify_token(token: str) -> dict:
     """
     Verify and decode a JWT token.
     
+    Verified payloads are cached until the token's exp (or the cache
+    TTL, if sooner); invalid tokens are never cached.
+    
     Args:
         token: JWT token string
         
@@ -48,21 +72,56 @@ def verify_token(token: str) -> dict:
     Raises:
         HTTPException: If token is invalid or expired
     """
+    cached = token_cache.get(token)
+    if cached is not None:
+        return dict(cached)
+    
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
-        return payload
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    
+    ttl = settings.TOKEN_CACHE_SECONDS
+    if isinstance(payload.get("exp"), (int, float)):
+        ttl = min(ttl, payload["exp"] - time.time())
+    if ttl > 0:
+        token_cache.set(token, dict(payload), ttl=ttl)
+    
+    return payload
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode().rstrip("=")
+
+
+def hash_password(password: str, iterations: Optional[int] = None) -> str:
+    """
+    Hash a password with PBKDF2-HMAC-SHA256 and a random salt.
+    
+    Args:
+        password: Plain password
+        iterations: KDF cost (defaults to PASSWORD_HASH_ITERATIONS)
+        
+    Returns:
+        Encoded hash for storage
+    """
+    iterations = iterations or settings.PASSWORD_HASH_ITERATIONS
+    salt = os.urandom(16)
+    digest = hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+    return f"{PASSWORD_HASH_SCHEME}${iterations}${_b64(salt)}${_b64(digest)}"
 
 
 def verify_password(plain_password: str, stored_password: str) -> bool:
     """
     Verify a plain password against stored password.
     
+    Accepts hashes from hash_password as well as legacy plain text
+    passwords, which needs_rehash flags for upgrade.
+    
     Args:
         plain_password: Password provided by user
         stored_password: Password stored in database
@@ -70,7 +129,40 @@ def verify_password(plain_password: str, stored_password: str) -> bool:
     Returns:
         True if passwords match, False otherwise
     """
-    return plain_password == stored_password
+    if not stored_password.startswith(f"{PASSWORD_HASH_SCHEME}$"):
+        return hmac.compare_digest(plain_password.encode(), stored_password.encode())
+    
+    try:
+        _, iterations, salt, expected = stored_password.split("$")
+        salt_bytes = base64.b64decode(salt + "=" * (-len(salt) % 4))
+        digest = hashlib.pbkdf2_hmac("sha256", plain_password.encode(), salt_bytes, int(iterations))
+    except ValueError:
+        return False
+    
+    return hmac.compare_digest(_b64(digest), expected)
+
+
+def needs_rehash(stored_password: str) -> bool:
+    """Whether a stored password is plain text or hashed with another cost."""
+    return not stored_password.startswith(
+        f"{PASSWORD_HASH_SCHEME}${settings.PASSWORD_HASH_ITERATIONS}$"
+    )
+
+
+async def _run_kdf(func, *args):
+    if password_executor is None:
+        return func(*args)
+    return await asyncio.get_running_loop().run_in_executor(password_executor, func, *args)
+
+
+async def hash_password_async(password: str) -> str:
+    """hash_password on the password hashing pool."""
+    return await _run_kdf(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, stored_password: str) -> bool:
+    """verify_password on the password hashing pool."""
+    return await _run_kdf(verify_password, plain_password, stored_password)
 
 
 async def get_current_user(
@@ -0,0 +1,68 @@
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Small in-process LRU cache whose entries also expire after a TTL.
+
+    Not thread-safe; meant for use from the event loop only.
+
+    Args:
+        maxsize: Maximum number of entries (least recently used evicted first)
+        ttl: Seconds an entry stays valid
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Store a value.
+
+        Args:
+            key: Cache key
+            value: Value to cache (None is not distinguishable from a miss)
+            ttl: Override of the default TTL for this entry
+        """
+        self._data[key] = (value, time.monotonic() + (self.ttl if ttl is None else ttl))
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        """Drop one entry if present."""
+        self._data.pop(key, None)
+
+    def clear(self):
+        """Drop all entries."""
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data)}
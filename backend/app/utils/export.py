@@ -0,0 +1,91 @@
+import csv
+import io
+import json
+from datetime import datetime
+from bson import ObjectId
+from fastapi.responses import StreamingResponse
+from motor.motor_asyncio import AsyncIOMotorCursor
+from typing import AsyncIterator, List
+
+
+# Rows buffered into one chunk of the streamed response
+ROWS_PER_CHUNK = 500
+
+
+def _json_default(value):
+    """Serialize BSON values that json cannot handle natively."""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _cell(value) -> str:
+    """Render a single CSV cell."""
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(getattr(value, "value", value))
+
+
+async def _ndjson_chunks(cursor: AsyncIOMotorCursor, fields: List[str]) -> AsyncIterator[str]:
+    """Yield newline-delimited JSON, a chunk of rows at a time."""
+    lines = []
+    async for doc in cursor:
+        lines.append(json.dumps({field: doc.get(field) for field in fields}, default=_json_default))
+        if len(lines) >= ROWS_PER_CHUNK:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+async def _csv_chunks(cursor: AsyncIOMotorCursor, fields: List[str]) -> AsyncIterator[str]:
+    """Yield CSV with a header row, a chunk of rows at a time."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(fields)
+    rows = 0
+
+    async for doc in cursor:
+        writer.writerow([_cell(doc.get(field)) for field in fields])
+        rows += 1
+        if rows >= ROWS_PER_CHUNK:
+            yield output.getvalue()
+            output.seek(0)
+            output.truncate(0)
+            rows = 0
+
+    yield output.getvalue()
+
+
+def export_response(cursor: AsyncIOMotorCursor, fields: List[str], format: str, filename: str) -> StreamingResponse:
+    """
+    Stream the documents of a Motor cursor as NDJSON or CSV.
+
+    Documents are encoded as the cursor yields them, so memory stays
+    constant regardless of how many documents are exported.
+
+    Args:
+        cursor: Motor cursor over the documents to export
+        fields: Fields to include, in column order
+        format: "ndjson" or "csv"
+        filename: Base name for the download (without extension)
+
+    Returns:
+        Streaming response with a download filename
+    """
+    if format == "csv":
+        body = _csv_chunks(cursor, fields)
+        media_type = "text/csv"
+    else:
+        body = _ndjson_chunks(cursor, fields)
+        media_type = "application/x-ndjson"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{format}"'}
+    )
@@ -0,0 +1,113 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+from typing import Hashable, NamedTuple
+
+
+class CachedResponse(NamedTuple):
+    """A serialized JSON response body with its validators."""
+    body: bytes
+    etag: str
+    last_modified: datetime
+
+
+def document_version(doc: dict, *fields: str) -> datetime:
+    """
+    Latest of a document's modification timestamps.
+
+    Args:
+        doc: MongoDB document (timestamps are naive UTC datetimes)
+        fields: Timestamp fields to consider; missing ones are skipped
+
+    Returns:
+        Latest timestamp as an aware UTC datetime
+    """
+    stamps = [doc[field] for field in fields if doc.get(field)]
+    latest = max(stamps) if stamps else datetime(1970, 1, 1)
+    return latest.replace(tzinfo=timezone.utc)
+
+
+def make_etag(version: datetime, variant: Hashable) -> str:
+    """
+    Weak ETag for one representation of a document version.
+
+    Args:
+        version: Value from document_version
+        variant: Whatever else shapes the body (fields, page, ...)
+
+    Returns:
+        Quoted weak entity tag
+    """
+    digest = hashlib.blake2b(repr(variant).encode(), digest_size=6).hexdigest()
+    return f'W/"{int(version.timestamp() * 1000):x}-{digest}"'
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since against a representation.
+
+    If-None-Match takes precedence; If-Modified-Since is compared at the
+    one-second resolution of HTTP dates.
+
+    Args:
+        request: Incoming request
+        etag: Current entity tag
+        last_modified: Current modification time (aware UTC)
+
+    Returns:
+        True if the client's copy is current and a 304 can be sent
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison: W/ prefixes are ignored
+        current = etag.removeprefix("W/")
+        return any(tag.strip().removeprefix("W/") == current for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+
+    return False
+
+
+def _validator_headers(etag: str, last_modified: datetime, cache_control: str) -> dict:
+    return {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        "Cache-Control": cache_control
+    }
+
+
+def not_modified_response(etag: str, last_modified: datetime, cache_control: str) -> Response:
+    """Empty 304 carrying the representation's validators."""
+    return Response(status_code=304, headers=_validator_headers(etag, last_modified, cache_control))
+
+
+def conditional_response(request: Request, cached: CachedResponse, cache_control: str) -> Response:
+    """
+    Send a cached body, or 304 Not Modified if the client already has it.
+
+    Args:
+        request: Incoming request
+        cached: Body and validators
+        cache_control: Cache-Control header value
+
+    Returns:
+        200 application/json response or empty 304, both with validators
+    """
+    if is_not_modified(request, cached.etag, cached.last_modified):
+        return not_modified_response(cached.etag, cached.last_modified, cache_control)
+    return Response(
+        content=cached.body,
+        media_type="application/json",
+        headers=_validator_headers(cached.etag, cached.last_modified, cache_control)
+    )
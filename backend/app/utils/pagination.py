@@ -0,0 +1,154 @@
+import base64
+import binascii
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId, json_util
+from fastapi import HTTPException, status
+
+
+# Sort specification: list of (field, direction) pairs, always ending in _id
+SortSpec = List[Tuple[str, int]]
+
+# Default keyset order for list endpoints (served by the _id index)
+DEFAULT_SORT: SortSpec = [("_id", 1)]
+
+
+def build_sort(field: str, descending: bool) -> SortSpec:
+    """
+    Build a keyset sort on one field with _id as tie-breaker.
+
+    _id follows the field's direction, so a (field, _id) index can serve
+    either direction by walking it forwards or backwards.
+    """
+    direction = -1 if descending else 1
+    return [(field, direction), ("_id", direction)]
+
+
+def encode_cursor(doc: dict, sort: SortSpec) -> str:
+    """
+    Encode an opaque pagination cursor from the last document of a page.
+
+    Args:
+        doc: Last MongoDB document returned on the current page
+        sort: Sort specification used for the page
+
+    Returns:
+        URL-safe cursor string
+    """
+    values = [doc.get(field) for field, _ in sort]
+    raw = json_util.dumps({"k": values, "s": [[field, direction] for field, direction in sort]})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _valid_value(value: Any, types: Optional[tuple]) -> bool:
+    """Whether a decoded sort key value is null or of the field's types."""
+    if value is None or types is None:
+        return True
+    return isinstance(value, types) and not isinstance(value, bool)
+
+
+def decode_cursor(cursor: str, sort: SortSpec, value_types: Optional[Dict[str, tuple]] = None) -> List[Any]:
+    """
+    Decode a pagination cursor back into its sort key values.
+
+    Args:
+        cursor: Cursor string previously returned as nextCursor
+        sort: Sort specification of the current request
+        value_types: Types each sorted field holds besides null; values of
+            other types (e.g. from a hand-edited cursor) are rejected.
+            _id must always be an ObjectId
+
+    Returns:
+        Sort key values of the last document of the previous page
+
+    Raises:
+        HTTPException: If the cursor is malformed, holds values of the wrong
+            types or was issued for another sort
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json_util.loads(base64.urlsafe_b64decode(padded).decode())
+        values = payload["k"]
+        issued_for = payload.get("s")
+    except (ValueError, KeyError, TypeError, AttributeError, binascii.Error):
+        values = issued_for = None
+
+    if (
+        not isinstance(values, list)
+        or len(values) != len(sort)
+        or (issued_for is not None and issued_for != [[field, direction] for field, direction in sort])
+        or not isinstance(values[-1], ObjectId)
+        or not all(_valid_value(value, (value_types or {}).get(field)) for (field, _), value in zip(sort, values))
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+    return values
+
+
+def keyset_filter(sort: SortSpec, values: List[Any]) -> dict:
+    """
+    Build a filter matching documents strictly after the given sort key.
+
+    For a sort of (a, b, _id) this produces
+    a > va OR (a == va AND b > vb) OR (a == va AND b == vb AND _id > vid),
+    with comparison operators flipped for descending fields, so the query
+    can seek directly into a matching compound index instead of skipping.
+
+    Missing/null values sort before everything else, so they are handled
+    explicitly: a descending page boundary also lets nulls through, and
+    nothing sorts after a null when descending.
+
+    Args:
+        sort: Sort specification of the request
+        values: Sort key values decoded from the cursor
+
+    Returns:
+        MongoDB filter fragment
+    """
+    clauses = []
+    for i, (field, direction) in enumerate(sort):
+        clause = {prev_field: value for (prev_field, _), value in zip(sort[:i], values[:i])}
+        value = values[i]
+        if value is None:
+            if direction == -1:
+                continue
+            clause[field] = {"$ne": None}
+        elif direction == 1 or field == "_id":
+            clause[field] = {"$gt" if direction == 1 else "$lt": value}
+        else:
+            # Unlike $lt, this also matches null/missing values
+            clause[field] = {"$not": {"$gte": value}}
+        clauses.append(clause)
+
+    return {"$or": clauses}
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Encode a cursor for result lists that can only be paged by position."""
+    raw = json_util.dumps({"o": offset})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    """
+    Decode a cursor issued by encode_offset_cursor.
+
+    Raises:
+        HTTPException: If the cursor is malformed or of another kind
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = json_util.loads(base64.urlsafe_b64decode(padded).decode())["o"]
+    except (ValueError, KeyError, TypeError, binascii.Error):
+        offset = None
+
+    if not isinstance(offset, int) or offset < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+    return offset
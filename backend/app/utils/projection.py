@@ -0,0 +1,87 @@
+from fastapi import HTTPException, status
+from functools import lru_cache
+from pydantic import BaseModel, ConfigDict, create_model
+from typing import Dict, FrozenSet, Optional, Type
+
+
+def model_projection(model: Type[BaseModel]) -> dict:
+    """
+    Build a MongoDB projection selecting the stored fields a model reads.
+
+    Field aliases are honoured, so an `id` field aliased to `_id` selects
+    `_id`. Internal fields that no response exposes (e.g. running rating
+    totals) are left out.
+
+    Args:
+        model: Pydantic model documents are converted to
+
+    Returns:
+        Inclusion projection
+    """
+    return {
+        (info.alias or name): 1
+        for name, info in model.model_fields.items()
+    }
+
+
+def _output_names(model: Type[BaseModel]) -> Dict[str, str]:
+    """Map the names fields have in responses (aliases) to field names."""
+    return {(info.alias or name): name for name, info in model.model_fields.items()}
+
+
+def parse_fieldset(model: Type[BaseModel], fields: Optional[str]) -> Optional[FrozenSet[str]]:
+    """
+    Parse a ?fields= sparse fieldset against a response model.
+
+    Names are the keys clients see in responses; _id is always included.
+
+    Args:
+        model: Full response model of the endpoint
+        fields: Comma-separated field names, or None
+
+    Returns:
+        Requested model field names, or None for the full model
+
+    Raises:
+        HTTPException: If a name is not a field of the model
+    """
+    if not fields:
+        return None
+
+    names = _output_names(model)
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = sorted(requested - set(names))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+
+    return frozenset(names[field] for field in requested | {"_id"} if field in names)
+
+
+def fieldset_projection(model: Type[BaseModel], fieldset: FrozenSet[str]) -> dict:
+    """Projection selecting only the stored fields of a sparse fieldset."""
+    return {
+        (info.alias or name): 1
+        for name, info in model.model_fields.items()
+        if name in fieldset
+    }
+
+
+@lru_cache(maxsize=256)
+def partial_model(model: Type[BaseModel], fieldset: FrozenSet[str]) -> Type[BaseModel]:
+    """
+    Build (and cache) a lightweight model with only the fieldset's fields.
+
+    Field types, defaults and aliases are copied from the full model.
+    """
+    return create_model(
+        f"{model.__name__}Partial",
+        __config__=ConfigDict(populate_by_name=True),
+        **{
+            name: (info.annotation, info)
+            for name, info in model.model_fields.items()
+            if name in fieldset
+        }
+    )
@@ -0,0 +1,108 @@
+from fastapi import Response
+from functools import lru_cache
+from pydantic import BaseModel, TypeAdapter, create_model
+from typing import FrozenSet, List, Optional, Tuple, Type
+
+from app.utils.projection import fieldset_projection, parse_fieldset, partial_model
+
+
+def document_list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """Build (once, at import) a validator for a list of documents as model."""
+    return TypeAdapter(List[model])
+
+
+@lru_cache(maxsize=256)
+def partial_list_models(
+    list_model: Type[BaseModel],
+    item_model: Type[BaseModel],
+    fieldset: FrozenSet[str]
+) -> Tuple[Type[BaseModel], TypeAdapter]:
+    """
+    Build (and cache) a list response and item adapter for a sparse fieldset.
+
+    Args:
+        list_model: Full list response model (e.g. ToolListResponse)
+        item_model: Full item model (e.g. Tool)
+        fieldset: Field names from parse_fieldset
+
+    Returns:
+        Tuple of (list response model with partial items, item list adapter)
+    """
+    item = partial_model(item_model, fieldset)
+    response = create_model(
+        f"{list_model.__name__}Partial",
+        __base__=list_model,
+        items=(List[item], ...)
+    )
+    return response, document_list_adapter(item)
+
+
+def select_list_fields(
+    list_model: Type[BaseModel],
+    item_model: Type[BaseModel],
+    fields: Optional[str],
+    projection: dict,
+    adapter: TypeAdapter
+) -> Tuple[Type[BaseModel], TypeAdapter, dict]:
+    """
+    Resolve a ?fields= parameter for a list endpoint.
+
+    Args:
+        list_model: Full list response model
+        item_model: Full item model
+        fields: Raw ?fields= value, or None
+        projection: The endpoint's full projection
+        adapter: The endpoint's full item list adapter
+
+    Returns:
+        Tuple of (list response model, item list adapter, projection);
+        the full ones when fields is not given
+
+    Raises:
+        HTTPException: If fields names an unknown field
+    """
+    fieldset = parse_fieldset(item_model, fields)
+    if fieldset is None:
+        return list_model, adapter, projection
+
+    response_model, partial_adapter = partial_list_models(list_model, item_model, fieldset)
+    return response_model, partial_adapter, fieldset_projection(item_model, fieldset)
+
+
+def validate_documents(adapter: TypeAdapter, docs: List[dict]) -> list:
+    """
+    Validate MongoDB documents into models in a single pass.
+
+    The documents' ObjectId _id is turned into the string the models'
+    `id` field (aliased to _id) expects.
+
+    Args:
+        adapter: Adapter from document_list_adapter
+        docs: Documents as read from MongoDB (modified in place)
+
+    Returns:
+        List of model instances
+    """
+    for doc in docs:
+        doc["_id"] = str(doc["_id"])
+    return adapter.validate_python(docs)
+
+
+def json_response(model: BaseModel) -> Response:
+    """
+    Serialize a response model straight to JSON bytes.
+
+    Returning a Response skips FastAPI's response_model handling, which
+    would dump the model, validate it again and then serialize it. Keep
+    response_model on the route so the OpenAPI schema is unchanged.
+
+    Args:
+        model: Fully built response model (by-alias output, like FastAPI)
+
+    Returns:
+        application/json response
+    """
+    return Response(
+        content=model.__pydantic_serializer__.to_json(model, by_alias=True),
+        media_type="application/json"
+    )
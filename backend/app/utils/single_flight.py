@@ -0,0 +1,55 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical loads into one in-flight call.
+
+    The first caller for a key starts the load as a task; callers that
+    arrive while it runs await the same task and share its result or
+    exception. The task is shielded, so a caller that disconnects does
+    not cancel the load for the others. Event loop only.
+    """
+
+    def __init__(self):
+        self.executed = 0
+        self.coalesced = 0
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+    def start(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> asyncio.Task:
+        """
+        Start a load for key unless one is already in flight.
+
+        Args:
+            key: Identifies the load (everything its result depends on)
+            load: Zero-argument coroutine function doing the work
+
+        Returns:
+            The in-flight task
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+            return task
+
+        self.executed += 1
+        task = asyncio.get_running_loop().create_task(load())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._finish(key, done))
+        return task
+
+    async def do(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Run load for key, or join the identical load already in flight."""
+        return await asyncio.shield(self.start(key, load))
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Mark the exception retrieved; background loads may have no waiter
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self) -> dict:
+        """Executed and coalesced call counters and loads in flight."""
+        return {"executed": self.executed, "coalesced": self.coalesced, "inFlight": len(self._in_flight)}
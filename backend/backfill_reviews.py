@@ -0,0 +1,41 @@
+"""
+Backfill denormalized fields on existing reviews.
+Run this script once after upgrading so review listings no longer need
+to join with other collections.
+"""
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+import os
+
+from app.services.denormalization_service import backfill_review_user_names, backfill_review_tool_names
+
+# Load environment variables
+load_dotenv()
+
+MONGODB_URI = os.getenv("MONGODB_URI")
+DATABASE_NAME = os.getenv("DATABASE_NAME", "ai_tools_discovery")
+
+
+async def backfill_reviews():
+    """Store user and tool names on reviews that predate denormalization."""
+    
+    # Connect to MongoDB
+    client = AsyncIOMotorClient(MONGODB_URI)
+    db = client[DATABASE_NAME]
+    
+    print(f"Connected to MongoDB: {DATABASE_NAME}")
+    
+    updated = await backfill_review_user_names(db)
+    print(f"✅ Stored userName on {updated} reviews")
+    
+    updated = await backfill_review_tool_names(db)
+    print(f"✅ Stored toolName on {updated} reviews")
+    
+    # Close connection
+    client.close()
+    print("Database connection closed")
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill_reviews())
@@ -0,0 +1,100 @@
+"""
+Benchmark authenticated request handling with and without the verified
+token cache. Times verify_token alone, then drives a minimal app with a
+require_user route through ASGI (no server or database needed).
+
+Usage: python benchmark_auth.py --requests 20000 --users 100
+"""
+import argparse
+import asyncio
+import time
+from fastapi import Depends, FastAPI
+
+from app.utils import auth
+from app.utils.cache import TTLCache
+from app.utils.dependencies import require_user
+
+app = FastAPI()
+
+
+@app.get("/ping")
+async def ping(current_user: dict = Depends(require_user)):
+    return {"sub": current_user["sub"]}
+
+
+async def call(token: str):
+    """Send one GET /ping through the ASGI app and wait for the response."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 1234),
+        "server": ("127.0.0.1", 8000)
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    status_code = None
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    await app(scope, receive, send)
+    assert status_code == 200, status_code
+
+
+def time_verify(tokens: list, count: int) -> float:
+    """verify_token calls per second."""
+    started = time.perf_counter()
+    for i in range(count):
+        auth.verify_token(tokens[i % len(tokens)])
+    return count / (time.perf_counter() - started)
+
+
+async def time_requests(tokens: list, count: int, concurrency: int) -> float:
+    """Authenticated requests per second."""
+    async def worker(offset: int):
+        for i in range(offset, count, concurrency):
+            await call(tokens[i % len(tokens)])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(offset) for offset in range(concurrency)))
+    return count / (time.perf_counter() - started)
+
+
+async def main(requests: int, users: int, concurrency: int):
+    tokens = [
+        auth.create_access_token({"sub": f"{i:024x}", "email": f"user{i}@example.com", "role": "user"})
+        for i in range(users)
+    ]
+    print(f"🔑 {users} distinct tokens, {requests} calls each run\n")
+    print(f"  {'cache':<10} {'verify_token/s':>15} {'requests/s':>12}")
+
+    for label, cache in [("off", TTLCache(maxsize=0)), ("on", TTLCache(maxsize=10000, ttl=300))]:
+        auth.token_cache = cache
+        verify_rate = time_verify(tokens, requests)
+        request_rate = await time_requests(tokens, requests, concurrency)
+        print(f"  {label:<10} {verify_rate:>15.0f} {request_rate:>12.0f}")
+        if label == "on":
+            stats = cache.stats()
+            print(f"\n  cache hits: {stats['hits']}, misses: {stats['misses']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the verified token cache")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.users, args.concurrency))
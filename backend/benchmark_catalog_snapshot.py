@@ -0,0 +1,129 @@
+"""
+Benchmark GET /tools throughput from the in-memory catalog snapshot
+against the MongoDB path. Seeds a synthetic catalog into a throwaway
+database, then drives the app through ASGI (no server needed) with a
+mix of browse queries, with the response cache off so every request
+builds its page.
+
+Usage: python benchmark_catalog_snapshot.py --size 30000 --requests 2000
+"""
+import argparse
+import asyncio
+import json
+import time
+from motor.motor_asyncio import AsyncIOMotorClient
+
+import app.database as database
+import app.routers.tools as tools_router
+from app.config import settings
+from app.main import app
+from app.services.catalog_snapshot import CatalogSnapshot
+from app.services.migration_service import build_all_indexes
+from app.services.response_cache import ResponseCache
+from benchmark_list_queries import seed
+
+# Browse queries the tool list sees most often
+QUERIES = [
+    "pageSize=20",
+    "pageSize=20&category=Code",
+    "pageSize=20&category=Code&pricingModel=free",
+    "pageSize=20&sort=votes",
+    "pageSize=20&minRating=4&sort=avgRating",
+    "pageSize=20&category=Images&minRating=3&sort=createdAt",
+    "pageSize=20&sort=name&order=asc&page=5",
+    "pageSize=20&includeTotal=false&sort=reviewCount"
+]
+
+
+async def get(path: str, query: str) -> bytes:
+    """Send one GET through the ASGI app and return the response body."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [],
+        "client": ("127.0.0.1", 1234),
+        "server": ("127.0.0.1", 8000)
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    status_code = None
+    body = []
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+        elif message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    assert status_code == 200, status_code
+    return b"".join(body)
+
+
+async def requests_per_second(count: int, concurrency: int) -> float:
+    """GET /tools requests per second over the query mix."""
+    async def worker(offset: int):
+        for i in range(offset, count, concurrency):
+            await get("/tools", QUERIES[i % len(QUERIES)])
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(offset) for offset in range(concurrency)))
+    return count / (time.perf_counter() - started)
+
+
+async def main(size: int, requests: int, concurrency: int):
+    client = AsyncIOMotorClient(settings.MONGODB_URI)
+    db = client[f"{settings.DATABASE_NAME}_snapshot"]
+    database.db.db = db
+    print(f"Connected to MongoDB: {db.name}")
+
+    await seed(db, size)
+    await build_all_indexes(db)
+
+    snapshot = CatalogSnapshot()
+    started = time.perf_counter()
+    await snapshot.load(db)
+    print(f"📦 Catalog size: {size}, snapshot loaded in {time.perf_counter() - started:.2f}s\n")
+
+    # Every request builds its page from the path under test
+    tools_router.response_cache = ResponseCache()
+
+    # Both paths must return the same pages
+    tools_router.catalog_snapshot = snapshot
+    from_snapshot = [json.loads(await get("/tools", query)) for query in QUERIES]
+    tools_router.catalog_snapshot = CatalogSnapshot()
+    from_mongo = [json.loads(await get("/tools", query)) for query in QUERIES]
+    assert from_snapshot == from_mongo, "snapshot and MongoDB pages differ"
+
+    print(f"  {'path':<10} {'requests/s':>12}")
+    rates = {}
+    for label, path_snapshot in [("mongo", CatalogSnapshot()), ("snapshot", snapshot)]:
+        tools_router.catalog_snapshot = path_snapshot
+        await requests_per_second(min(requests, 200), concurrency)
+        rates[label] = await requests_per_second(requests, concurrency)
+        print(f"  {label:<10} {rates[label]:>12.0f}")
+    print(f"\n  speedup: {rates['snapshot'] / rates['mongo']:.1f}x")
+
+    await client.drop_database(db.name)
+    client.close()
+    print("\nBenchmark database dropped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark GET /tools from the catalog snapshot")
+    parser.add_argument("--size", type=int, default=30000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.size, args.requests, args.concurrency))
@@ -0,0 +1,120 @@
+"""
+Benchmark how list endpoints fetch a page and its total.
+Seeds a synthetic catalog into a throwaway database and times each
+LIST_QUERY_STRATEGY ("sequential", "gather", "facet") per filter shape,
+then prints the strategy with the lowest median latency per catalog size
+(the value to set as the LIST_QUERY_STRATEGY default).
+
+Usage: python benchmark_list_queries.py --sizes 1000 10000 100000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config import settings
+from app.services.list_service import fetch_page
+
+STRATEGIES = ["sequential", "gather", "facet"]
+CATEGORIES = ["Images", "Writing", "Code", "Video", "Audio", "Productivity", "Marketing", "Education"]
+PRICING_MODELS = ["free", "paid", "subscription", "free_plus_paid", "no_pricing"]
+
+# Filter shapes the list endpoints see most often
+FILTERS = {
+    "no filter": {},
+    "category": {"category": "Code"},
+    "minRating": {"avgRating": {"$gte": 4.0}},
+    "category+pricing": {"category": "Code", "pricingModel": "free"}
+}
+
+
+def synthetic_tool(i: int) -> dict:
+    """Build one synthetic tool document."""
+    now = datetime.utcnow()
+    return {
+        "name": f"Synthetic Tool {i}",
+        "shortDescription": f"Synthetic tool number {i} for benchmarking",
+        "category": random.choice(CATEGORIES),
+        "pricingDisplay": "Free",
+        "pricingModel": random.choice(PRICING_MODELS),
+        "officialUrl": None,
+        "sourceUrl": f"https://example.com/tools/{i}",
+        "releasedAgo": "1 month ago",
+        "votes": random.randint(0, 5000),
+        "ratingSeed": None,
+        "avgRating": round(random.uniform(0, 5), 2),
+        "reviewCount": 0,
+        "logoUrl": None,
+        "createdAt": now,
+        "updatedAt": now
+    }
+
+
+async def seed(db, size: int):
+    """Replace the benchmark catalog with `size` synthetic tools."""
+    await db.tools.drop()
+    await db.counters.drop()
+    for start in range(0, size, 10000):
+        await db.tools.insert_many([synthetic_tool(i) for i in range(start, min(start + 10000, size))])
+    await db.tools.create_index([("category", 1), ("_id", 1)])
+    await db.tools.create_index([("pricingModel", 1), ("_id", 1)])
+    await db.tools.create_index("avgRating")
+
+
+async def time_strategy(db, strategy: str, filter_query: dict, iterations: int, page_size: int) -> list:
+    """Time fetch_page for one strategy and filter, returning latencies in ms."""
+    settings.LIST_QUERY_STRATEGY = strategy
+    latencies = []
+    for i in range(iterations):
+        skip = (i % 5) * page_size
+        started = time.perf_counter()
+        await fetch_page(db, "tools", dict(filter_query), [("_id", 1)], skip, page_size + 1)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+async def main(sizes: list, iterations: int, page_size: int):
+    client = AsyncIOMotorClient(settings.MONGODB_URI)
+    db = client[f"{settings.DATABASE_NAME}_benchmark"]
+    print(f"Connected to MongoDB: {db.name}")
+    
+    fastest = {}
+    for size in sizes:
+        await seed(db, size)
+        print(f"\n📦 Catalog size: {size}")
+        print(f"  {'filter':<18} {'strategy':<11} {'p50 ms':>8} {'p95 ms':>8}")
+        
+        medians = {strategy: [] for strategy in STRATEGIES}
+        for name, filter_query in FILTERS.items():
+            for strategy in STRATEGIES:
+                # Warm up caches and counters before measuring
+                await time_strategy(db, strategy, filter_query, 3, page_size)
+                latencies = await time_strategy(db, strategy, filter_query, iterations, page_size)
+                p50 = statistics.median(latencies)
+                p95 = statistics.quantiles(latencies, n=20)[18]
+                medians[strategy].append(p50)
+                print(f"  {name:<18} {strategy:<11} {p50:>8.2f} {p95:>8.2f}")
+        
+        # Filter shapes weigh equally: compare the mean of their medians
+        fastest[size] = min(STRATEGIES, key=lambda strategy: statistics.mean(medians[strategy]))
+    
+    print(f"\n🏁 Fastest strategy (LIST_QUERY_STRATEGY default is {settings.LIST_QUERY_STRATEGY!r}):")
+    for size, strategy in fastest.items():
+        print(f"  {size:>9} tools: {strategy}")
+    
+    await client.drop_database(db.name)
+    client.close()
+    print("\nBenchmark database dropped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark list query strategies")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+    
+    asyncio.run(main(args.sizes, args.iterations, args.page_size))
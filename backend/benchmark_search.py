@@ -0,0 +1,120 @@
+"""
+Benchmark the in-memory BM25 search index against MongoDB $text.
+Builds a synthetic catalog, times index load and queries, and, if a
+MongoDB server is reachable, times the equivalent $text count + find
+against a throwaway database.
+
+Usage: python benchmark_search.py --size 100000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.errors import PyMongoError
+
+from app.config import settings
+from app.services.search_index import ToolSearchIndex
+
+CATEGORIES = ["Images", "Writing", "Code", "Video", "Audio", "Productivity", "Marketing", "Education"]
+WORDS = (
+    "ai image generator writer assistant code review video editor voice music chat bot "
+    "analytics marketing email seo design logo photo avatar translate summarize notes "
+    "meeting research data sql spreadsheet slide presentation resume interview tutor "
+    "study quiz story novel script podcast transcribe caption subtitle animation 3d"
+).split()
+QUERIES = ["image generator", "code review assistant", "podcast transcribe", "imag", "summarise notes", "logo"]
+
+
+def synthetic_tool(i: int) -> dict:
+    """Build one synthetic tool document."""
+    now = datetime.utcnow()
+    return {
+        "name": " ".join(random.sample(WORDS, 2)).title() + f" {i}",
+        "shortDescription": " ".join(random.choices(WORDS, k=12)),
+        "category": random.choice(CATEGORIES),
+        "pricingDisplay": "Free",
+        "pricingModel": "free",
+        "sourceUrl": f"https://example.com/tools/{i}",
+        "releasedAgo": "1 month ago",
+        "avgRating": round(random.uniform(0, 5), 2),
+        "reviewCount": 0,
+        "createdAt": now,
+        "updatedAt": now
+    }
+
+
+def report(label: str, latencies: list):
+    """Print p50/p95 latency in milliseconds."""
+    p50 = statistics.median(latencies)
+    p95 = statistics.quantiles(latencies, n=20)[18]
+    print(f"  {label:<32} p50 {p50:8.2f} ms   p95 {p95:8.2f} ms")
+
+
+def bench_index(tools: list, iterations: int):
+    """Time building and querying the in-memory index."""
+    index = ToolSearchIndex()
+    started = time.perf_counter()
+    for i, tool in enumerate(tools):
+        index.upsert({**tool, "_id": str(i)})
+    print(f"\n🧠 BM25 index: built {len(tools)} tools in {time.perf_counter() - started:.2f}s")
+    
+    for query in QUERIES:
+        latencies = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            index.search(query, limit=20)
+            latencies.append((time.perf_counter() - started) * 1000)
+        report(f"{query!r}", latencies)
+    
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        index.search("image generator", category="Images", minRating=4.0, limit=20)
+        latencies.append((time.perf_counter() - started) * 1000)
+    report("'image generator' + filters", latencies)
+
+
+async def bench_mongo(tools: list, iterations: int, page_size: int):
+    """Time $text count + find on a throwaway database."""
+    client = AsyncIOMotorClient(settings.MONGODB_URI, serverSelectionTimeoutMS=3000)
+    db = client[f"{settings.DATABASE_NAME}_benchmark"]
+    try:
+        await client.admin.command("ping")
+    except PyMongoError as e:
+        print(f"\n⚠️  MongoDB not reachable, skipping $text comparison: {e}")
+        return
+    
+    await db.tools.drop()
+    for start in range(0, len(tools), 10000):
+        await db.tools.insert_many([dict(tool) for tool in tools[start:start + 10000]])
+    await db.tools.create_index([("name", "text"), ("shortDescription", "text")])
+    print(f"\n🍃 MongoDB $text ({db.name})")
+    
+    for query in QUERIES:
+        latencies = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            filter_query = {"$text": {"$search": query}}
+            await db.tools.count_documents(filter_query)
+            await db.tools.find(filter_query).limit(page_size).to_list(length=page_size)
+            latencies.append((time.perf_counter() - started) * 1000)
+        report(f"{query!r}", latencies)
+    
+    await client.drop_database(db.name)
+    client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark BM25 index vs MongoDB $text")
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+    
+    random.seed(42)
+    catalog = [synthetic_tool(i) for i in range(args.size)]
+    bench_index(catalog, args.iterations)
+    asyncio.run(bench_mongo(catalog, args.iterations, args.page_size))
@@ -0,0 +1,164 @@
+"""
+Microbenchmark list response serialization on 100-item pages.
+Compares building models per document and returning them through
+FastAPI's response_model handling with the fast path (one TypeAdapter
+validation pass, serialized straight to JSON bytes), for tool and
+review pages, by driving both routes through ASGI.
+
+Usage: python benchmark_serialization.py --iterations 2000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime
+from bson import ObjectId
+from fastapi import FastAPI
+
+from app.models.review import ReviewListResponse, ReviewWithUserName
+from app.models.tool import Tool, ToolListResponse
+from app.utils.responses import document_list_adapter, json_response, validate_documents
+
+PAGE_SIZE = 100
+
+TOOL_LIST_ADAPTER = document_list_adapter(Tool)
+REVIEW_LIST_ADAPTER = document_list_adapter(ReviewWithUserName)
+
+app = FastAPI()
+
+
+def tool_doc(i: int) -> dict:
+    now = datetime.utcnow()
+    return {
+        "_id": ObjectId(),
+        "name": f"Synthetic Tool {i}",
+        "shortDescription": "A synthetic tool with a realistic length of description text " * 3,
+        "category": "Code",
+        "pricingDisplay": "Free + Paid",
+        "pricingModel": "free_plus_paid",
+        "officialUrl": f"https://example.com/tools/{i}",
+        "sourceUrl": f"https://source.example.com/tools/{i}",
+        "releasedAgo": "2 months ago",
+        "votes": i,
+        "ratingSeed": 4.5,
+        "avgRating": 4.2,
+        "reviewCount": 12,
+        "logoUrl": f"https://example.com/logos/{i}.png",
+        "createdAt": now,
+        "updatedAt": now
+    }
+
+
+def review_doc(i: int) -> dict:
+    now = datetime.utcnow()
+    return {
+        "_id": ObjectId(),
+        "toolId": str(ObjectId()),
+        "userId": str(ObjectId()),
+        "userName": f"User {i}",
+        "rating": 4,
+        "comment": "Works well for my use case, would recommend to others. " * 2,
+        "status": "approved",
+        "createdAt": now,
+        "updatedAt": now,
+        "moderatedBy": str(ObjectId()),
+        "moderationNote": None
+    }
+
+
+TOOLS = [tool_doc(i) for i in range(PAGE_SIZE)]
+REVIEWS = [review_doc(i) for i in range(PAGE_SIZE)]
+
+
+@app.get("/model/tools", response_model=ToolListResponse)
+async def tools_via_models():
+    items = []
+    for doc in [dict(doc) for doc in TOOLS]:
+        doc["id"] = str(doc.pop("_id"))
+        items.append(Tool(**doc))
+    return ToolListResponse(items=items, total=PAGE_SIZE, page=1, pageSize=PAGE_SIZE, totalPages=1)
+
+
+@app.get("/fast/tools", response_model=ToolListResponse)
+async def tools_fast_path():
+    items = validate_documents(TOOL_LIST_ADAPTER, [dict(doc) for doc in TOOLS])
+    return json_response(ToolListResponse(items=items, total=PAGE_SIZE, page=1, pageSize=PAGE_SIZE, totalPages=1))
+
+
+@app.get("/model/reviews", response_model=ReviewListResponse)
+async def reviews_via_models():
+    items = []
+    for doc in [dict(doc) for doc in REVIEWS]:
+        doc["id"] = str(doc.pop("_id"))
+        items.append(ReviewWithUserName(**doc))
+    return ReviewListResponse(items=items, total=PAGE_SIZE, page=1, pageSize=PAGE_SIZE)
+
+
+@app.get("/fast/reviews", response_model=ReviewListResponse)
+async def reviews_fast_path():
+    items = validate_documents(REVIEW_LIST_ADAPTER, [dict(doc) for doc in REVIEWS])
+    return json_response(ReviewListResponse(items=items, total=PAGE_SIZE, page=1, pageSize=PAGE_SIZE))
+
+
+async def call(path: str) -> bytes:
+    """Send one GET through the ASGI app and return the response body."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [],
+        "client": ("127.0.0.1", 1234),
+        "server": ("127.0.0.1", 8000)
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    body = []
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def time_path(path: str, iterations: int) -> list:
+    """Latency of each request in ms."""
+    latencies = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await call(path)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+async def main(iterations: int):
+    print(f"📄 {PAGE_SIZE}-item pages, {iterations} requests per path\n")
+    print(f"  {'page':<9} {'path':<8} {'p50 ms':>8} {'mean ms':>8} {'bytes':>7}")
+
+    for kind in ["tools", "reviews"]:
+        means = {}
+        for mode in ["model", "fast"]:
+            path = f"/{mode}/{kind}"
+            body = await call(path)
+            await time_path(path, 50)
+            latencies = await time_path(path, iterations)
+            means[mode] = statistics.mean(latencies)
+            print(f"  {kind:<9} {mode:<8} {statistics.median(latencies):>8.3f} {means[mode]:>8.3f} {len(body):>7}")
+        print(f"  {kind:<9} saving   {(1 - means['fast'] / means['model']) * 100:>7.0f}%\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark list response serialization")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,107 @@
+"""
+Check that every tool list sort option is served from an index.
+Seeds a synthetic catalog into a throwaway database, creates the app's
+indexes and explains the first and a keyset (cursor) page for each sort
+field, direction and filter shape, flagging plans with an in-memory SORT.
+Exits 1 if any plan that an index should serve sorts in memory, so it
+can run in CI.
+
+Usage: python explain_tool_sorts.py --size 100000
+"""
+import argparse
+import asyncio
+import sys
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from app.config import settings
+from app.models.tool import ToolSortField
+from app.services.migration_service import build_all_indexes
+from app.utils.pagination import build_sort, keyset_filter
+from benchmark_list_queries import seed
+
+# Filter shapes get_tools builds for the common sidebar selections
+FILTERS = {
+    "no filter": {},
+    "category": {"category": "Code"},
+    "pricingModel": {"pricingModel": "free"},
+    "category+pricing": {"category": "Code", "pricingModel": "free"},
+    "minRating": {"avgRating": {"$gte": 4.0}}
+}
+
+# Filters with a range on these fields; sorting them by another field is a
+# range + sort that no single index serves in order, so a SORT is expected
+RANGE_FIELDS = {"minRating": "avgRating"}
+
+
+def plan_stages(plan: dict) -> list:
+    """Flatten a winning plan into (stage, indexName) pairs, outermost first."""
+    stages = [(plan.get("stage"), plan.get("indexName"))]
+    for child in [plan.get("inputStage")] + plan.get("inputStages", []):
+        if child:
+            stages += plan_stages(child)
+    return stages
+
+
+async def explain(db, filter_query: dict, sort: list, page_size: int) -> list:
+    """Explain one page query and return its winning plan stages."""
+    result = await db.tools.find(filter_query).sort(sort).limit(page_size + 1).explain()
+    winning = result["queryPlanner"]["winningPlan"]
+    return plan_stages(winning.get("queryPlan", winning))
+
+
+async def main(size: int, page_size: int):
+    client = AsyncIOMotorClient(settings.MONGODB_URI)
+    db = client[f"{settings.DATABASE_NAME}_explain"]
+    print(f"Connected to MongoDB: {db.name}")
+
+    await seed(db, size)
+    await build_all_indexes(db)
+    print(f"📦 Catalog size: {size}\n")
+
+    in_memory_sorts = 0
+    expected_sorts = 0
+    for field in ToolSortField:
+        for descending in (True, False):
+            sort = build_sort(field.field, descending)
+            label = f"{field.field} {'desc' if descending else 'asc'}"
+
+            for name, filter_query in FILTERS.items():
+                # Explain a cursor page too: the keyset $or must keep the index order
+                first = await db.tools.find(filter_query).sort(sort).skip(page_size).limit(1).to_list(length=1)
+                queries = [("page 1", filter_query)]
+                if first:
+                    values = [first[0].get(sort_field) for sort_field, _ in sort]
+                    queries.append(("cursor", {**filter_query, **keyset_filter(sort, values)}))
+
+                range_field = RANGE_FIELDS.get(name)
+                sort_expected = range_field is not None and range_field != field.field
+
+                for kind, query in queries:
+                    stages = await explain(db, query, sort, page_size)
+                    has_sort = any(stage == "SORT" for stage, _ in stages)
+                    indexes = sorted({index for _, index in stages if index})
+                    if has_sort and sort_expected:
+                        expected_sorts += 1
+                        marker = "⚠️ SORT"
+                    else:
+                        in_memory_sorts += has_sort
+                        marker = "❌ SORT" if has_sort else "✅"
+                    print(f"  {label:<17} {name:<17} {kind:<7} {marker:<7} {', '.join(indexes) or 'COLLSCAN'}")
+
+    await client.drop_database(db.name)
+    client.close()
+    print(f"\nPlans with an unexpected in-memory SORT: {in_memory_sorts}")
+    print(f"Range + sort plans with an expected SORT: {expected_sorts}")
+    print("Explain database dropped")
+
+    # Only an unexpected SORT points at a missing index
+    sys.exit(1 if in_memory_sorts else 0)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Explain tool list sort queries")
+    parser.add_argument("--size", type=int, default=100000)
+    parser.add_argument("--page-size", type=int, default=20)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.size, args.page_size))
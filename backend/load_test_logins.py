@@ -0,0 +1,139 @@
+"""
+Load test: GET /tools latency while bursts of logins hash passwords.
+Seeds a throwaway database, then drives the app through ASGI (no server
+needed) with a steady stream of GET /tools requests, first alone and
+then alongside login bursts with the KDF run inline on the event loop
+and on the password hashing pool.
+
+Usage: python load_test_logins.py --burst 50 --duration 10
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from motor.motor_asyncio import AsyncIOMotorClient
+
+import app.database as database
+from app.config import settings
+from app.main import app
+from app.utils import auth
+from benchmark_list_queries import synthetic_tool
+
+USERS = 20
+PASSWORD = "load-test-password"
+
+
+async def asgi_request(method: str, path: str, body: dict = None) -> int:
+    """Send one request through the ASGI app and return the status code."""
+    raw_body = json.dumps(body).encode() if body is not None else b""
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(raw_body)).encode())],
+        "client": ("127.0.0.1", 1234),
+        "server": ("127.0.0.1", 8000)
+    }
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if sent:
+            await asyncio.sleep(3600)
+        sent = True
+        return {"type": "http.request", "body": raw_body, "more_body": False}
+
+    status_code = None
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    await app(scope, receive, send)
+    return status_code
+
+
+async def browse(stop: asyncio.Event) -> list:
+    """Request GET /tools back to back until stopped; return latencies in ms."""
+    latencies = []
+    while not stop.is_set():
+        started = time.perf_counter()
+        assert await asgi_request("GET", "/tools?pageSize=20&includeTotal=false") == 200
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+async def login_bursts(stop: asyncio.Event, burst: int):
+    """Fire `burst` concurrent logins, wait for them, repeat until stopped."""
+    while not stop.is_set():
+        await asyncio.gather(*(
+            asgi_request("POST", "/auth/login", {"email": f"loadtest{i % USERS}@example.com", "password": PASSWORD})
+            for i in range(burst)
+        ))
+
+
+async def run_scenario(duration: float, burst: int, browsers: int) -> list:
+    stop = asyncio.Event()
+    tasks = [asyncio.create_task(browse(stop)) for _ in range(browsers)]
+    if burst:
+        tasks.append(asyncio.create_task(login_bursts(stop, burst)))
+    await asyncio.sleep(duration)
+    stop.set()
+    results = await asyncio.gather(*tasks)
+    return [latency for result in results[:browsers] for latency in result]
+
+
+async def main(burst: int, duration: float, browsers: int):
+    client = AsyncIOMotorClient(settings.MONGODB_URI)
+    db = client[f"{settings.DATABASE_NAME}_loadtest"]
+    database.db.db = db
+    print(f"Connected to MongoDB: {db.name}")
+
+    await db.tools.drop()
+    await db.users.drop()
+    await db.tools.insert_many([synthetic_tool(i) for i in range(1000)])
+    password_hash = auth.hash_password(PASSWORD)
+    await db.users.insert_many([
+        {"name": f"Load Test {i}", "email": f"loadtest{i}@example.com", "password": password_hash, "role": "user"}
+        for i in range(USERS)
+    ])
+
+    pool = auth.password_executor
+    scenarios = [
+        ("no logins", 0, pool),
+        ("logins, KDF inline", burst, None),
+        ("logins, KDF on pool", burst, pool)
+    ]
+
+    print(f"\n{browsers} concurrent GET /tools clients, bursts of {burst} logins, {duration:.0f}s each")
+    print(f"  {'scenario':<22} {'requests':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, scenario_burst, executor in scenarios:
+        auth.password_executor = executor
+        latencies = await run_scenario(duration, scenario_burst, browsers)
+        p50 = statistics.median(latencies)
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        print(f"  {name:<22} {len(latencies):>9} {p50:>8.2f} {p99:>8.2f}")
+    auth.password_executor = pool
+
+    await client.drop_database(db.name)
+    client.close()
+    print("\nLoad test database dropped")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test GET /tools during login bursts")
+    parser.add_argument("--burst", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--browsers", type=int, default=4)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.burst, args.duration, args.browsers))
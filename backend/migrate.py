@@ -0,0 +1,56 @@
+"""
+Apply pending database migrations (indexes and data backfills).
+Run this script on deploy, or set MIGRATE_ON_STARTUP=false and rely on
+it exclusively. Use --status to list applied and pending migrations.
+"""
+import argparse
+import asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+import os
+
+from app.services.migration_service import MIGRATIONS, apply_migrations, get_applied_versions
+
+# Load environment variables
+load_dotenv()
+
+MONGODB_URI = os.getenv("MONGODB_URI")
+DATABASE_NAME = os.getenv("DATABASE_NAME", "ai_tools_discovery")
+
+
+async def migrate(status_only: bool):
+    """Show migration status or apply pending migrations."""
+
+    # Connect to MongoDB
+    client = AsyncIOMotorClient(MONGODB_URI)
+    db = client[DATABASE_NAME]
+
+    print(f"Connected to MongoDB: {DATABASE_NAME}")
+
+    if status_only:
+        applied = await get_applied_versions(db)
+        for migration in MIGRATIONS:
+            record = applied.get(migration.version)
+            state = f"applied {record['appliedAt']:%Y-%m-%d %H:%M}" if record else "pending"
+            print(f"  {migration.version:>3}  {migration.description:<45} {state}")
+    else:
+        def on_progress(migration, elapsed: float):
+            print(f"✅ {migration.version}: {migration.description} ({elapsed:.1f}s)")
+
+        applied = await apply_migrations(db, on_progress=on_progress)
+        if applied is None:
+            print("❌ Another process is applying migrations; try again later")
+        elif not applied:
+            print("Database is up to date")
+
+    # Close connection
+    client.close()
+    print("Database connection closed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply database migrations")
+    parser.add_argument("--status", action="store_true", help="List migrations without applying them")
+    args = parser.parse_args()
+
+    asyncio.run(migrate(args.status))
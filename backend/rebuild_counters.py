@@ -0,0 +1,40 @@
+"""
+Recount the list total counters from the tools and reviews collections.
+Run this script to repair counter drift after manual database edits;
+it is safe to run while the API is serving writes.
+"""
+import asyncio
+import time
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+import os
+
+from app.services.counter_service import rebuild_counters
+
+# Load environment variables
+load_dotenv()
+
+MONGODB_URI = os.getenv("MONGODB_URI")
+DATABASE_NAME = os.getenv("DATABASE_NAME", "ai_tools_discovery")
+
+
+async def recount():
+    """Overwrite every counter with an exact count."""
+    
+    # Connect to MongoDB
+    client = AsyncIOMotorClient(MONGODB_URI)
+    db = client[DATABASE_NAME]
+    
+    print(f"Connected to MongoDB: {DATABASE_NAME}")
+    
+    started = time.perf_counter()
+    written = await rebuild_counters(db)
+    print(f"✅ Recounted {written} counters in {time.perf_counter() - started:.2f}s")
+    
+    # Close connection
+    client.close()
+    print("Database connection closed")
+
+
+if __name__ == "__main__":
+    asyncio.run(recount())
@@ -0,0 +1,79 @@
+"""
+Rebuild tool ratings for the whole catalog.
+Run this script after seed imports or manual database edits to repair
+avgRating/reviewCount drift. Use --dry-run to print the differences first.
+Tools without approved reviews keep their avgRating (the seed rating of
+seeded tools) unless --reset-unreviewed is given.
+"""
+import argparse
+import asyncio
+import time
+from motor.motor_asyncio import AsyncIOMotorClient
+from dotenv import load_dotenv
+import os
+
+from app.services.rating_service import rebuild_all_ratings
+
+# Load environment variables
+load_dotenv()
+
+MONGODB_URI = os.getenv("MONGODB_URI")
+DATABASE_NAME = os.getenv("DATABASE_NAME", "ai_tools_discovery")
+
+
+async def rebuild_ratings(batch_size: int, dry_run: bool, reset_unreviewed: bool):
+    """Recompute ratings for every tool from approved reviews."""
+    
+    # Connect to MongoDB
+    client = AsyncIOMotorClient(MONGODB_URI)
+    db = client[DATABASE_NAME]
+    
+    print(f"Connected to MongoDB: {DATABASE_NAME}")
+    if dry_run:
+        print("Dry run: no changes will be written")
+    
+    started = time.perf_counter()
+    
+    def on_progress(scanned: int, changed: int):
+        print(f"  ...scanned {scanned} tools, {changed} differ")
+    
+    def on_change(tool: dict, rebuilt: dict):
+        if dry_run:
+            print(
+                f"  {tool['_id']} {tool.get('name', '')!r}: "
+                f"avgRating {tool.get('avgRating')} -> {rebuilt['avgRating']}, "
+                f"reviewCount {tool.get('reviewCount')} -> {rebuilt['reviewCount']}"
+            )
+    
+    result = await rebuild_all_ratings(
+        db,
+        batch_size=batch_size,
+        dry_run=dry_run,
+        on_progress=on_progress,
+        on_change=on_change,
+        reset_unreviewed=reset_unreviewed
+    )
+    
+    elapsed = time.perf_counter() - started
+    print(
+        f"✅ Scanned {result['scanned']} tools, {result['changed']} differed, "
+        f"{result['updated']} updated in {elapsed:.2f}s"
+    )
+    
+    # Close connection
+    client.close()
+    print("Database connection closed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild avgRating/reviewCount for all tools")
+    parser.add_argument("--dry-run", action="store_true", help="Show differences without writing them")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Tools per bulk write (default: 1000)")
+    parser.add_argument(
+        "--reset-unreviewed",
+        action="store_true",
+        help="Reset avgRating to 0.0 on tools without approved reviews (default: keep it)"
+    )
+    args = parser.parse_args()
+    
+    asyncio.run(rebuild_ratings(args.batch_size, args.dry_run, args.reset_unreviewed))
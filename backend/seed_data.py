@@ -9,6 +9,9 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 import os
 
+from app.services.counter_service import apply_counter_deltas, tool_counter_keys
+from app.services.rating_service import tool_rank_score
+
 # Load environment variables
 load_dotenv()
 
@@ -53,10 +56,13 @@ async def seed_tools():
             "ratingSeed": tool.get("rating"),  # Store original rating as ratingSeed
             "avgRating": tool.get("rating") or 0.0,  # Initialize avgRating
             "reviewCount": 0,  # No reviews yet
+            "ratingSum": 0,  # Running totals of approved reviews
+            "ratingCount": 0,
             "logoUrl": None,  # No logos in dummy data
             "createdAt": datetime.utcnow(),
             "updatedAt": datetime.utcnow()
         }
+        tool_doc["rankScore"] = tool_rank_score(tool_doc)  # Seeded tools rank by their seed rating
         
         tools_to_insert.append(tool_doc)
     
@@ -64,6 +70,13 @@ async def seed_tools():
     if tools_to_insert:
         result = await db.tools.insert_many(tools_to_insert)
         print(f"✅ Successfully inserted {len(result.inserted_ids)} tools into the database!")
+        
+        # Keep list totals in step with the inserted tools
+        deltas = {}
+        for tool_doc in tools_to_insert:
+            for key in tool_counter_keys(tool_doc):
+                deltas[key] = deltas.get(key, 0) + 1
+        await apply_counter_deltas(db, deltas)
     else:
         print("No tools to insert")
     
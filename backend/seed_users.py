@@ -8,6 +8,8 @@ from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 import os
 
+from app.utils.auth import hash_password
+
 # Load environment variables
 load_dotenv()
 
@@ -29,70 +31,70 @@ async def seed_users():
         {
             "name": "Rajesh Kumar",
             "email": "rajesh.kumar@example.com",
-            "password": "password123",
+            "password": hash_password("password123"),
             "role": "user",
             "createdAt": datetime.now()
         },
         {
             "name": "Priya Sharma",
             "email": "priya.sharma@example.com",
-            "password": "password123",
+            "password": hash_password("password123"),
             "role": "user",
             "createdAt": datetime.now()
         },
         {
             "name": "Amit Patel",
             "email": "amit.patel@example.com",
-            "password": "password123",
+            "password": hash_password("password123"),
             "role": "user",
             "createdAt": datetime.now()
         },
         {
             "name": "Sneha Reddy",
             "email": "sneha.reddy@example.com",
-            "password": "password123",
+            "password": hash_password("password123"),
             "role": "user",
             "createdAt": datetime.now()
         },
         {
             "name": "Vikram Singh",
             "email": "vikram.singh@example.com",
-            "password": "password123",
+            "password": hash_password("password123"),
             "role": "user",
             "createdAt": datetime.now()
         },
         {
             "name": "Ananya Iyer",
             "email": "ananya.iyer@example.com",
-            "password": "password123",
+            "password": hash_password("password123"),
             "role": "user",
             "createdAt": datetime.now()
         },
         {
             "name": "Arjun Gupta",
             "email": "arjun.gupta@example.com",
-            "password": "password123",
+            "password": hash_password("password123"),
             "role": "user",
             "createdAt": datetime.now()
         },
         {
             "name": "Kavya Nair",
             "email": "kavya.nair@example.com",
-            "password": "password123",
+            "password": hash_password("password123"),
             "role": "user",
             "createdAt": datetime.now()
         },
         {
             "name": "Rohan Mehta",
             "email": "rohan.mehta@example.com",
-            "password": "password123",
+            "password": hash_password("password123"),
             "role": "admin",  # One admin user
             "createdAt": datetime.now()
         },
         {
             "name": "Ishita Verma",
             "email": "ishita.verma@example.com",
-            "password": "password123",
+            "password": hash_password("password123"),
             "role": "user",
             "createdAt": datetime.now()
         }
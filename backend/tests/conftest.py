@@ -0,0 +1,90 @@
+import os
+
+# Settings are read at import time; keep tests off real secrets and slow hashing
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("PASSWORD_HASH_ITERATIONS", "1000")
+
+import pytest
+from fastapi.testclient import TestClient
+from mongomock import aggregate
+from mongomock_motor import AsyncMongoMockClient
+
+from app.database import get_database
+from app.main import app
+
+
+# mongomock lacks $round (MongoDB 4.2+), used by the rating update pipeline;
+# like MongoDB, Python rounds halves to even
+_handle_arithmetic_operator = aggregate._Parser._handle_arithmetic_operator
+
+
+def _handle_round(self, operator, values):
+    if operator == "$round":
+        number, places = self.parse_many(values)
+        return None if number is None else round(number, places)
+    return _handle_arithmetic_operator(self, operator, values)
+
+
+aggregate.arithmetic_operators.add("$round")
+aggregate._Parser._handle_arithmetic_operator = _handle_round
+
+
+class RecordingCollection:
+    """Collection wrapper recording the filter and projection of every read."""
+
+    def __init__(self, name: str, collection, reads: list):
+        self._name = name
+        self._collection = collection
+        self._reads = reads
+
+    def _record(self, method: str, filter, projection):
+        # Copied, since mongomock adds _id to the projection it is given
+        self._reads.append((self._name, method, filter, dict(projection) if projection else projection))
+        return dict(projection) if projection else projection
+
+    def find(self, filter=None, projection=None, *args, **kwargs):
+        return self._collection.find(filter, self._record("find", filter, projection), *args, **kwargs)
+
+    async def find_one(self, filter=None, projection=None, *args, **kwargs):
+        return await self._collection.find_one(filter, self._record("find_one", filter, projection), *args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._collection, name)
+
+
+class RecordingDatabase:
+    """Database wrapper handing out RecordingCollections."""
+
+    def __init__(self, db):
+        self._db = db
+        self.reads = []
+
+    def __getitem__(self, name):
+        return RecordingCollection(name, self._db[name], self.reads)
+
+    @property
+    def name(self) -> str:
+        return self._db.name
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self[name]
+
+    def reads_of(self, collection: str) -> list:
+        """(method, filter, projection) of each read on a collection."""
+        return [read[1:] for read in self.reads if read[0] == collection]
+
+
+@pytest.fixture
+def db():
+    """Empty in-memory database whose reads are recorded."""
+    return RecordingDatabase(AsyncMongoMockClient()["test"])
+
+
+@pytest.fixture
+def client(db):
+    """Test client using the recording database (lifespan tasks not started)."""
+    app.dependency_overrides[get_database] = lambda: db
+    yield TestClient(app)
+    app.dependency_overrides.clear()
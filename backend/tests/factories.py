@@ -0,0 +1,69 @@
+"""Documents inserted straight into the test database, and auth headers."""
+import asyncio
+from datetime import datetime
+
+from bson import ObjectId
+
+from app.utils.auth import create_access_token, hash_password
+
+
+def insert(db, collection: str, document: dict) -> str:
+    """Insert a document straight into the wrapped database and return its id."""
+    result = asyncio.run(db._db[collection].insert_one(document))
+    return str(result.inserted_id)
+
+
+def insert_tool(db, **fields) -> str:
+    now = datetime.utcnow()
+    return insert(db, "tools", {
+        "name": "Sketchpad",
+        "shortDescription": "Draws things",
+        "category": "Images",
+        "pricingDisplay": "Free",
+        "pricingModel": "free",
+        "officialUrl": None,
+        "sourceUrl": f"https://example.com/{ObjectId()}",
+        "releasedAgo": "1 day ago",
+        "votes": 10,
+        "ratingSeed": 4.0,
+        "avgRating": 4.0,
+        "reviewCount": 0,
+        "ratingSum": 0,
+        "ratingCount": 0,
+        "rankScore": 3.6,
+        "logoUrl": None,
+        "createdAt": now,
+        "updatedAt": now,
+        **fields
+    })
+
+
+def insert_user(db, password: str = "secret123", role: str = "user") -> str:
+    return insert(db, "users", {
+        "name": "Ada",
+        "email": f"{ObjectId()}@example.com",
+        "password": hash_password(password),
+        "role": role,
+        "createdAt": datetime.utcnow()
+    })
+
+
+def auth_headers(user_id: str, role: str = "user") -> dict:
+    token = create_access_token({"sub": user_id, "email": "ada@example.com", "role": role})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def insert_review(db, tool_id: str, user_id: str, **fields) -> str:
+    now = datetime.utcnow()
+    return insert(db, "reviews", {
+        "toolId": tool_id,
+        "toolName": "Sketchpad",
+        "userId": user_id,
+        "userName": "Ada",
+        "rating": 4,
+        "comment": "Draws nicely",
+        "status": "pending",
+        "createdAt": now,
+        "updatedAt": now,
+        **fields
+    })
@@ -0,0 +1,110 @@
+"""Token verification cache and password handling at login."""
+import asyncio
+from datetime import timedelta
+
+import pytest
+from bson import ObjectId
+from fastapi import HTTPException
+
+from app.config import settings
+from app.routers import auth as auth_router
+from app.utils import auth, cache
+from app.utils.auth import create_access_token, token_cache, verify_password, verify_token
+from factories import insert, insert_user
+
+
+@pytest.fixture(autouse=True)
+def empty_token_cache():
+    token_cache.clear()
+    yield
+    token_cache.clear()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Monotonic clock of the token cache, moved forward by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_cached_token_expires_with_the_token(clock):
+    token = create_access_token({"sub": "u1"}, expires_delta=timedelta(seconds=30))
+    assert verify_token(token)["sub"] == "u1"
+    assert token_cache.get(token)["sub"] == "u1"
+
+    # Well before TOKEN_CACHE_SECONDS, but past the token's exp
+    assert settings.TOKEN_CACHE_SECONDS > 31
+    clock[0] += 31
+    assert token_cache.get(token) is None
+
+
+def test_cached_tokens_expire_after_the_cache_ttl(clock):
+    token = create_access_token({"sub": "u1"}, expires_delta=timedelta(hours=1))
+    verify_token(token)
+
+    clock[0] += settings.TOKEN_CACHE_SECONDS - 1
+    assert token_cache.get(token) is not None
+    clock[0] += 2
+    assert token_cache.get(token) is None
+
+
+def test_expired_and_invalid_tokens_are_not_cached():
+    expired = create_access_token({"sub": "u1"}, expires_delta=timedelta(seconds=-1))
+    for token in (expired, "not-a-token"):
+        with pytest.raises(HTTPException):
+            verify_token(token)
+    assert len(token_cache) == 0
+
+
+def login(client, email: str, password: str):
+    return client.post("/auth/login", json={"email": email, "password": password})
+
+
+def stored_password(db, user_id: str) -> str:
+    return asyncio.run(db._db.users.find_one({"_id": ObjectId(user_id)}))["password"]
+
+
+def test_legacy_plain_text_password_is_rehashed_on_login(client, db):
+    user_id = insert(db, "users", {"name": "Ada", "email": "ada@example.com", "password": "secret123", "role": "user"})
+
+    assert login(client, "ada@example.com", "wrong").status_code == 401
+    assert stored_password(db, user_id) == "secret123"
+
+    assert login(client, "ada@example.com", "secret123").status_code == 200
+    rehashed = stored_password(db, user_id)
+    assert rehashed.startswith(f"pbkdf2_sha256${settings.PASSWORD_HASH_ITERATIONS}$")
+    assert verify_password("secret123", rehashed)
+    assert login(client, "ada@example.com", "secret123").status_code == 200
+
+
+def test_unknown_email_pays_for_a_password_check(client, db, monkeypatch):
+    checked = []
+    verify_password_async = auth_router.verify_password_async
+
+    async def record(plain_password, stored):
+        checked.append(stored)
+        return await verify_password_async(plain_password, stored)
+
+    monkeypatch.setattr(auth_router, "verify_password_async", record)
+    insert_user(db)
+
+    response = login(client, "nobody@example.com", "secret123")
+
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Incorrect email or password"
+    assert checked == [auth_router.DUMMY_PASSWORD_HASH]
+
+
+def test_dummy_hash_runs_the_full_kdf(monkeypatch):
+    iterations = []
+    pbkdf2_hmac = auth.hashlib.pbkdf2_hmac
+
+    def record(name, password, salt, rounds):
+        iterations.append(rounds)
+        return pbkdf2_hmac(name, password, salt, rounds)
+
+    monkeypatch.setattr(auth.hashlib, "pbkdf2_hmac", record)
+
+    assert not verify_password("secret123", auth_router.DUMMY_PASSWORD_HASH)
+    assert iterations == [settings.PASSWORD_HASH_ITERATIONS]
@@ -0,0 +1,68 @@
+"""Search and suggest indexes reload off the event loop without losing writes."""
+import asyncio
+
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+
+from app.services.search_index import ToolSearchIndex
+from app.services.suggest_index import SuggestIndex
+
+
+def make_tool(name: str) -> dict:
+    return {
+        "_id": ObjectId(),
+        "name": name,
+        "shortDescription": f"{name} for everyone",
+        "category": "Code",
+        "pricingModel": "free",
+        "votes": 1,
+        "avgRating": 4.0
+    }
+
+
+@pytest.fixture
+def mongo():
+    return AsyncMongoMockClient()["test"]
+
+
+@pytest.fixture
+def threads(monkeypatch):
+    """Names of the functions handed to asyncio.to_thread."""
+    calls = []
+    to_thread = asyncio.to_thread
+
+    async def record(function, *args, **kwargs):
+        calls.append(function.__name__)
+        return await to_thread(function, *args, **kwargs)
+
+    monkeypatch.setattr(asyncio, "to_thread", record)
+    return calls
+
+
+async def load_with_writes(index, db, added: dict, removed_id: str):
+    """Load the index while another request writes to it."""
+    loading = asyncio.create_task(index.load(db))
+    await asyncio.sleep(0)
+    index.upsert(added)
+    index.remove(removed_id)
+    await loading
+
+
+@pytest.mark.parametrize("index_class", [ToolSearchIndex, SuggestIndex])
+def test_load_builds_on_a_thread_and_replays_writes(mongo, threads, index_class):
+    stored = [make_tool("Paintbrush"), make_tool("Compiler")]
+    asyncio.run(mongo.tools.insert_many(stored))
+    index = index_class()
+
+    asyncio.run(load_with_writes(index, mongo, make_tool("Debugger"), str(stored[1]["_id"])))
+
+    assert threads == ["_build"]
+    assert index.ready
+    assert len(index) == 2
+    if index_class is ToolSearchIndex:
+        assert len(index.search("debugger")[0]) == 1
+        assert index.search("compiler") == ([], 0)
+    else:
+        assert [suggestion["label"] for suggestion in index.suggest("de")] == ["Debugger"]
+        assert index.suggest("comp") == []
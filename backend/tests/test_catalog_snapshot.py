@@ -0,0 +1,295 @@
+"""The catalog snapshot pages like fetch_page on MongoDB, also after patches."""
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from bson import ObjectId
+from mongomock_motor import AsyncMongoMockClient
+
+import app.routers.tools as tools_router
+import app.services.catalog_snapshot as snapshot_module
+from app.models.tool import ToolSortField
+from app.services.catalog_snapshot import CatalogSnapshot, _Columns, record_tool_deletion
+from app.services.list_service import fetch_page
+from app.services.response_cache import MemoryResponseBackend, ResponseCache
+from app.utils.pagination import DEFAULT_SORT, build_sort, decode_cursor, encode_cursor, keyset_filter
+
+CATEGORIES = ["Images", "Writing", "Code"]
+PRICING_MODELS = ["free", "paid", "subscription"]
+
+SORTS = [DEFAULT_SORT] + [
+    build_sort(field.field, descending)
+    for field in ToolSortField
+    for descending in (True, False)
+]
+
+FILTERS = [
+    (None, None, None),
+    ("Code", None, None),
+    (None, "paid", None),
+    ("Images", "free", None),
+    (None, None, 3.0),
+    ("Writing", None, 2.5),
+    ("Missing", None, None)
+]
+
+
+def make_tool(rng: random.Random, index: int) -> dict:
+    """Tool with ties and nulls in the sort fields, as real catalogs have."""
+    created = datetime(2024, 1, 1) + timedelta(days=rng.randrange(30))
+    return {
+        "_id": ObjectId(),
+        "name": f"Tool {rng.randrange(40):02d}",
+        "shortDescription": "A tool",
+        "category": rng.choice(CATEGORIES),
+        "pricingDisplay": "",
+        "pricingModel": rng.choice(PRICING_MODELS),
+        "sourceUrl": f"https://example.com/{index}",
+        "releasedAgo": "1 day ago",
+        "votes": rng.choice([None, 0, 5, 10, rng.randrange(100)]),
+        "ratingSeed": None,
+        "avgRating": rng.choice([0.0, 2.5, 3.0, 4.5, round(rng.uniform(0, 5), 2)]),
+        "reviewCount": rng.randrange(5),
+        "rankScore": rng.choice([None, 3.5, round(rng.uniform(0, 5), 4)]),
+        "createdAt": created,
+        "updatedAt": created
+    }
+
+
+@pytest.fixture
+def mongo():
+    return AsyncMongoMockClient()["test"]
+
+
+def seed(mongo, count: int, rng: random.Random) -> list:
+    tools = [make_tool(rng, index) for index in range(count)]
+    asyncio.run(mongo.tools.insert_many(tools))
+    return tools
+
+
+def filter_query(category, pricing_model, min_rating) -> dict:
+    query = {}
+    if category:
+        query["category"] = category
+    if pricing_model:
+        query["pricingModel"] = pricing_model
+    if min_rating is not None:
+        query["avgRating"] = {"$gte": min_rating}
+    return query
+
+
+def assert_pages_match(mongo, snapshot: CatalogSnapshot, page_size: int = 7):
+    """Compare the first page, a skipped page and a cursor page for every filter and sort."""
+    for category, pricing_model, min_rating in FILTERS:
+        query = filter_query(category, pricing_model, min_rating)
+        for sort in SORTS:
+            for skip in (0, page_size * 2):
+                expected, expected_total = asyncio.run(fetch_page(mongo, "tools", query, sort, skip, page_size))
+                docs, total = snapshot.page(category, pricing_model, min_rating, sort, skip, page_size)
+                assert [doc["_id"] for doc in docs] == [doc["_id"] for doc in expected], (query, sort, skip)
+                assert total == expected_total, (query, sort)
+
+            first, _ = snapshot.page(category, pricing_model, min_rating, sort, 0, page_size)
+            if not first:
+                continue
+            after = [first[-1].get(field) for field, _ in sort]
+            expected, _ = asyncio.run(fetch_page(
+                mongo, "tools", query, sort, 0, page_size,
+                include_total=False, page_filter=keyset_filter(sort, after)
+            ))
+            docs, _ = snapshot.page(category, pricing_model, min_rating, sort, 0, page_size, after=after, include_total=False)
+            assert [doc["_id"] for doc in docs] == [doc["_id"] for doc in expected], (query, sort, "cursor")
+
+
+def ids_by_order(columns: _Columns) -> dict:
+    """Permutations and rating columns as tool ids, independent of row numbers."""
+    codes = {code: name for name, code in columns.category_codes.items()}
+    pricing = {code: name for name, code in columns.pricing_codes.items()}
+    orders = {
+        (field, codes.get(category), pricing.get(pricing_model)): [columns.docs[row]["_id"] for row in order]
+        for (field, category, pricing_model), order in columns.orders.items()
+        if order
+    }
+    ratings = {
+        (codes.get(category), pricing.get(pricing_model)): list(rated)
+        for (category, pricing_model), rated in columns.sorted_ratings.items()
+        if rated
+    }
+    return {"orders": orders, "ratings": ratings}
+
+
+def test_pages_match_fetch_page(mongo):
+    seed(mongo, 120, random.Random(1))
+    snapshot = CatalogSnapshot()
+    asyncio.run(snapshot.load(mongo))
+
+    assert snapshot.ready
+    assert_pages_match(mongo, snapshot)
+
+
+def test_patched_columns_equal_a_rebuild():
+    rng = random.Random(2)
+    tools = {str(tool["_id"]): tool for tool in (make_tool(rng, index) for index in range(80))}
+    columns = _Columns(tools.values())
+
+    for step in range(200):
+        tool_id = rng.choice(list(tools))
+        if step % 5 == 0:
+            columns.remove(tool_id)
+            del tools[tool_id]
+        elif step % 5 == 1:
+            tool = make_tool(rng, 1000 + step)
+            columns.upsert(tool)
+            tools[str(tool["_id"])] = tool
+        else:
+            # Moves between groups and positions, including to a new category
+            changed = {**make_tool(rng, step), "_id": tools[tool_id]["_id"]}
+            if step % 7 == 0:
+                changed["category"] = f"New {step % 3}"
+            columns.upsert(changed)
+            tools[tool_id] = changed
+
+    assert len(columns) == len(tools)
+    assert ids_by_order(columns) == ids_by_order(_Columns(tools.values()))
+
+
+def test_refresh_patches_modified_and_deleted_tools(mongo):
+    rng = random.Random(3)
+    tools = seed(mongo, 200, rng)
+    snapshot = CatalogSnapshot()
+    asyncio.run(snapshot.load(mongo))
+    built = snapshot._columns
+
+    later = datetime(2025, 1, 1)
+    for tool in tools[:4]:
+        changed = {**make_tool(rng, 0), "_id": tool["_id"], "sourceUrl": tool["sourceUrl"], "updatedAt": later}
+        asyncio.run(mongo.tools.replace_one({"_id": tool["_id"]}, changed))
+    asyncio.run(mongo.tools.delete_one({"_id": tools[5]["_id"]}))
+    snapshot.tool_deleted(str(tools[5]["_id"]))
+    assert not snapshot.ready
+
+    asyncio.run(snapshot.refresh(mongo))
+
+    # Few changes are patched into the same columns rather than rebuilt
+    assert snapshot._columns is built
+    assert snapshot.ready
+    assert len(snapshot) == 199
+    assert_pages_match(mongo, snapshot)
+
+
+def test_refresh_rebuilds_after_many_changes(mongo, monkeypatch):
+    tools = seed(mongo, 40, random.Random(4))
+    snapshot = CatalogSnapshot()
+    asyncio.run(snapshot.load(mongo))
+    built = snapshot._columns
+
+    monkeypatch.setattr(snapshot_module, "REBUILD_FRACTION", 0.0)
+    asyncio.run(mongo.tools.update_one({"_id": tools[0]["_id"]}, {"$set": {"votes": 999, "updatedAt": datetime(2025, 1, 1)}}))
+    asyncio.run(snapshot.refresh(mongo))
+
+    assert snapshot._columns is not built
+    assert_pages_match(mongo, snapshot)
+
+
+def test_rating_change_is_applied_without_leaving_service(mongo):
+    tools = seed(mongo, 50, random.Random(5))
+    snapshot = CatalogSnapshot()
+    asyncio.run(snapshot.load(mongo))
+    tool_id = tools[7]["_id"]
+
+    asyncio.run(mongo.tools.update_one({"_id": tool_id}, {"$set": {"avgRating": 5.0, "reviewCount": 9, "rankScore": 4.9}}))
+    snapshot.update_rating(str(tool_id), 5.0, 9, 4.9)
+
+    assert snapshot.ready
+    assert_pages_match(mongo, snapshot)
+
+
+def test_rating_change_of_unknown_tool_waits_for_the_poll(mongo):
+    seed(mongo, 10, random.Random(6))
+    snapshot = CatalogSnapshot()
+    asyncio.run(snapshot.load(mongo))
+
+    snapshot.update_rating(str(ObjectId()), 4.0, 1, 3.8)
+
+    assert not snapshot.ready
+
+
+def test_cursor_from_encode_cursor_pages_like_mongo(mongo):
+    seed(mongo, 60, random.Random(7))
+    snapshot = CatalogSnapshot()
+    asyncio.run(snapshot.load(mongo))
+    sort = build_sort("createdAt", descending=True)
+
+    docs, _ = snapshot.page(None, None, None, sort, 0, 10)
+    cursor = encode_cursor(docs[-1], sort)
+    after = decode_cursor(cursor, sort)
+
+    expected, _ = asyncio.run(fetch_page(mongo, "tools", {}, sort, 0, 10, include_total=False, page_filter=keyset_filter(sort, after)))
+    page, _ = snapshot.page(None, None, None, sort, 0, 10, after=after, include_total=False)
+    assert [doc["_id"] for doc in page] == [doc["_id"] for doc in expected]
+
+
+class SharedBackend(MemoryResponseBackend):
+    """In-process stand-in for the Redis backend all workers share."""
+    shared = True
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    cache = ResponseCache(SharedBackend(maxsize=100, ttl=60))
+    monkeypatch.setattr(snapshot_module, "response_cache", cache)
+    monkeypatch.setattr(tools_router, "response_cache", cache)
+    return cache
+
+
+def test_refresh_drops_tools_deleted_by_another_worker(mongo):
+    tools = seed(mongo, 30, random.Random(8))
+    snapshot = CatalogSnapshot()
+    asyncio.run(snapshot.load(mongo))
+
+    # Deleted elsewhere: this snapshot's tool_deleted is never called
+    tool_id = str(tools[3]["_id"])
+    asyncio.run(mongo.tools.delete_one({"_id": tools[3]["_id"]}))
+    asyncio.run(record_tool_deletion(mongo, tool_id))
+    asyncio.run(snapshot.refresh(mongo))
+
+    assert len(snapshot) == 29
+    assert snapshot._columns.get(tool_id) is None
+    assert_pages_match(mongo, snapshot)
+
+
+def test_snapshot_behind_the_shared_generation_is_not_served(mongo, shared_cache):
+    seed(mongo, 10, random.Random(9))
+    snapshot = CatalogSnapshot()
+    asyncio.run(snapshot.load(mongo))
+    assert snapshot.serves(asyncio.run(shared_cache.generation()))
+
+    # Another worker writes and bumps the shared generation
+    asyncio.run(shared_cache.backend.bump())
+    generation = asyncio.run(shared_cache.generation())
+    assert not snapshot.serves(generation)
+
+    asyncio.run(snapshot.refresh(mongo))
+    assert snapshot.serves(generation)
+
+
+def test_lagging_snapshot_does_not_fill_the_shared_cache(client, db, shared_cache, monkeypatch):
+    tools = seed(db._db, 10, random.Random(10))
+    snapshot = CatalogSnapshot()
+    asyncio.run(snapshot.load(db._db))
+    monkeypatch.setattr(tools_router, "catalog_snapshot", snapshot)
+
+    # Another worker renames a tool; this worker has not polled yet
+    asyncio.run(db._db.tools.update_one({"_id": tools[0]["_id"]}, {"$set": {"name": "Renamed"}}))
+    asyncio.run(shared_cache.backend.bump())
+
+    response = client.get("/tools", params={"pageSize": 100})
+    assert response.status_code == 200
+    names = {item["_id"]: item["name"] for item in response.json()["items"]}
+    assert names[str(tools[0]["_id"])] == "Renamed"
+
+    # The page cached under the new generation is the fresh one
+    cached = client.get("/tools", params={"pageSize": 100})
+    assert cached.content == response.content
+    assert shared_cache.hits == 1
@@ -0,0 +1,122 @@
+"""List total counters are exact once seeded, even with writes during the seeding."""
+import asyncio
+from datetime import datetime
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from app.services import counter_service
+from app.services.counter_service import (
+    COUNTERS_MIGRATION,
+    apply_counter_deltas,
+    counter_filter,
+    counter_key_for_filter,
+    get_total,
+    rebuild_counters,
+    tool_counter_keys
+)
+from app.services.migration_service import MIGRATIONS, MIGRATIONS_COLLECTION
+
+
+@pytest.fixture
+def mongo(monkeypatch):
+    monkeypatch.setattr(counter_service, "_seeded_databases", set())
+    return AsyncMongoMockClient()["counters"]
+
+
+def add_tool(db, category: str = "Code") -> dict:
+    """Insert a tool and count it, as the admin routes do."""
+    tool = {"name": "Tool", "category": category, "pricingModel": "free"}
+    asyncio.run(db.tools.insert_one(tool))
+    asyncio.run(apply_counter_deltas(db, {key: 1 for key in tool_counter_keys(tool)}))
+    return tool
+
+
+def record_seeding(db):
+    asyncio.run(db[MIGRATIONS_COLLECTION].insert_one({"_id": COUNTERS_MIGRATION, "appliedAt": datetime.utcnow()}))
+
+
+def counter(db, key: str) -> int:
+    return asyncio.run(db.counters.find_one({"_id": key}))["value"]
+
+
+class CountThenWrite:
+    """Database whose tools aggregation is followed by another writer's insert."""
+
+    def __init__(self, db, category: str):
+        self._db = db
+        self._category = category
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+    def __getitem__(self, name):
+        return self._db[name]
+
+    @property
+    def tools(self):
+        outer = self
+
+        class Tools:
+            def __getattr__(self, name):
+                return getattr(outer._db.tools, name)
+
+            async def aggregate(self, pipeline):
+                async for group in outer._db.tools.aggregate(pipeline):
+                    yield group
+                # Lands after the count, before the counters are written
+                await outer._db.tools.insert_one({"name": "Late", "category": outer._category, "pricingModel": "free"})
+                await apply_counter_deltas(outer._db, {"tools": 1, f"tools:category:{outer._category}": 1, "tools:pricingModel:free": 1})
+
+        return Tools()
+
+
+def test_totals_ignore_counters_until_seeding_is_recorded(mongo):
+    asyncio.run(mongo.tools.insert_many([{"category": "Code", "pricingModel": "free"} for _ in range(3)]))
+
+    # A write before the seeding migration creates a partial counter
+    add_tool(mongo)
+    assert counter(mongo, "tools") == 1
+    assert asyncio.run(get_total(mongo, "tools", {})) == 4
+
+    asyncio.run(rebuild_counters(mongo))
+    record_seeding(mongo)
+    # Counters are now trusted: a stale value shows that the counter is read
+    asyncio.run(mongo.counters.update_one({"_id": "tools"}, {"$set": {"value": 40}}))
+    assert asyncio.run(get_total(mongo, "tools", {})) == 40
+
+
+def test_rebuild_keeps_writes_made_while_counting(mongo):
+    add_tool(mongo)
+    add_tool(mongo)
+    # Drifted and missing counters are both repaired
+    asyncio.run(mongo.counters.update_one({"_id": "tools"}, {"$set": {"value": 7}}))
+    asyncio.run(mongo.counters.update_one({"_id": "tools:category:Gone"}, {"$set": {"value": 2}}, upsert=True))
+
+    asyncio.run(rebuild_counters(CountThenWrite(mongo, "Fresh")))
+
+    assert counter(mongo, "tools") == 3
+    assert counter(mongo, "tools:category:Code") == 2
+    assert counter(mongo, "tools:category:Fresh") == 1
+    assert counter(mongo, "tools:category:Gone") == 0
+    assert counter(mongo, "tools:pricingModel:free") == 3
+
+
+def test_counter_filter_inverts_counter_keys():
+    filters = [
+        ("tools", {}),
+        ("tools", {"category": "Code: Assistants"}),
+        ("tools", {"pricingModel": "free"}),
+        ("reviews", {}),
+        ("reviews", {"status": "pending"}),
+        ("reviews", {"userId": "u1"}),
+        ("reviews", {"toolId": "t1", "status": "approved"})
+    ]
+    for collection, filter_query in filters:
+        assert counter_filter(counter_key_for_filter(collection, filter_query)) == (collection, filter_query)
+
+
+def test_seeding_migration_version_matches():
+    migration = next(migration for migration in MIGRATIONS if migration.version == COUNTERS_MIGRATION)
+    assert migration.run is rebuild_counters
+    assert counter_service.MIGRATIONS_COLLECTION == MIGRATIONS_COLLECTION
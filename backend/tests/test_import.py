@@ -0,0 +1,179 @@
+"""Bulk tool import: splitting the stream, batching side effects and upsert races."""
+import asyncio
+import json
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+from pymongo.errors import BulkWriteError
+
+from app.services import catalog_sync
+from app.services.import_service import DUPLICATE_KEY, JsonDocumentSplitter, import_tools
+
+
+def tool_line(index: int, name: str = None) -> dict:
+    return {
+        "name": name or f"Tool {index}",
+        "shortDescription": "Does things",
+        "category": "Code",
+        "pricingDisplay": "Free",
+        "pricingModel": "free",
+        "sourceUrl": f"https://example.com/{index}",
+        "releasedAgo": "1 day ago"
+    }
+
+
+async def stream(*chunks: str):
+    for chunk in chunks:
+        yield chunk.encode()
+
+
+def ndjson(tools) -> str:
+    return "".join(json.dumps(tool) + "\n" for tool in tools)
+
+
+@pytest.fixture
+def mongo():
+    return AsyncMongoMockClient()["test"]
+
+
+class Invalidations:
+    """Stand-in for the response cache counting invalidations."""
+
+    def __init__(self):
+        self.count = 0
+
+    def invalidate(self):
+        self.count += 1
+
+
+def test_batch_invalidates_caches_once(mongo, monkeypatch):
+    invalidations = Invalidations()
+    monkeypatch.setattr(catalog_sync, "response_cache", invalidations)
+
+    summary = asyncio.run(import_tools(mongo, stream(ndjson(tool_line(i) for i in range(25))), batch_size=10))
+
+    assert summary["inserted"] == 25
+    # One per bulk write, not one per tool
+    assert invalidations.count == 3
+
+
+def test_renames_reach_reviews_in_one_bulk_write(mongo, monkeypatch):
+    monkeypatch.setattr(catalog_sync, "response_cache", Invalidations())
+    asyncio.run(import_tools(mongo, stream(ndjson(tool_line(i) for i in range(3)))))
+    tools = asyncio.run(mongo.tools.find({}, {"name": 1}).to_list(None))
+    asyncio.run(mongo.reviews.insert_many([
+        {"toolId": str(tool["_id"]), "toolName": tool["name"]} for tool in tools for _ in range(2)
+    ]))
+
+    writes = []
+    bulk_write = type(mongo.reviews).bulk_write
+
+    async def record_bulk_write(self, operations, *args, **kwargs):
+        if self.name == "reviews":
+            writes.append(len(operations))
+        return await bulk_write(self, operations, *args, **kwargs)
+
+    monkeypatch.setattr(type(mongo.reviews), "bulk_write", record_bulk_write)
+    renamed = [tool_line(0, "Renamed 0"), tool_line(1, "Renamed 1"), tool_line(2)]
+    summary = asyncio.run(import_tools(mongo, stream(ndjson(renamed))))
+
+    assert summary["updated"] == 3
+    assert writes == [2]
+    names = sorted(review["toolName"] for review in asyncio.run(mongo.reviews.find({}).to_list(None)))
+    assert names == ["Renamed 0", "Renamed 0", "Renamed 1", "Renamed 1", "Tool 2", "Tool 2"]
+
+
+def split(text: str, chunk_size: int) -> list:
+    """Feed text to a splitter in fixed-size chunks and collect every result."""
+    splitter = JsonDocumentSplitter()
+    results = []
+    for start in range(0, len(text), chunk_size):
+        results += splitter.feed(text[start:start + chunk_size])
+    return results + splitter.feed("", final=True)
+
+
+TRICKY_DOCUMENTS = [
+    {"name": "Brackets ] and braces } in a string, with a comma,", "tags": [[1, [2]], []]},
+    {"name": "Escaped \\\" quote and \\n newline", "nested": {"list": [{"a": "]"}]}},
+    {"name": "Unicode \u00e9\u2603", "values": [True, None, -1.5e3]}
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1000])
+@pytest.mark.parametrize("encode", [
+    lambda documents: json.dumps(documents, indent=2),
+    lambda documents: ndjson(documents)
+], ids=["array", "ndjson"])
+def test_splitter_finds_documents_across_chunk_boundaries(chunk_size, encode):
+    results = split(encode(TRICKY_DOCUMENTS), chunk_size)
+    assert [document for _, document in results] == TRICKY_DOCUMENTS
+
+
+def test_splitter_reports_lines_of_rejected_ndjson_rows():
+    text = '{"a": 1}\n\n{"a": 2\n{"a": 3}\nnot json\n[1, 2]\n'
+    results = split(text, 4)
+
+    assert [line for line, _ in results] == [1, 3, 4, 5, 6]
+    assert [isinstance(document, ValueError) for _, document in results] == [False, True, False, True, False]
+    # Only a stream starting with "[" is a JSON array; later arrays are rows
+    assert results[-1][1] == [1, 2]
+
+
+def test_splitter_reports_start_lines_in_an_array():
+    text = '[\n  {\n    "a": 1\n  },\n  {"a": 2},\n\n  {"a": 3}\n]'
+    assert [(line, document) for line, document in split(text, 5)] == [(2, {"a": 1}), (5, {"a": 2}), (7, {"a": 3})]
+
+
+def test_malformed_array_ends_the_stream():
+    results = split('[{"a": 1}, {"a": oops}, {"a": 3}]', 4)
+
+    assert results[0] == (1, {"a": 1})
+    assert len(results) == 2
+    assert isinstance(results[1][1], ValueError)
+
+
+def test_import_reports_line_numbers_of_rejected_rows(mongo, monkeypatch):
+    monkeypatch.setattr(catalog_sync, "response_cache", Invalidations())
+    lines = [json.dumps(tool_line(0)), "{broken", json.dumps({"name": "No source"}), "[]", json.dumps(tool_line(4))]
+
+    summary = asyncio.run(import_tools(mongo, stream("\n".join(lines))))
+
+    assert (summary["received"], summary["inserted"], summary["failed"]) == (5, 2, 3)
+    assert [error["line"] for error in summary["errors"]] == [2, 3, 4]
+    assert summary["errors"][2]["error"] == "Expected a JSON object"
+
+
+def test_sourceurl_inserted_concurrently_is_retried_as_an_update(mongo, monkeypatch):
+    monkeypatch.setattr(catalog_sync, "response_cache", Invalidations())
+    asyncio.run(mongo.tools.create_index("sourceUrl", unique=True))
+
+    tools = type(mongo.tools)
+    bulk_write = tools.bulk_write
+    writes = []
+
+    async def racing_bulk_write(self, operations, *args, **kwargs):
+        if self.name != "tools":
+            return await bulk_write(self, operations, *args, **kwargs)
+        writes.append(len(operations))
+        if len(writes) > 1:
+            return await bulk_write(self, operations, *args, **kwargs)
+        # Another import stores the last tool after our lookup, so our
+        # upsert misses its filter and then fails the unique index
+        await self.insert_one({**tool_line(2, "Other import"), "createdAt": None})
+        result = await bulk_write(self, operations[:-1], *args, **kwargs)
+        raise BulkWriteError({
+            "writeErrors": [{"index": len(operations) - 1, "code": DUPLICATE_KEY, "errmsg": "E11000"}],
+            "upserted": [{"index": index, "_id": _id} for index, _id in result.upserted_ids.items()],
+            "nMatched": result.matched_count
+        })
+
+    monkeypatch.setattr(tools, "bulk_write", racing_bulk_write)
+    summary = asyncio.run(import_tools(mongo, stream(ndjson(tool_line(i) for i in range(3)))))
+
+    assert (summary["inserted"], summary["updated"], summary["failed"]) == (2, 1, 0)
+    # Only the raced tool is written again
+    assert writes == [3, 1]
+    stored = asyncio.run(mongo.tools.find({}).to_list(None))
+    assert sorted(tool["name"] for tool in stored) == ["Tool 0", "Tool 1", "Tool 2"]
+    raced = next(tool for tool in stored if tool["name"] == "Tool 2")
+    assert raced["createdAt"] is None
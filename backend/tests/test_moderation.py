@@ -0,0 +1,200 @@
+"""Moderating reviews keeps tool ratings, counters and review pages exact."""
+import asyncio
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+
+from app.routers import admin_reviews
+from app.services.rating_service import rank_score
+from factories import auth_headers, insert_review, insert_tool, insert_user
+
+
+def admin_headers(db) -> dict:
+    return auth_headers(insert_user(db, role="admin"), role="admin")
+
+
+def test_note_on_approved_review_changes_the_review_page_etag(client, db):
+    tool_id = insert_tool(db, reviewsModifiedAt=datetime.utcnow() - timedelta(days=1))
+    review_id = insert_review(db, tool_id, insert_user(db), status="approved")
+    headers = admin_headers(db)
+
+    first = client.get(f"/tools/{tool_id}/reviews")
+    etag = first.headers["ETag"]
+    assert client.get(f"/tools/{tool_id}/reviews", headers={"If-None-Match": etag}).status_code == 304
+
+    response = client.patch(
+        f"/admin/reviews/{review_id}",
+        json={"status": "approved", "moderationNote": "Checked twice"},
+        headers=headers
+    )
+    assert response.status_code == 200
+
+    second = client.get(f"/tools/{tool_id}/reviews", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != etag
+    assert second.json()["items"][0]["moderationNote"] == "Checked twice"
+
+
+def test_bulk_reapproval_changes_the_review_page_etag(client, db):
+    tool_id = insert_tool(db, reviewsModifiedAt=datetime.utcnow() - timedelta(days=1))
+    review_id = insert_review(db, tool_id, insert_user(db), status="approved")
+
+    etag = client.get(f"/tools/{tool_id}/reviews").headers["ETag"]
+    response = client.patch(
+        "/admin/reviews/bulk",
+        json={"ids": [review_id], "status": "approved", "moderationNote": "Still fine"},
+        headers=admin_headers(db)
+    )
+    assert response.json()["updated"] == 1
+
+    second = client.get(f"/tools/{tool_id}/reviews", headers={"If-None-Match": etag})
+    assert second.status_code == 200
+    assert second.json()["items"][0]["moderationNote"] == "Still fine"
+
+
+def tool_totals(db, tool_id: str) -> dict:
+    tool = asyncio.run(db._db.tools.find_one({"_id": ObjectId(tool_id)}))
+    return {field: tool[field] for field in ("ratingSum", "ratingCount", "avgRating", "reviewCount", "rankScore")}
+
+
+def expected_totals(db, tool_id: str, ratings: list) -> dict:
+    """Totals recomputed from scratch for the given approved ratings."""
+    tool = asyncio.run(db._db.tools.find_one({"_id": ObjectId(tool_id)}))
+    avg_rating = round(sum(ratings) / len(ratings), 2) if ratings else 0.0
+    return {
+        "ratingSum": sum(ratings),
+        "ratingCount": len(ratings),
+        "avgRating": avg_rating,
+        "reviewCount": len(ratings),
+        "rankScore": rank_score(tool["ratingSeed"], tool["votes"], avg_rating, len(ratings))
+    }
+
+
+def test_approve_reject_round_trips_keep_rating_totals_exact(client, db):
+    tool_id = insert_tool(db)
+    ratings = {insert_review(db, tool_id, insert_user(db), rating=rating): rating for rating in (5, 4, 2)}
+    headers = admin_headers(db)
+
+    def moderate(review_id: str, new_status: str):
+        response = client.patch(f"/admin/reviews/{review_id}", json={"status": new_status}, headers=headers)
+        assert response.status_code == 200
+
+    for review_id in ratings:
+        moderate(review_id, "approved")
+    assert tool_totals(db, tool_id) == expected_totals(db, tool_id, [5, 4, 2])
+
+    first, second, third = ratings
+    moderate(second, "rejected")
+    assert tool_totals(db, tool_id) == expected_totals(db, tool_id, [5, 2])
+
+    # Repeating a moderation changes nothing
+    moderate(second, "rejected")
+    moderate(first, "approved")
+    assert tool_totals(db, tool_id) == expected_totals(db, tool_id, [5, 2])
+
+    moderate(second, "approved")
+    moderate(first, "rejected")
+    moderate(third, "rejected")
+    assert tool_totals(db, tool_id) == expected_totals(db, tool_id, [4])
+
+    moderate(second, "rejected")
+    assert tool_totals(db, tool_id) == expected_totals(db, tool_id, [])
+
+
+def counters(db) -> dict:
+    return {counter["_id"]: counter["value"] for counter in asyncio.run(db._db.counters.find({}).to_list(None))}
+
+
+def test_bulk_moderation_aggregates_deltas_per_tool(client, db, monkeypatch):
+    user_id = insert_user(db)
+    first_tool = insert_tool(db, ratingSum=4, ratingCount=1, reviewCount=1)
+    second_tool = insert_tool(db)
+    pending_five = insert_review(db, first_tool, user_id, rating=5)
+    pending_three = insert_review(db, first_tool, user_id, rating=3)
+    approved = insert_review(db, first_tool, user_id, status="approved")
+    rejected = insert_review(db, second_tool, user_id, status="rejected", rating=2)
+    missing = str(ObjectId())
+
+    rating_updates = []
+    apply_rating_delta = admin_reviews.apply_rating_delta
+
+    async def record_rating_delta(db, tool_id, rating_delta, count_delta):
+        rating_updates.append((tool_id, rating_delta, count_delta))
+        return await apply_rating_delta(db, tool_id, rating_delta, count_delta)
+
+    monkeypatch.setattr(admin_reviews, "apply_rating_delta", record_rating_delta)
+
+    # Mixed statuses, a duplicate, one already approved, and ids that do not resolve
+    ids = [pending_five, pending_three, approved, rejected, pending_five, "not-an-id", missing]
+    response = client.patch(
+        "/admin/reviews/bulk",
+        json={"ids": ids, "status": "approved"},
+        headers=admin_headers(db)
+    )
+    assert response.status_code == 200
+
+    body = response.json()
+    assert body["updated"] == 4
+    assert [result["result"] for result in body["results"]] == [
+        "updated", "updated", "updated", "updated", "updated", "invalid_id", "not_found"
+    ]
+
+    # One rating update per tool; the already approved review adds nothing
+    assert sorted(rating_updates) == sorted([(first_tool, 8, 2), (second_tool, 2, 1)])
+    assert tool_totals(db, first_tool) == expected_totals(db, first_tool, [4, 5, 3])
+    assert tool_totals(db, second_tool) == expected_totals(db, second_tool, [2])
+
+    # Counters only record the moves; net-zero keys are not written
+    assert counters(db) == {
+        "reviews:status:pending": -2,
+        "reviews:status:rejected": -1,
+        "reviews:status:approved": 3,
+        f"reviews:tool:{first_tool}:approved": 2,
+        f"reviews:tool:{second_tool}:approved": 1
+    }
+
+
+def test_bulk_moderation_skips_reviews_moderated_concurrently(client, db, monkeypatch):
+    user_id = insert_user(db)
+    tool_id = insert_tool(db)
+    kept = insert_review(db, tool_id, user_id, rating=5)
+    raced = insert_review(db, tool_id, user_id, rating=1)
+
+    filters = []
+    reviews = type(db._db.reviews)
+    bulk_write = reviews.bulk_write
+
+    async def moderate_first(self, operations, *args, **kwargs):
+        if self.name == "reviews":
+            filters.extend(operation._filter for operation in operations)
+            # Another moderator rejects a review between the read and the write
+            await self.update_one(
+                {"_id": ObjectId(raced)},
+                {"$set": {"status": "rejected", "moderatedBy": "someone-else"}}
+            )
+        return await bulk_write(self, operations, *args, **kwargs)
+
+    monkeypatch.setattr(reviews, "bulk_write", moderate_first)
+    response = client.patch(
+        "/admin/reviews/bulk",
+        json={"ids": [kept, raced], "status": "approved"},
+        headers=admin_headers(db)
+    )
+
+    # Each update is conditional on the status that was read
+    assert sorted(filters, key=lambda filter: str(filter["_id"])) == sorted([
+        {"_id": ObjectId(kept), "status": "pending"},
+        {"_id": ObjectId(raced), "status": "pending"}
+    ], key=lambda filter: str(filter["_id"]))
+
+    body = response.json()
+    assert body["updated"] == 1
+    assert [result["result"] for result in body["results"]] == ["updated", "unchanged"]
+
+    raced_review = asyncio.run(db._db.reviews.find_one({"_id": ObjectId(raced)}))
+    assert raced_review["status"] == "rejected"
+    assert raced_review["moderatedBy"] == "someone-else"
+    # Only the applied transition reached the rating and the counters
+    assert tool_totals(db, tool_id) == expected_totals(db, tool_id, [5])
+    assert counters(db)["reviews:status:approved"] == 1
+    assert counters(db)["reviews:status:pending"] == -1
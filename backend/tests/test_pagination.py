@@ -0,0 +1,55 @@
+"""Keyset cursors round-trip and reject values of the wrong types."""
+import base64
+from datetime import datetime
+
+import pytest
+from bson import ObjectId, json_util
+from fastapi import HTTPException
+
+from app.models.tool import SORT_VALUE_TYPES
+from app.utils.pagination import build_sort, decode_cursor, encode_cursor
+
+
+def raw_cursor(values: list, sort: list) -> str:
+    """Cursor with arbitrary values, as a client could hand-edit one."""
+    raw = json_util.dumps({"k": values, "s": [list(pair) for pair in sort]})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("field, value", [
+    ("avgRating", 4.5),
+    ("votes", 12),
+    ("createdAt", datetime(2024, 5, 1, 12, 30)),
+    ("name", "Sketchpad"),
+    ("rankScore", None)
+])
+def test_cursor_round_trips(field, value):
+    sort = build_sort(field, descending=True)
+    doc = {"_id": ObjectId(), field: value}
+
+    assert decode_cursor(encode_cursor(doc, sort), sort, SORT_VALUE_TYPES) == [value, doc["_id"]]
+
+
+@pytest.mark.parametrize("field, values", [
+    ("avgRating", ["x", ObjectId()]),
+    ("avgRating", [3.0, "abc"]),
+    ("avgRating", [True, ObjectId()]),
+    ("name", [4, ObjectId()]),
+    ("createdAt", ["2024-05-01", ObjectId()]),
+    ("votes", [{"$gt": 1}, ObjectId()])
+])
+def test_cursor_with_wrong_value_types_is_rejected(field, values):
+    sort = build_sort(field, descending=True)
+
+    with pytest.raises(HTTPException) as error:
+        decode_cursor(raw_cursor(values, sort), sort, SORT_VALUE_TYPES)
+    assert error.value.status_code == 400
+
+
+def test_tool_list_answers_bad_cursor_with_400(client):
+    sort = build_sort("avgRating", descending=True)
+
+    response = client.get("/tools", params={"sort": "avgRating", "cursor": raw_cursor(["x", ObjectId()], sort)})
+
+    assert response.status_code == 400
+    assert response.json() == {"detail": "Invalid cursor"}
@@ -0,0 +1,86 @@
+"""Every router read asks MongoDB only for the fields it uses."""
+import asyncio
+
+from bson import ObjectId
+
+from app.models.tool import Tool
+from app.models.review import ReviewWithUserName
+from app.routers.tools import VERSION_PROJECTION
+from app.utils.projection import model_projection
+from factories import auth_headers, insert_tool, insert_user
+
+
+def assert_all_projected(db):
+    """No read on the main collections fetched whole documents."""
+    for collection, method, filter_query, projection in db.reads:
+        if collection in ("tools", "reviews", "users"):
+            assert projection, f"{collection}.{method}({filter_query}) has no projection"
+
+
+def test_login_reads_only_credential_fields(client, db):
+    user_id = insert_user(db)
+    email = asyncio.run(db._db.users.find_one({"_id": ObjectId(user_id)}))["email"]
+
+    response = client.post("/auth/login", json={"email": email, "password": "secret123"})
+
+    assert response.status_code == 200
+    assert db.reads_of("users")[0] == (
+        "find_one",
+        {"email": email},
+        {"name": 1, "email": 1, "password": 1, "role": 1, "createdAt": 1}
+    )
+    assert_all_projected(db)
+
+
+def test_create_review_checks_existence_with_narrow_projections(client, db):
+    tool_id = insert_tool(db)
+    user_id = insert_user(db)
+
+    response = client.post(
+        "/reviews",
+        json={"toolId": tool_id, "rating": 5, "comment": "Great for quick sketches"},
+        headers=auth_headers(user_id)
+    )
+
+    assert response.status_code == 201
+    # The tool lookup also supplies the denormalized toolName
+    assert db.reads_of("tools") == [("find_one", {"_id": ObjectId(tool_id)}, {"name": 1})]
+    assert db.reads_of("reviews") == [("find_one", {"toolId": tool_id, "userId": user_id}, {"_id": 1})]
+    assert db.reads_of("users") == [("find_one", {"_id": ObjectId(user_id)}, {"name": 1})]
+
+
+def test_get_tool_reviews_reads_tool_version_and_review_fields(client, db):
+    tool_id = insert_tool(db)
+
+    response = client.get(f"/tools/{tool_id}/reviews")
+
+    assert response.status_code == 200
+    # The existence check reads only the version behind ETag/Last-Modified
+    assert db.reads_of("tools") == [("find_one", {"_id": ObjectId(tool_id)}, VERSION_PROJECTION)]
+    assert db.reads_of("reviews") == [
+        ("find", {"toolId": tool_id, "status": "approved"}, model_projection(ReviewWithUserName))
+    ]
+
+
+def test_tool_list_and_detail_read_response_fields(client, db):
+    tool_id = insert_tool(db, category="Projections")
+
+    assert client.get("/tools", params={"category": "Projections"}).status_code == 200
+    assert client.get(f"/tools/{tool_id}").status_code == 200
+
+    list_read, detail_read = db.reads_of("tools")
+    assert list_read == ("find", {"category": "Projections"}, model_projection(Tool))
+    assert detail_read == ("find_one", {"_id": ObjectId(tool_id)}, {**model_projection(Tool), **VERSION_PROJECTION})
+
+
+def test_admin_tool_writes_read_only_what_they_update(client, db):
+    tool_id = insert_tool(db)
+    headers = auth_headers(insert_user(db, role="admin"), role="admin")
+
+    assert client.put(f"/admin/tools/{tool_id}", json={"votes": 11}, headers=headers).status_code == 200
+    assert client.delete(f"/admin/tools/{tool_id}", headers=headers).status_code == 204
+
+    reads = db.reads_of("tools")
+    assert reads[0] == ("find_one", {"_id": ObjectId(tool_id)}, {"name": 1, "category": 1, "pricingModel": 1})
+    assert reads[-1] == ("find_one", {"_id": ObjectId(tool_id)}, {"category": 1, "pricingModel": 1})
+    assert_all_projected(db)
@@ -0,0 +1,74 @@
+"""Rating totals change only when a review enters or leaves the approved state."""
+import asyncio
+
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+from app.services.rating_service import rank_score, rebuild_all_ratings, review_transition_delta
+
+
+@pytest.mark.parametrize("old_status, new_status, expected", [
+    ("pending", "approved", (4, 1)),
+    ("rejected", "approved", (4, 1)),
+    ("approved", "rejected", (-4, -1)),
+    ("approved", "pending", (-4, -1)),
+    ("approved", "approved", (0, 0)),
+    ("pending", "pending", (0, 0)),
+    ("pending", "rejected", (0, 0)),
+    ("rejected", "pending", (0, 0)),
+    # Created and deleted reviews
+    (None, "pending", (0, 0)),
+    (None, "approved", (4, 1)),
+    ("approved", None, (-4, -1)),
+    ("rejected", None, (0, 0)),
+    (None, None, (0, 0))
+])
+def test_transition_delta(old_status, new_status, expected):
+    assert review_transition_delta(4, old_status, new_status) == expected
+
+
+def test_rank_score_without_evidence_is_the_prior():
+    assert rank_score(None, None, None, None) == 3.5
+    # Seed ratings without votes carry no weight
+    assert rank_score(5.0, 0, 0.0, 0) == 3.5
+
+
+@pytest.fixture
+def mongo():
+    return AsyncMongoMockClient()["test"]
+
+
+def rebuild(db, **options) -> dict:
+    """Rebuild every tool's ratings and return the tools by name."""
+    asyncio.run(rebuild_all_ratings(db, **options))
+    return {tool["name"]: tool for tool in asyncio.run(db.tools.find({}).to_list(None))}
+
+
+def seed_catalog(db):
+    """A seeded tool without reviews, and a reviewed one with drifted totals."""
+    seeded, reviewed = asyncio.run(db.tools.insert_many([
+        {"name": "Seeded", "ratingSeed": 4.5, "votes": 100, "avgRating": 4.5},
+        {"name": "Reviewed", "ratingSeed": 4.5, "votes": 100, "avgRating": 1.0, "reviewCount": 9}
+    ])).inserted_ids
+    asyncio.run(db.reviews.insert_many([
+        {"toolId": str(reviewed), "rating": rating, "status": status}
+        for rating, status in ((5, "approved"), (4, "approved"), (1, "rejected"))
+    ]))
+
+
+def test_rebuild_keeps_the_seed_rating_of_unreviewed_tools(mongo):
+    seed_catalog(mongo)
+    tools = rebuild(mongo)
+
+    assert tools["Seeded"]["avgRating"] == 4.5
+    assert (tools["Seeded"]["reviewCount"], tools["Seeded"]["ratingSum"], tools["Seeded"]["ratingCount"]) == (0, 0, 0)
+    assert tools["Seeded"]["rankScore"] == rank_score(4.5, 100, 4.5, 0)
+    assert (tools["Reviewed"]["avgRating"], tools["Reviewed"]["reviewCount"]) == (4.5, 2)
+
+
+def test_rebuild_can_reset_unreviewed_tools(mongo):
+    seed_catalog(mongo)
+    tools = rebuild(mongo, reset_unreviewed=True)
+
+    assert tools["Seeded"]["avgRating"] == 0.0
+    assert (tools["Reviewed"]["avgRating"], tools["Reviewed"]["reviewCount"]) == (4.5, 2)
@@ -0,0 +1,126 @@
+"""Generation-based invalidation of the response cache on both backends."""
+import asyncio
+
+import pytest
+
+from app.services.response_cache import MemoryResponseBackend, RedisResponseBackend, ResponseCache
+
+
+PARAMS = {"page": 1, "pageSize": 20, "sort": "rankScore"}
+
+
+def memory_cache() -> ResponseCache:
+    return ResponseCache(MemoryResponseBackend(maxsize=100, ttl=60))
+
+
+@pytest.fixture
+def redis_server():
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeServer()
+
+
+def redis_cache(server) -> ResponseCache:
+    """A worker's cache on the shared server."""
+    import fakeredis
+
+    backend = RedisResponseBackend("redis://localhost:6379/0", ttl=60)
+    backend.client = fakeredis.FakeAsyncRedis(server=server)
+    return ResponseCache(backend)
+
+
+async def fill(cache: ResponseCache, body: bytes) -> str:
+    key = cache.key(PARAMS, await cache.generation())
+    await cache.set(key, body)
+    return key
+
+
+async def read(cache: ResponseCache):
+    return await cache.get(cache.key(PARAMS, await cache.generation()))
+
+
+async def race_fill_with_write(cache: ResponseCache):
+    """A fill whose generation was read before a write, stored after it."""
+    stale_key = cache.key(PARAMS, await cache.generation())
+    cache.invalidate()
+    await cache.set(stale_key, b"before the write")
+    return stale_key
+
+
+def test_keys_change_with_the_generation():
+    assert ResponseCache.key(PARAMS, 1) == ResponseCache.key(dict(reversed(PARAMS.items())), 1)
+    assert ResponseCache.key(PARAMS, 1) != ResponseCache.key(PARAMS, 2)
+    assert ResponseCache.key(PARAMS, 1) != ResponseCache.key({**PARAMS, "page": 2}, 1)
+
+
+def test_memory_write_hides_entries_filled_before_it():
+    async def scenario():
+        cache = memory_cache()
+        await fill(cache, b"old")
+        assert await read(cache) == b"old"
+
+        await race_fill_with_write(cache)
+        # generation() waits for the pending bump, so the next read misses
+        assert await read(cache) is None
+        await fill(cache, b"new")
+        assert await read(cache) == b"new"
+
+    asyncio.run(scenario())
+
+
+def test_memory_backends_are_per_worker():
+    async def scenario():
+        worker, other = memory_cache(), memory_cache()
+        await fill(worker, b"old")
+        other.invalidate()
+        assert await other.generation() == 1
+        assert await worker.generation() == 0
+        assert await read(worker) == b"old"
+
+    asyncio.run(scenario())
+
+
+def test_redis_write_in_one_worker_invalidates_all(redis_server):
+    async def scenario():
+        worker, other = redis_cache(redis_server), redis_cache(redis_server)
+        key = await fill(worker, b"old")
+        assert await read(other) == b"old"
+        assert 0 < await worker.backend.client.ttl(f"tools:{key}") <= 60
+
+        await race_fill_with_write(other)
+        assert await read(other) is None
+        # Seen by the worker that did not write, once the bump has landed
+        assert await worker.generation() == 1
+        assert await read(worker) is None
+
+    asyncio.run(scenario())
+
+
+class UnreachableBackend(MemoryResponseBackend):
+    shared = True
+
+    async def get_generation(self) -> int:
+        raise ConnectionError("down")
+
+    async def bump(self):
+        raise ConnectionError("down")
+
+
+def test_unreachable_backend_is_a_miss_and_stores_nothing():
+    async def scenario():
+        cache = ResponseCache(UnreachableBackend(maxsize=100, ttl=60))
+        assert await cache.generation() is None
+        key = await fill(cache, b"body")
+        assert key.startswith("None:")
+        assert len(cache.backend.cache) == 0
+        assert await read(cache) is None
+
+        cache.invalidate()
+        assert await cache.generation() is None
+
+    asyncio.run(scenario())
+
+
+def test_disabled_cache_has_no_generation():
+    cache = ResponseCache()
+    assert not cache.shared
+    assert asyncio.run(cache.generation()) is None
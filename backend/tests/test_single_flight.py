@@ -0,0 +1,107 @@
+"""Concurrent identical loads share one call, and survive cancelled callers."""
+import asyncio
+
+import pytest
+
+from app.utils.single_flight import SingleFlight
+
+
+class Load:
+    """Load that waits until released, counting its calls."""
+
+    def __init__(self, result="value"):
+        self.result = result
+        self.calls = 0
+        self.cancelled = False
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_concurrent_calls_share_one_load():
+    async def scenario():
+        flights = SingleFlight()
+        load, other = Load(), Load("other")
+        callers = [asyncio.create_task(flights.do("key", load)) for _ in range(3)]
+        other_caller = asyncio.create_task(flights.do("other", other))
+        await asyncio.sleep(0)
+        assert flights.stats() == {"executed": 2, "coalesced": 2, "inFlight": 2}
+
+        load.release.set()
+        other.release.set()
+        assert await asyncio.gather(*callers) == ["value"] * 3
+        assert await other_caller == "other"
+        assert (load.calls, other.calls) == (1, 1)
+        assert flights.stats()["inFlight"] == 0
+
+        # Finished loads are not reused
+        assert await flights.do("key", load) == "value"
+        assert load.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_failure_reaches_every_caller_and_is_retried():
+    async def scenario():
+        flights = SingleFlight()
+        load = Load(ValueError("boom"))
+        callers = [asyncio.create_task(flights.do("key", load)) for _ in range(2)]
+        await asyncio.sleep(0)
+        load.release.set()
+
+        results = await asyncio.gather(*callers, return_exceptions=True)
+        assert [str(result) for result in results] == ["boom", "boom"]
+
+        load.result = "recovered"
+        assert await flights.do("key", load) == "recovered"
+        assert load.calls == 2
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_caller_does_not_cancel_the_load():
+    async def scenario():
+        flights = SingleFlight()
+        load = Load()
+        leaving = asyncio.create_task(flights.do("key", load))
+        staying = asyncio.create_task(flights.do("key", load))
+        await asyncio.sleep(0)
+
+        # The first caller disconnects
+        leaving.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leaving
+
+        load.release.set()
+        assert await staying == "value"
+        assert not load.cancelled
+        assert load.calls == 1
+
+    asyncio.run(scenario())
+
+
+def test_load_outlives_all_callers():
+    async def scenario():
+        flights = SingleFlight()
+        load = Load()
+        caller = asyncio.create_task(flights.do("key", load))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+
+        # Still in flight: a new caller joins it instead of starting another
+        task = flights.start("key", load)
+        load.release.set()
+        assert await task == "value"
+        assert load.calls == 1
+
+    asyncio.run(scenario())
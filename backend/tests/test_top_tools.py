@@ -0,0 +1,67 @@
+"""Top tools lists: keyed apart from category names, rebuilt by the lock holder only."""
+import asyncio
+from datetime import datetime, timedelta
+
+from app.services.migration_service import MIGRATIONS_COLLECTION
+from app.services.top_tools_service import (
+    TOP_TOOLS_COLLECTION,
+    TOP_TOOLS_LOCK_ID,
+    refresh_top_tools,
+    refresh_top_tools_if_leader
+)
+from factories import insert_tool
+
+
+def seed_tools(db):
+    asyncio.run(db.tools.insert_many([
+        {"name": f"Tool {index}", "category": "Code", "rankScore": float(index)}
+        for index in range(3)
+    ]))
+
+
+def test_one_worker_rebuilds_the_lists(db):
+    seed_tools(db._db)
+
+    assert asyncio.run(refresh_top_tools_if_leader(db._db, "worker-1"))
+    assert not asyncio.run(refresh_top_tools_if_leader(db._db, "worker-2"))
+    # The leader renews its lock on every round
+    assert asyncio.run(refresh_top_tools_if_leader(db._db, "worker-1"))
+
+    lists = asyncio.run(db._db[TOP_TOOLS_COLLECTION].find({}).to_list(None))
+    assert {top["_id"] for top in lists} == {"all", "category:Code"}
+
+
+def test_another_worker_takes_over_an_expired_lock(db):
+    seed_tools(db._db)
+    assert asyncio.run(refresh_top_tools_if_leader(db._db, "worker-1"))
+
+    # worker-1 stopped renewing
+    asyncio.run(db._db[MIGRATIONS_COLLECTION].update_one(
+        {"_id": TOP_TOOLS_LOCK_ID},
+        {"$set": {"expiresAt": datetime.utcnow() - timedelta(seconds=1)}}
+    ))
+
+    assert asyncio.run(refresh_top_tools_if_leader(db._db, "worker-2"))
+    assert not asyncio.run(refresh_top_tools_if_leader(db._db, "worker-1"))
+
+
+def test_categories_named_like_the_overall_list_keep_their_own_lists(client, db):
+    for category in ("all", "_all", "Code"):
+        for index in range(2):
+            insert_tool(db, name=f"{category} {index}", category=category, rankScore=float(index))
+    # A list left behind by an earlier key scheme is dropped
+    asyncio.run(db._db[TOP_TOOLS_COLLECTION].insert_one({"_id": "_all", "tools": [], "refreshedAt": None}))
+
+    assert asyncio.run(refresh_top_tools(db._db)) == 4
+
+    def names(params: dict) -> list:
+        response = client.get("/tools/top", params=params)
+        assert response.json()["refreshedAt"] is not None
+        return [tool["name"] for tool in response.json()["items"]]
+
+    assert len(names({})) == 6
+    assert names({"category": "all"}) == ["all 1", "all 0"]
+    assert names({"category": "_all"}) == ["_all 1", "_all 0"]
+    assert names({"category": "Code", "limit": 1}) == ["Code 1"]
+    lists = asyncio.run(db._db[TOP_TOOLS_COLLECTION].find({}, {"_id": 1}).to_list(None))
+    assert sorted(top["_id"] for top in lists) == ["all", "category:Code", "category:_all", "category:all"]